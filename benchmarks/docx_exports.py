@@ -0,0 +1,309 @@
+"""Benchmark the .docx exporters on synthetic frames of 50, 500 and 5000 rows.
+
+Covers ``create_weekly_calendar_document`` (exams, with supervisors),
+``create_weekly_timetable_document`` (timetable) and the course outline of the
+perigrammata page (every row of the sheet rendered through the page's
+``TemplateStore``, as a bulk export would). Each exporter and size runs in a
+fresh worker process, so its peak memory (peak RSS above the RSS after
+loading, with the peak reset through ``/proc/self/clear_refs`` on Linux; the
+tracemalloc peak of the Python allocations is recorded as well) belongs to
+that export alone. Wall time is the best of up to ``--repeat`` runs, output
+size the bytes of the document. A size whose time, extrapolated linearly from
+the previous size, would exceed ``--budget`` seconds is recorded as skipped.
+
+With ``--compare REV_A REV_B`` the ``streamlit`` tree of each revision is
+taken with ``git archive`` and both are measured on the same pickled frames;
+the exit status is 1 if REV_B is slower than REV_A by more than
+``--threshold`` (and more than ``--noise`` seconds) on any measured case.
+
+    python benchmarks/docx_exports.py [--sizes 50 500 5000] [--repeat N] [--output results.json]
+    python benchmarks/docx_exports.py --compare REV_A REV_B [--threshold 1.2] [--output results.json]
+"""
+
+import argparse
+import datetime
+import io
+import json
+import platform
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from docxtpl import DocxTemplate
+
+from exams_normalize import synthetic_sheet
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "streamlit"))
+from utils.exams_data import normalize_exams  # noqa: E402
+
+DEFAULT_SIZES = [50, 500, 5000]
+EXPORTERS = ["exams", "timetable", "perigrammata"]
+PERIGRAMMATA_TEMPLATE = ROOT / "files" / "perigrammata-template-gr.docx"
+# Repeats stop once this much time has been spent on one case (at least one run).
+REPEAT_SECONDS = 10.0
+
+
+def exams_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """A four-week exam period of ``rows`` exams, as ``exams_data.load_data`` returns it."""
+    raw = synthetic_sheet(rows, seed)
+    days = (raw["exam_date"] - raw["exam_date"].min()).dt.days % 28
+    raw["exam_date"] = (pd.Timestamp("2026-06-01") + pd.to_timedelta(days, unit="D")).where(raw["exam_date"].notna())
+    return normalize_exams(raw)
+
+
+def timetable_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """``rows`` classes of ten semesters, with the columns ``timetable_data.load_data`` adds."""
+    rng = np.random.default_rng(seed)
+    days = np.array(["Δευτέρα", "Τρίτη", "Τετάρτη", "Πέμπτη", "Παρασκευή"], dtype=object)
+    courses = rng.integers(0, 120, rows)
+    duration = rng.integers(1, 5, rows)
+    start_hour = rng.integers(9, 22 - duration)
+    return pd.DataFrame(
+        {
+            "course_id": [f"ΠΟΛ{c:03d}" for c in courses],
+            "course_name": [f"Μάθημα {c}" for c in courses],
+            "class_name": np.where(rng.random(rows) < 0.3, "Εργαστήριο", None),
+            "semester": rng.integers(1, 11, rows),
+            "instructors": [f"Διδάσκων {i % 41}" for i in range(rows)],
+            "day": days[rng.integers(0, len(days), rows)],
+            "start_time": [datetime.time(int(hour)) for hour in start_hour],
+            "duration": duration,
+            "room": [f"Αίθουσα {r}" for r in rng.integers(1, 30, rows)],
+            "full_class_name": [f"Μάθημα {c}" for c in courses],
+            "start_hour": start_hour,
+            "end_hour": start_hour + duration,
+        }
+    )
+
+
+def perigrammata_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """``rows`` course outlines with every variable of the Greek template filled in."""
+    rng = np.random.default_rng(seed)
+    variables = sorted(DocxTemplate(PERIGRAMMATA_TEMPLATE).get_undeclared_template_variables())
+    frame = pd.DataFrame(
+        {name: [f"{name} {i} " * int(n) for i, n in enumerate(rng.integers(1, 40, rows))] for name in variables}
+    )
+    frame["code"] = [f"ΠΟΛ{i:04d}" for i in range(rows)]
+    frame["examino"] = rng.integers(1, 11, rows)
+    return frame
+
+
+FRAMES = {"exams": exams_frame, "timetable": timetable_frame, "perigrammata": perigrammata_frame}
+
+
+def _exporter(name: str):
+    """The export of ``name`` as a function of a frame, from the ``utils`` on ``sys.path``."""
+    if name == "exams":
+        from utils.exams_export import create_weekly_calendar_document
+        return lambda df: create_weekly_calendar_document(df, "Εαρινό", True)
+    if name == "timetable":
+        from utils.timetable_export import create_weekly_timetable_document
+        return lambda df: create_weekly_timetable_document(df, "Χειμερινό")
+    try:
+        from utils.perigrammata_export import TemplateStore
+    except ImportError:
+        # Revisions before the template store (only reachable through --compare).
+        from utils.perigrammata_export import render_perigramma
+        template = PERIGRAMMATA_TEMPLATE.read_bytes()
+        return lambda df: b"".join(render_perigramma(template, row) for row in df.to_dict("records"))
+    store = TemplateStore({"Ελληνικά": PERIGRAMMATA_TEMPLATE})
+    return lambda df: b"".join(store.render("Ελληνικά", row) for row in df.to_dict("records"))
+
+
+def _rss_kib(field: str) -> int | None:
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return None
+    match = re.search(rf"^{field}:\s+(\d+) kB", status, re.MULTILINE)
+    return int(match.group(1)) if match else None
+
+
+def _reset_peak_rss() -> int | None:
+    """Reset the peak RSS to the current RSS (Linux); returns that RSS in bytes, None if unsupported."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return _max_rss_bytes()
+    rss = _rss_kib("VmRSS")
+    return None if rss is None else rss * 1024
+
+
+def _max_rss_bytes() -> int | None:
+    """Peak RSS since start (or since ``_reset_peak_rss``), in bytes; None without ``resource``."""
+    peak = _rss_kib("VmHWM")
+    if peak is not None:
+        return peak * 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_case(tree: Path, frame_path: Path, exporter: str, repeat: int) -> dict:
+    """Measure one exporter on one pickled frame, importing ``utils`` from ``tree`` (worker process)."""
+    sys.path.insert(0, str(tree))
+    for module in [m for m in sys.modules if m == "utils" or m.startswith("utils.")]:
+        del sys.modules[module]
+    warnings.filterwarnings("ignore")
+
+    df = pd.read_pickle(frame_path)
+    try:
+        export = _exporter(exporter)
+    except ImportError as e:
+        return {"missing": str(e)}
+
+    rss_before = _reset_peak_rss()
+    times = []
+    while not times or (len(times) < repeat and sum(times) < REPEAT_SECONDS):
+        start = time.perf_counter()
+        data = export(df)
+        times.append(time.perf_counter() - start)
+    rss_after = _max_rss_bytes()
+
+    tracemalloc.start()
+    export(df)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "runs": len(times),
+        "peak_rss_bytes": None if rss_before is None else rss_after - rss_before,
+        "peak_traced_bytes": traced_peak,
+        "output_bytes": len(data),
+    }
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def _checkout(rev: str, target: Path) -> Path:
+    """Extract the ``streamlit`` tree of ``rev`` under ``target``."""
+    archive = subprocess.run(["git", "archive", rev, "streamlit"], cwd=ROOT, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target, filter="data")
+    return target / "streamlit"
+
+
+def measure(tree: Path, frames_dir: Path, sizes: list[int], repeat: int, budget: float, label: str) -> dict:
+    """Every exporter at every size for the ``streamlit`` tree at ``tree``, one worker per case."""
+    results = {}
+    for exporter in EXPORTERS:
+        results[exporter] = {}
+        previous = None
+        for rows in sizes:
+            if previous and "seconds" in previous[1]:
+                estimate = previous[1]["seconds"] * rows / previous[0]
+                if estimate > budget:
+                    results[exporter][str(rows)] = {"skipped": f"εκτίμηση {estimate:.0f}s > {budget:.0f}s"}
+                    continue
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", str(tree), str(frames_dir / f"{exporter}-{rows}.pkl"), exporter, str(repeat)],
+                capture_output=True, text=True,
+            )
+            if output.returncode:
+                result = {"error": output.stderr.strip().splitlines()[-1] if output.stderr.strip() else "failed"}
+            else:
+                result = json.loads(output.stdout.splitlines()[-1])
+            results[exporter][str(rows)] = result
+            previous = rows, result
+            print(f"{label:<14}{exporter:<14}{rows:>6}  {_describe(result)}", file=sys.stderr)
+    return results
+
+
+def _describe(result: dict) -> str:
+    if "seconds" not in result:
+        return next(iter(result.values()))
+    peak = result["peak_rss_bytes"] if result["peak_rss_bytes"] is not None else result["peak_traced_bytes"]
+    return (
+        f"{result['seconds'] * 1000:>10.1f}ms {peak / 2**20:>8.1f}MiB {result['output_bytes'] / 1024:>9.1f}KiB"
+    )
+
+
+def compare(before: dict, after: dict, threshold: float, noise: float) -> bool:
+    """Print REV_B/REV_A ratios; True if any case got slower than ``threshold`` (and by over ``noise`` s)."""
+    regressed = False
+    print(f"{'exporter':<14}{'rows':>6}{'time':>9}{'memory':>9}{'size':>9}")
+    for exporter, sizes in after.items():
+        for rows, new in sizes.items():
+            old = before.get(exporter, {}).get(rows, {})
+            if "seconds" not in old or "seconds" not in new:
+                print(f"{exporter:<14}{rows:>6}  {_describe(old if 'seconds' not in old else new)}")
+                continue
+            memory = "peak_rss_bytes" if old["peak_rss_bytes"] and new["peak_rss_bytes"] else "peak_traced_bytes"
+            ratios = [new[key] / old[key] if old[key] else float("nan")
+                      for key in ("seconds", memory, "output_bytes")]
+            slower = ratios[0] > threshold and new["seconds"] - old["seconds"] > noise
+            regressed |= slower
+            print(f"{exporter:<14}{rows:>6}" + "".join(f"{r:>8.2f}x" for r in ratios) + ("  ΧΕΙΡΟΤΕΡΟ" if slower else ""))
+    return regressed
+
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        tree, frame_path, exporter, repeat = sys.argv[2:]
+        print(json.dumps(run_case(Path(tree), Path(frame_path), exporter, int(repeat))))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=60.0, help="seconds one case may take (estimated)")
+    parser.add_argument("--compare", nargs=2, metavar=("REV_A", "REV_B"), help="benchmark two git revisions")
+    parser.add_argument("--threshold", type=float, default=1.2, help="REV_B/REV_A time ratio counted as a regression")
+    parser.add_argument("--noise", type=float, default=0.05, help="slowdowns under this many seconds are ignored")
+    parser.add_argument("--output", type=Path, help="JSON results file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": args.sizes,
+        "seed": args.seed,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory(prefix="docx-bench-") as tmp:
+        # One pickle per case, so a worker loads (and holds in memory) only its own frame.
+        frames_dir = Path(tmp)
+        for exporter in EXPORTERS:
+            for rows in args.sizes:
+                FRAMES[exporter](rows, args.seed).to_pickle(frames_dir / f"{exporter}-{rows}.pkl")
+
+        if args.compare:
+            targets = [(rev, _git("rev-parse", rev), _checkout(rev, Path(tmp) / f"rev{i}"))
+                       for i, rev in enumerate(args.compare)]
+        else:
+            dirty = bool(_git("status", "--porcelain", "--", "streamlit"))
+            targets = [("working tree", _git("rev-parse", "HEAD") + ("+dirty" if dirty else ""), ROOT / "streamlit")]
+
+        for label, commit, tree in targets:
+            results = measure(tree, frames_dir, args.sizes, args.repeat, args.budget, label)
+            report["runs"].append({"revision": label, "commit": commit, "results": results})
+
+    regressed = False
+    if args.compare:
+        regressed = compare(report["runs"][0]["results"], report["runs"][1]["results"], args.threshold, args.noise)
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
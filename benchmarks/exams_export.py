@@ -0,0 +1,165 @@
+"""Benchmark ``create_weekly_calendar_document`` against its python-docx original.
+
+The original cell-by-cell implementation is loaded from the git revision that
+added ``streamlit/utils/exams_export.py`` (or ``--baseline REV``). Both run on
+the real ``files/exams/exams-2026-*.xlsm`` sheets, with and without
+supervisors, and the documents are checked to have the same headings and the
+same table cells (text, fill, width, effective paragraph/run formatting).
+
+    python benchmarks/exams_export.py [--baseline REV] [--repeat N]
+"""
+
+import argparse
+import io
+import subprocess
+import sys
+import time
+import types
+import warnings
+from pathlib import Path
+
+from docx import Document
+from docx.oxml.ns import qn
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "streamlit"))
+from utils.exams_data import load_data  # noqa: E402
+from utils.exams_export import create_weekly_calendar_document  # noqa: E402
+
+EXAMS_DIR = ROOT / "files" / "exams"
+MODULE_PATH = "streamlit/utils/exams_export.py"
+EXTRA_COLUMNS = {"ΔΙΠΑΕ": "students_total", "ΤΕΙ": "φοιτΤΕΙ"}
+
+
+def _load_baseline(rev: str | None) -> types.ModuleType:
+    if rev is None:
+        rev = subprocess.run(
+            ["git", "log", "--diff-filter=A", "--format=%H", "-1", "--", MODULE_PATH],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    source = subprocess.run(
+        ["git", "show", f"{rev}:{MODULE_PATH}"], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    module = types.ModuleType("exams_export_baseline")
+    exec(compile(source, f"{rev}:{MODULE_PATH}", "exec"), module.__dict__)
+    return module
+
+
+def _cell_text(tc) -> str:
+    parts = []
+    for child in tc.iter(qn("w:t"), qn("w:br")):
+        parts.append(child.text or "" if child.tag == qn("w:t") else "\n")
+    return "".join(parts)
+
+
+def _formatting(props: dict, rpr, ppr) -> dict:
+    props = dict(props)
+    if rpr is not None:
+        fonts, size, color = rpr.find(qn("w:rFonts")), rpr.find(qn("w:sz")), rpr.find(qn("w:color"))
+        if fonts is not None:
+            props["font"] = fonts.get(qn("w:ascii"))
+        if rpr.find(qn("w:b")) is not None:
+            props["bold"] = True
+        if size is not None:
+            props["size"] = size.get(qn("w:val"))
+        if color is not None:
+            props["color"] = color.get(qn("w:val"))
+    if ppr is not None and ppr.find(qn("w:jc")) is not None:
+        props["align"] = ppr.find(qn("w:jc")).get(qn("w:val"))
+    return props
+
+
+def _style_formatting(styles) -> dict[str, dict]:
+    """Run/paragraph formatting each paragraph style adds on top of Normal."""
+    by_id = {s.get(qn("w:styleId")): s for s in styles.iterchildren(qn("w:style"))}
+
+    def resolve(sid: str | None) -> dict:
+        style = by_id.get(sid)
+        if style is None or sid == "Normal":
+            return {}
+        based_on = style.find(qn("w:basedOn"))
+        base = resolve(based_on.get(qn("w:val")) if based_on is not None else None)
+        return _formatting(base, style.find(qn("w:rPr")), style.find(qn("w:pPr")))
+
+    return {sid: resolve(sid) for sid in by_id}
+
+
+def _cell_formatting(tc, styles: dict[str, dict]) -> tuple:
+    """Effective formatting of the runs of a cell (paragraph style, then run properties)."""
+    result = set()
+    for paragraph in tc.iter(qn("w:p")):
+        ppr = paragraph.find(qn("w:pPr"))
+        style = ppr.find(qn("w:pStyle")) if ppr is not None else None
+        props = _formatting(styles.get(style.get(qn("w:val")), {}) if style is not None else {}, None, ppr)
+        for run in paragraph.iter(qn("w:r")):
+            if not _cell_text(run):
+                continue  # an empty run formats nothing
+            result.add(tuple(sorted(_formatting(props, run.find(qn("w:rPr")), None).items())))
+    return tuple(sorted(result))
+
+
+def layout(data: bytes) -> list:
+    """Headings, page breaks and table cells (text, fill, width, formatting) of a generated document."""
+    doc = Document(io.BytesIO(data))
+    styles = _style_formatting(doc.styles.element)
+    blocks = []
+    for block in doc.element.body.iterchildren():
+        if block.tag == qn("w:p"):
+            style = block.find(f"{qn('w:pPr')}/{qn('w:pStyle')}")
+            page_break = block.find(f".//{qn('w:br')}[@{qn('w:type')}='page']") is not None
+            blocks.append(("p", style.get(qn("w:val")) if style is not None else None, _cell_text(block), page_break))
+        elif block.tag == qn("w:tbl"):
+            cells = []
+            for tc in block.iter(qn("w:tc")):
+                tc_pr = tc.find(qn("w:tcPr"))
+                cells.append((
+                    tc_pr.find(qn("w:shd")).get(qn("w:fill")),
+                    tc_pr.find(qn("w:tcW")).get(qn("w:w")),
+                    _cell_text(tc),
+                    _cell_formatting(tc, styles),
+                ))
+            blocks.append(("tbl", block.find(f"{qn('w:tblPr')}/{qn('w:tblStyle')}").get(qn("w:val")), cells))
+    return blocks
+
+
+def _best_of(repeat: int, func) -> tuple[float, bytes]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", help="git revision of the reference implementation")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = _load_baseline(args.baseline)
+    warnings.filterwarnings("ignore")
+
+    print(f"{'file':<20}{'sheet':<7}{'rows':>5}{'epit.':>7}{'baseline':>11}{'new':>10}{'speedup':>9}  same")
+    for path in sorted(EXAMS_DIR.glob("exams-*.xlsm")):
+        for sheet, extra_column in EXTRA_COLUMNS.items():
+            df = load_data(path, sheet, extra_column)
+            for include_epitirites in (True, False):
+                old_time, expected = _best_of(
+                    args.repeat,
+                    lambda: baseline.create_weekly_calendar_document(df, "Εαρινό", include_epitirites),
+                )
+                new_time, actual = _best_of(
+                    args.repeat,
+                    lambda: create_weekly_calendar_document(df, "Εαρινό", include_epitirites),
+                )
+                same = layout(expected) == layout(actual)
+                print(
+                    f"{path.name:<20}{sheet:<7}{len(df):>5}{str(include_epitirites):>7}"
+                    f"{old_time * 1000:>9.1f}ms{new_time * 1000:>8.1f}ms{old_time / new_time:>8.1f}x  {same}"
+                )
+
+
+if __name__ == "__main__":
+    main()
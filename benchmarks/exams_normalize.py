@@ -0,0 +1,123 @@
+"""Scaling benchmark for ``exams_data.normalize_exams``.
+
+Builds synthetic raw exam sheets (mixed numeric/text course and room codes,
+"HH:MM:SS" start times as in the real workbooks, blank dates) of 10k-500k rows
+and times the vectorised stage against the previous per-row implementation,
+checking that both produce the same frame.
+
+    python benchmarks/exams_normalize.py [--sizes 10000 100000 500000] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "streamlit"))
+from utils.exams_data import normalize_exams  # noqa: E402
+
+DEFAULT_SIZES = [10_000, 50_000, 100_000, 500_000]
+
+
+def synthetic_sheet(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Raw sheet shaped like ΔΙΠΑΕ/ΤΕΙ after the column projection in ``load_data``."""
+    rng = np.random.default_rng(seed)
+    codes = np.array([101, 102.0, "ΔΟΜ704", "ΓΕΝ002", np.nan], dtype=object)
+    rooms = np.array([101, 203.0, "Αμφ. Α", np.nan], dtype=object)
+    times = np.array(["09:00:00", "12:00:00", "15:00:00", "18:00:00"], dtype=object)
+
+    dates = pd.Timestamp("2024-01-08") + pd.to_timedelta(rng.integers(0, 3 * 365, rows), unit="D")
+    dates = pd.Series(dates).where(rng.random(rows) > 0.02)
+
+    return pd.DataFrame(
+        {
+            "course_id": codes[rng.integers(0, len(codes), rows)],
+            "course_name": [f"Μάθημα {i % 97}" for i in range(rows)],
+            "semester": rng.integers(1, 11, rows).astype(float),
+            "instructor": [f"Διδάσκων {i % 41}" for i in range(rows)],
+            "exam_date": dates,
+            "start_time": times[rng.integers(0, len(times), rows)],
+            "room": rooms[rng.integers(0, len(rooms), rows)],
+            "notes": np.nan,
+            "epitirites": "Α, Β",
+            "students_total": rng.integers(0, 200, rows).astype(float),
+        }
+    )
+
+
+def legacy_normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """The per-row normalisation ``load_data`` used before ``normalize_exams``."""
+    df = df.copy()
+    df["exam_date"] = pd.to_datetime(df["exam_date"]).dt.date
+    df = df.dropna(subset=["exam_date"])
+
+    day_names_greek = {
+        0: 'Δευτέρα', 1: 'Τρίτη', 2: 'Τετάρτη', 3: 'Πέμπτη',
+        4: 'Παρασκευή', 5: 'Σάββατο', 6: 'Κυριακή',
+    }
+    df["day_of_week"] = pd.to_datetime(df["exam_date"]).dt.dayofweek.map(day_names_greek)
+    df["start_time"] = df["start_time"].astype(str)
+
+    def _to_str(v: object) -> str:
+        if pd.isna(v):
+            return ""
+        if isinstance(v, float) and v.is_integer():
+            return str(int(v))
+        return str(v)
+
+    df["room"] = df["room"].apply(_to_str)
+    df["course_id"] = df["course_id"].apply(_to_str)
+
+    df["start_dt"] = pd.to_datetime(
+        df["exam_date"].astype(str) + " " + df["start_time"],
+        errors="coerce",
+    )
+    df["iso_week_number"] = df["start_dt"].dt.isocalendar().week
+
+    unique_weeks = sorted(df["iso_week_number"].unique())
+    week_mapping = {iso_week: idx + 1 for idx, iso_week in enumerate(unique_weeks)}
+    df["week_number"] = df["iso_week_number"].map(week_mapping)
+    return df
+
+
+def _best_of(repeat: int, func) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'legacy':>12}{'vectorised':>13}{'speedup':>9}  same")
+    for rows in args.sizes:
+        raw = synthetic_sheet(rows)
+        legacy_time, expected = _best_of(args.repeat, lambda: legacy_normalize(raw))
+        new_time, actual = _best_of(args.repeat, lambda: normalize_exams(raw))
+
+        actual = actual.assign(day_of_week=actual["day_of_week"].astype(str))
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False)
+            same = True
+        except AssertionError:
+            same = False
+
+        print(
+            f"{rows:>9}{legacy_time:>11.3f}s{new_time:>12.3f}s"
+            f"{legacy_time / new_time:>8.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark the column-projected XML reader against ``pd.read_excel``.
+
+Runs both readers on the real ``files/exams/exams-2026-*.xlsm`` workbooks, for
+the columns ``load_data`` keeps and for ``exam_date`` alone (what
+``_exam_date_range`` needs), and checks that they agree.
+
+    python benchmarks/xlsx_reader.py [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "streamlit"))
+from utils.xlsx_reader import read_columns  # noqa: E402
+
+EXAMS_DIR = ROOT / "files" / "exams"
+LOAD_DATA_COLUMNS = [
+    "course_id",
+    "course_name",
+    "semester",
+    "instructor",
+    "exam_date",
+    "start_time",
+    "room",
+    "notes",
+    "epitirites",
+]
+EXTRA_COLUMNS = {"ΔΙΠΑΕ": "students_total", "ΤΕΙ": "φοιτΤΕΙ"}
+
+
+def _best_of(repeat: int, func) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _same_values(full: pd.DataFrame, projected: pd.DataFrame) -> bool:
+    expected = full[list(projected.columns)].dropna(how="all").reset_index(drop=True)
+    actual = projected.dropna(how="all").reset_index(drop=True)
+    try:
+        pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_column_type=False)
+    except AssertionError:
+        return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+
+    print(f"{'workbook':<22}{'sheet':<7}{'columns':<10}{'read_excel':>12}{'streamed':>12}{'speedup':>9}  same")
+    for path in sorted(EXAMS_DIR.glob("exams-2026-*.xlsm")):
+        for sheet, extra in EXTRA_COLUMNS.items():
+            full_time, full = _best_of(args.repeat, lambda: pd.read_excel(path, sheet_name=sheet))
+            for label, columns in (("load_data", LOAD_DATA_COLUMNS + [extra]), ("exam_date", ["exam_date"])):
+                streamed_time, streamed = _best_of(args.repeat, lambda: read_columns(path, sheet, columns))
+                print(
+                    f"{path.name:<22}{sheet:<7}{label:<10}"
+                    f"{full_time * 1000:>10.1f}ms{streamed_time * 1000:>10.1f}ms"
+                    f"{full_time / streamed_time:>8.1f}x  {_same_values(full, streamed)}"
+                )
+
+
+if __name__ == "__main__":
+    main()
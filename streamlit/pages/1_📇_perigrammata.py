@@ -1,11 +1,8 @@
 ﻿import sys
+from datetime import datetime
 from pathlib import Path
 
 import streamlit as st
-import pandas as pd
-from docxtpl import DocxTemplate
-import io
-import requests
 
 st.set_page_config(
     layout="wide",
@@ -13,6 +10,8 @@ st.set_page_config(
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from auth import require_ihu_login  # noqa: E402
+from utils.gsheets import Snapshot, gsheet_snapshot, prefetch_gsheets, reload_gsheet  # noqa: E402
+from utils.perigrammata_export import TEMPLATE_FILES, course_index, render_course, template_store  # noqa: E402
 
 require_ihu_login()
 
@@ -24,36 +23,47 @@ if 'programma_spoudon' not in st.session_state:
     st.session_state['programma_spoudon'] = 'Προγραμμα σπουδών 2025'
 
 # Load data from google sheets
-@st.cache_data
-def load_gsheet(lang: str, programma_spoudon: str) -> pd.DataFrame:
-    sheet_id = gsheet_perigrammata_id
+PERIGRAMMATA_SHEETS = ["gr_2025", "gr", "eng"]
+
+
+def perigrammata_sheet_name(lang: str, programma_spoudon: str) -> str:
     if lang == "Ελληνικά":
         if programma_spoudon == "Προγραμμα σπουδών 2025":
-            sheet_name = "gr_2025"
-        else:
-            sheet_name = "gr"
-    else:
-        sheet_name = "eng"
-    url = fr"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-    df = pd.read_csv(url, dtype_backend='pyarrow', index_col=0)
-    return df
+            return "gr_2025"
+        return "gr"
+    return "eng"
 
 
 def reload_data() -> None:
-    """Clear cache to force reload from Google Sheets"""
-    st.cache_data.clear()
+    """Refetch the selected sheet from Google Sheets in the background (other caches are kept)"""
+    reload_gsheet(gsheet_perigrammata_id,
+                  perigrammata_sheet_name(st.session_state['lang'], st.session_state['programma_spoudon']))
+    st.toast("Η ενημέρωση από Google Sheets ξεκίνησε")
 
 
-def get_data() -> pd.DataFrame:
-    """Get current data based on selected language"""
-    return load_gsheet(st.session_state['lang'], st.session_state['programma_spoudon'])
+def get_data(sheet_name: str) -> Snapshot:
+    """Get the local snapshot of the sheet of the selected language and programme"""
+    # The other tabs load alongside, so switching language or programme finds them ready.
+    prefetch_gsheets(gsheet_perigrammata_id, PERIGRAMMATA_SHEETS)
+    snapshot = gsheet_snapshot(gsheet_perigrammata_id, sheet_name)
+    st.sidebar.caption(f"Δεδομένα της {datetime.fromtimestamp(snapshot.fetched_at):%d/%m/%Y %H:%M}")
+    if snapshot.error:
+        st.sidebar.warning("Το Google Sheets δεν απαντά· εμφανίζεται το τελευταίο αντίγραφο.")
+    return snapshot
 
 
-st.sidebar.button('Ενημέρωση από Google Sheets', on_click=reload_data)
+def refresh_templates() -> None:
+    """Check GitHub for newer outline templates (a 304 when they are unchanged)"""
+    try:
+        changed = [lang for lang in TEMPLATE_FILES if template_store().refresh(lang)]
+    except Exception as e:
+        st.toast(f"Αποτυχία ενημέρωσης προτύπων: {e}")
+        return
+    st.toast(f"Νέα πρότυπα: {', '.join(changed)}" if changed else "Τα πρότυπα είναι ενημερωμένα")
 
 
-def replace_none_with_empty_str(some_dict: dict[str, object]) -> dict[str, object]:
-    return {k: ('' if v is None else v) for k, v in some_dict.items()}
+st.sidebar.button('Ενημέρωση από Google Sheets', on_click=reload_data)
+st.sidebar.button('Ενημέρωση προτύπων από GitHub', on_click=refresh_templates)
 
 
 # Load Google Sheets ID from secrets
@@ -68,14 +78,16 @@ except Exception as e:
 st.markdown('## Περιγράμματα μαθημάτων')
 
 st.radio("Γλώσσα", ("Ελληνικά", "Αγγλικά"),
-         key='lang', on_change=reload_data)
+         key='lang')
 
 st.radio("Πρόγραμμα σπουδών", ("Προγραμμα σπουδών 2025", "Προγραμμα σπουδών 2018"),
-         key='programma_spoudon', on_change=reload_data)
+         key='programma_spoudon')
 
 
 # Load data based on current language
-df = get_data()
+sheet_name = perigrammata_sheet_name(st.session_state['lang'], st.session_state['programma_spoudon'])
+snapshot = get_data(sheet_name)
+df = snapshot.frame
 
 # st.write(doc.undeclared_template_variables)
 
@@ -84,25 +96,6 @@ tab_table, tab_statistics, tab_word_download = st.tabs(
     ["Πίνακας", "Στατιστικά", "Αρχείο word"])
 
 
-def make_word_file(row_dict: dict[str, object]) -> bytes:
-    if st.session_state['lang'] == "Ελληνικά":
-        url = r"https://github.com/panagop/civil_ihu_pyappz/raw/main/files/perigrammata-template-gr.docx"
-    else:
-        url = r"https://github.com/panagop/civil_ihu_pyappz/raw/main/files/perigrammata-template-eng.docx"
-
-    response = requests.get(url, timeout=5)
-    bytes_io = io.BytesIO(response.content)
-
-    doc = DocxTemplate(bytes_io)
-
-    doc.render(row_dict)
-    buffer = io.BytesIO()
-    doc.save(buffer)
-
-    return buffer.getvalue()
-    
-
-
 with tab_table:
     st.write(df)
 
@@ -116,28 +109,25 @@ with tab_statistics:
 
 with tab_word_download:
 
-    course_examino = st.selectbox("Επιλέξτε εξάμηνο", df['examino'].unique())
-    course_code = st.selectbox("Επιλέξτε κωδικό μαθήματος",
-                             df[df['examino'] == course_examino]['code'].unique())
-
-    # Find the matching row directly using boolean indexing
-    matching_rows = df[(df['examino'] == course_examino) &
-                       (df['code'] == course_code)]
-    
-    if len(matching_rows) > 0:
-        row = matching_rows.iloc[0]
-    else:
+    # (examino, code) -> prepared course, built once per version of the sheet.
+    courses = course_index(gsheet_perigrammata_id, sheet_name, snapshot)
+
+    course_examino = st.selectbox("Επιλέξτε εξάμηνο", courses.semesters)
+    course_code = st.selectbox("Επιλέξτε κωδικό μαθήματος", courses.codes(course_examino))
+
+    course = courses.get(course_examino, course_code)
+    if course is None:
         st.error("No matching course found!")
         st.stop()
-    row_dict = row.to_dict()
-    row_dict = replace_none_with_empty_str(row_dict)
 
     with st.expander("Στοιχεία μαθήματος (πλήρη)"):
-        st.write(row_dict)
+        st.write(course.context)
 
+    lang = st.session_state['lang']
     btn = st.download_button(
         label="Download file",
-        data=make_word_file(row_dict),
-        file_name=f"Περίγραμμα-{course_code}-{st.session_state['lang']}.docx",
-        mime="document/docx"
+        data=lambda: render_course(lang, sheet_name, course),
+        file_name=f"Περίγραμμα-{course_code}-{lang}.docx",
+        mime="document/docx",
+        on_click="ignore",
     )
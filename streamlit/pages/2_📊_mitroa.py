@@ -1,9 +1,8 @@
 ﻿import sys
+from datetime import datetime
 from pathlib import Path
 
 import streamlit as st
-import pandas as pd
-import numpy as np
 import io
 
 st.set_page_config(
@@ -12,6 +11,8 @@ st.set_page_config(
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from auth import require_ihu_login  # noqa: E402
+from utils.gsheets import Snapshot, gsheet_snapshots, reload_gsheet  # noqa: E402
+from utils.mitroa_index import eklektores_index  # noqa: E402
 
 require_ihu_login()
 
@@ -27,32 +28,31 @@ except Exception as e:
 st.markdown('## Μητρώα γνωστικών αντικειμένων')
 
 
-@st.cache_data
-def load_gsheet(sheet_name) -> pd.DataFrame:
-    sheet_id = gsheet_mitroa_id
-    url = fr"https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
-    df = pd.read_csv(url, dtype_backend='pyarrow', index_col=0)
-    return df
-
-
 def reload() -> None:
-    """Clear cache to force reload from Google Sheets"""
-    st.cache_data.clear()
+    """Refetch the registry sheets from Google Sheets in the background (other caches are kept)"""
+    reload_gsheet(gsheet_mitroa_id)
+    st.toast("Η ενημέρωση από Google Sheets ξεκίνησε")
 
 
-def get_data() -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Get current data from both sheets"""
-    df_eklektores = load_gsheet('eklektores')
-    df_antikeimena = load_gsheet('antikeimena')
-    return df_eklektores, df_antikeimena
+def get_data() -> tuple[Snapshot, Snapshot]:
+    """Get both sheets (their local snapshots, fetched together when missing)"""
+    snapshots = gsheet_snapshots(gsheet_mitroa_id, ['eklektores', 'antikeimena'])
+    eklektores, antikeimena = snapshots['eklektores'], snapshots['antikeimena']
+    fetched_at = min(eklektores.fetched_at, antikeimena.fetched_at)
+    st.sidebar.caption(f"Δεδομένα της {datetime.fromtimestamp(fetched_at):%d/%m/%Y %H:%M}")
+    if eklektores.error or antikeimena.error:
+        st.sidebar.warning("Το Google Sheets δεν απαντά· εμφανίζεται το τελευταίο αντίγραφο.")
+    return eklektores, antikeimena
 
 
 # Load data
-df_eklektores, df_antikeimena = get_data()
+snapshot_eklektores, snapshot_antikeimena = get_data()
+df_eklektores, df_antikeimena = snapshot_eklektores.frame, snapshot_antikeimena.frame
 
 st.sidebar.button('Ενημέρωση από Google Sheets', on_click=reload)
 
-df_antikeimena['Εξωτερικοί Ιδίου'] = df_antikeimena['Εξωτερικοί Ιδίου'].fillna('')
+# The cached frame is shared between sessions, so fill on a copy.
+df_antikeimena = df_antikeimena.assign(**{'Εξωτερικοί Ιδίου': df_antikeimena['Εξωτερικοί Ιδίου'].fillna('')})
 
 
 tab_table_eklektores, tab_table_antikeimena, tab_statistics, tab_reports = st.tabs(
@@ -80,34 +80,14 @@ with tab_statistics:
     st.bar_chart(df_antikeimena['Επιστημονικό πεδίο'].value_counts())
 
 
-def get_codes_for_eklektores(df: pd.DataFrame, charaktirismos: str, selected_antikeimeno: str) -> list[int]:
-    matching = df[df['Γνωστικό αντικείμενο'] == selected_antikeimeno][charaktirismos]
-    if matching.empty:
-        return []
-    codes = matching.values[0].split('-')
-    if '' in codes:
-        codes.remove('')
-    return [int(i) for i in codes]
-
-
 with tab_reports:
-    antikeimena_list = sorted(df_antikeimena['Γνωστικό αντικείμενο'].unique())
-    selected_antikeimeno = st.selectbox('Επιλογή αντικειμένου', antikeimena_list)
-
-    codes_external_idiou = get_codes_for_eklektores(df_antikeimena, 'Εξωτερικοί Ιδίου', selected_antikeimeno)
-    codes_external_synafous = get_codes_for_eklektores(df_antikeimena, 'Εξωτερικοί Συναφούς', selected_antikeimeno)
-    codes = codes_external_idiou + codes_external_synafous
-    # st.write(codes_external_idiou)
-    # st.write(codes_external_synafous)
-    # st.write(codes)
-
-    df_antikeimeno_selected = df_eklektores[df_eklektores.index.isin(codes)].copy()
+    # Elector lists of every field, parsed once per version of the two sheets.
+    index = eklektores_index(gsheet_mitroa_id, snapshot_eklektores, snapshot_antikeimena)
+    selected_antikeimeno = st.selectbox('Επιλογή αντικειμένου', index.antikeimena)
 
-    df_antikeimeno_selected['Χαρακτηρισμός'] = np.where(df_antikeimeno_selected.index.isin(codes_external_idiou), 'Ιδίου', 'Συναφούς')
+    df_antikeimeno_selected = index.report(df_eklektores, selected_antikeimeno)
     df_antikeimeno_selected = df_antikeimeno_selected.fillna('')
     df_antikeimeno_selected = df_antikeimeno_selected.sort_values(by=['Χαρακτηρισμός', 'Επώνυμο', 'Όνομα'])
-    col_to_move = df_antikeimeno_selected.pop('Χαρακτηρισμός')
-    df_antikeimeno_selected.insert(0, col_to_move.name, col_to_move)
 
     st.dataframe(df_antikeimeno_selected)
 
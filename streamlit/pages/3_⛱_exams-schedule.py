@@ -1,13 +1,19 @@
-﻿from datetime import datetime, timedelta
+﻿from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
+import numpy as np
 import streamlit as st
 from streamlit_calendar import calendar
 
-from utils.colors import DEFAULT_SEMESTER_COLOR, SEMESTER_COLORS
-from utils.exams_data import default_period_index, discover_exam_periods, load_data
+from utils.exams_calendar import get_exam_calendar
+from utils.exams_data import EXTRA_COLUMNS, default_period_index, discover_exam_periods, load_data
 from utils.exams_export import create_weekly_calendar_document
+from utils.exams_ics import INSTRUCTOR, SUPERVISOR, get_ics_feeds
+from utils.exams_index import get_exams_index
+from utils.exams_supervisors import get_supervisor_workload
+from utils.export_cache import download_export
+from utils.file_watcher import start_file_watcher
+from utils.pdf_convert import pdf_available
 
 st.set_page_config(
     layout="wide",
@@ -15,6 +21,8 @@ st.set_page_config(
     page_icon="🗓️",
 )
 
+start_file_watcher()
+
 EXAMS_DIR = Path(__file__).parent.parent.parent / "files" / "exams"
 
 exam_periods = discover_exam_periods(EXAMS_DIR)
@@ -62,8 +70,11 @@ tab_full_table, tab_instructor_filter, tab_semester_filter, tab_epitiritis_filte
     ]
 )
 
-extra_column = "students_total" if program_selection == "ΔΙΠΑΕ" else "φοιτΤΕΙ"
+extra_column = EXTRA_COLUMNS[program_selection]
 df = load_data(INPUT_EXCEL, INPUT_SHEET, extra_column=extra_column)
+supervisor_workload = get_supervisor_workload(INPUT_EXCEL, INPUT_SHEET, df)
+exams_index = get_exams_index(INPUT_EXCEL, INPUT_SHEET, df, supervisor_workload.assignments)
+exam_calendar = get_exam_calendar(INPUT_EXCEL, INPUT_SHEET, df, extra_column)
 
 
 with tab_full_table:
@@ -71,7 +82,7 @@ with tab_full_table:
     display_cols = [col for col in df.columns if col not in ['start_dt', 'iso_week_number']]
     st.dataframe(df[display_cols])
 
-instructors = sorted(df["instructor"].unique().tolist())
+instructors = exams_index.keys("instructor")
 
 
 with tab_instructor_filter:
@@ -79,7 +90,7 @@ with tab_instructor_filter:
         "Επιλέξτε διδάσκοντα για φιλτράρισμα:",
         options=instructors)
 
-    df_instr = df[df["instructor"] == selected_instructor].sort_values(
+    df_instr = df.iloc[exams_index.rows("instructor", selected_instructor)].sort_values(
         by=["start_dt"]
     )
 
@@ -87,14 +98,23 @@ with tab_instructor_filter:
     display_cols = [col for col in df_instr.columns if col not in ['start_dt', 'iso_week_number']]
     st.dataframe(df_instr[display_cols])
 
+    st.download_button(
+        label="📅 Λήψη ημερολογίου (ICS)",
+        data=lambda: get_ics_feeds(INPUT_EXCEL, INPUT_SHEET, df).calendar(INSTRUCTOR, str(selected_instructor).strip()),
+        file_name=f"Εξετάσεις_{selected_instructor}_{program_selection}.ics",
+        mime="text/calendar",
+        help="Οι εξετάσεις του διδάσκοντα για Google/Outlook/Apple Calendar",
+        on_click="ignore",
+    )
+
 with tab_semester_filter:
-    semesters = sorted(df["semester"].unique().tolist())
+    semesters = exams_index.keys("semester")
     selected_semester = st.selectbox(
         "Επιλέξτε εξάμηνο για φιλτράρισμα:",
         options=semesters
     )
 
-    df_sem = df[df["semester"] == selected_semester].sort_values(
+    df_sem = df.iloc[exams_index.rows("semester", selected_semester)].sort_values(
         by=["start_dt"]
     )
 
@@ -103,12 +123,7 @@ with tab_semester_filter:
     st.dataframe(df_sem[display_cols], height=600)
 
 with tab_epitiritis_filter:
-    epitirites_list = []
-    for val in df["epitirites"].dropna().unique():
-        if pd.notna(val):
-            epitirites_list.extend([e.strip() for e in str(val).split(',')])
-
-    epitirites_unique = sorted(list(set(epitirites_list)))
+    epitirites_unique = supervisor_workload.supervisors
 
     if epitirites_unique:
         selected_epitiritis = st.selectbox(
@@ -116,29 +131,61 @@ with tab_epitiritis_filter:
             options=epitirites_unique
         )
 
-        df_epit = df[df["epitirites"].apply(
-            lambda x: selected_epitiritis in str(x) if pd.notna(x) else False
-        )].sort_values(by=["start_dt"])
+        df_epit = df.iloc[exams_index.rows("supervisor", selected_epitiritis)].sort_values(
+            by=["start_dt"]
+        )
 
         st.subheader(f"Πρόγραμμα Επιτηρήσεων - {selected_epitiritis}")
 
         display_cols = [col for col in df_epit.columns if col not in ['start_dt', 'iso_week_number']]
         st.dataframe(df_epit[display_cols], height=600)
 
+        st.download_button(
+            label="📅 Λήψη ημερολογίου (ICS)",
+            data=lambda: get_ics_feeds(INPUT_EXCEL, INPUT_SHEET, df).calendar(SUPERVISOR, selected_epitiritis),
+            file_name=f"Επιτηρήσεις_{selected_epitiritis}_{program_selection}.ics",
+            mime="text/calendar",
+            help="Οι επιτηρήσεις για Google/Outlook/Apple Calendar",
+            on_click="ignore",
+        )
+
         st.markdown("### Στατιστικά")
+        workload = supervisor_workload.summary.loc[selected_epitiritis]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Συνολικές Επιτηρήσεις", int(workload["supervisions"]))
+        with col2:
+            st.metric("Εβδομάδες με Επιτηρήσεις", int(workload["weeks"]))
+        with col3:
+            st.metric("Μέγιστες Επιτηρήσεις σε μία Ημέρα", int(workload["max_per_day"]))
+
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Συνολικές Επιτηρήσεις", len(df_epit))
+            st.markdown("#### Επιτηρήσεις ανά Ημέρα")
+            st.bar_chart(supervisor_workload.daily.loc[selected_epitiritis].rename("Επιτηρήσεις"))
         with col2:
-            unique_weeks = df_epit['week_number'].nunique()
-            st.metric("Εβδομάδες με Επιτηρήσεις", unique_weeks)
+            st.markdown("#### Επιτηρήσεις ανά Ώρα Έναρξης")
+            st.bar_chart(supervisor_workload.time_slots.loc[selected_epitiritis].rename("Επιτηρήσεις"))
+
+        with st.expander("Κατανομή επιτηρήσεων σε όλους τους επιτηρητές"):
+            st.dataframe(
+                supervisor_workload.summary.rename(
+                    columns={
+                        "supervisions": "Επιτηρήσεις",
+                        "weeks": "Εβδομάδες",
+                        "days": "Ημέρες",
+                        "max_per_day": "Μέγιστο ανά Ημέρα",
+                    }
+                ).rename_axis("Επιτηρητής"),
+            )
+            st.bar_chart(supervisor_workload.summary["supervisions"].rename("Επιτηρήσεις"))
     else:
         st.warning("⚠️ Δεν βρέθηκαν δεδομένα επιτηρητών στο αρχείο.")
 
 with tab_calendar:
     st.subheader("Ημερολόγιο Εξετάσεων")
 
-    semesters_all = sorted(df["semester"].unique().tolist())
+    semesters_all = exams_index.keys("semester")
     semester_options = [f"Εξάμηνο {int(s)}" for s in semesters_all]
 
     selected_calendar_semesters = st.multiselect(
@@ -149,10 +196,12 @@ with tab_calendar:
     )
 
     if not selected_calendar_semesters or len(selected_calendar_semesters) == len(semester_options):
+        calendar_rows = None
         df_calendar = df
     else:
         semester_nums = [int(s.split()[-1]) for s in selected_calendar_semesters]
-        df_calendar = df[df["semester"].isin(semester_nums)]
+        calendar_rows = exams_index.rows_any("semester", semester_nums)
+        df_calendar = df.iloc[calendar_rows]
 
     initial_date = df_calendar["exam_date"].min() if not df_calendar.empty else datetime.now().date()
 
@@ -170,46 +219,7 @@ with tab_calendar:
         }
     }
 
-    calendar_events = []
-    for _, row in df_calendar.iterrows():
-        if pd.notna(row["start_dt"]):
-            start_str = row["start_dt"].strftime("%Y-%m-%dT%H:%M:%S")
-
-            end_dt = row["start_dt"] + timedelta(hours=2)
-            end_str = end_dt.strftime("%Y-%m-%dT%H:%M:%S")
-
-            def clean_text(value):
-                if pd.notna(value):
-                    text = str(value).replace('\n', ' ').replace('\r', ' ')
-                    text = text.replace('"', '').replace("'", '').replace('\\', '')
-                    return text.strip()
-                return ""
-
-            course_name = clean_text(row['course_name'])
-            instructor = clean_text(row['instructor'])
-            room = clean_text(row['room'])
-            semester = int(row['semester']) if pd.notna(row['semester']) else 1
-            semester_str = str(semester)
-
-            color = SEMESTER_COLORS.get(semester, DEFAULT_SEMESTER_COLOR)
-
-            students_raw = row.get(extra_column) if extra_column else None
-            if pd.notna(students_raw):
-                try:
-                    students_str = str(int(float(students_raw)))
-                except (TypeError, ValueError):
-                    students_str = str(students_raw)
-                students_suffix = '\n' + f'Αρ. Φοιτ. {students_str}'
-            else:
-                students_suffix = ''
-
-            event = {
-                "title": f'Εξ.{semester_str} - {course_name} - {instructor}{students_suffix}',
-                "start": start_str,
-                "end": end_str,
-                "color": color
-            }
-            calendar_events.append(event)
+    calendar_events = exam_calendar.select(calendar_rows)
 
     if not selected_calendar_semesters or len(selected_calendar_semesters) == len(semester_options):
         st.write(f"📅 Σύνολο εξετάσεων: {len(calendar_events)} (όλα τα εξάμηνα)")
@@ -286,7 +296,7 @@ with tab_export_weekly:
     col1, col2 = st.columns(2)
 
     with col1:
-        semesters_export = sorted(df["semester"].unique().tolist())
+        semesters_export = exams_index.keys("semester")
         semester_options_export = [f"Εξάμηνο {int(s)}" for s in semesters_export]
 
         selected_export_semesters = st.multiselect(
@@ -297,7 +307,7 @@ with tab_export_weekly:
         )
 
     with col2:
-        weeks_available = sorted(df['week_number'].unique().tolist())
+        weeks_available = exams_index.keys("week")
         week_options = [f"Εβδομάδα {int(w)}" for w in weeks_available]
 
         selected_export_weeks = st.multiselect(
@@ -314,15 +324,17 @@ with tab_export_weekly:
         help="Επιλέξτε αν θέλετε να περιλαμβάνονται οι επιτηρητές στο εξαγόμενο αρχείο"
     )
 
-    df_export = df.copy()
+    export_rows = np.arange(len(df))
 
     if selected_export_semesters and len(selected_export_semesters) < len(semester_options_export):
         semester_nums = [int(s.split()[-1]) for s in selected_export_semesters]
-        df_export = df_export[df_export["semester"].isin(semester_nums)]
+        export_rows = np.intersect1d(export_rows, exams_index.rows_any("semester", semester_nums))
 
     if selected_export_weeks and len(selected_export_weeks) < len(week_options):
         week_nums = [int(w.split()[-1]) for w in selected_export_weeks]
-        df_export = df_export[df_export["week_number"].isin(week_nums)]
+        export_rows = np.intersect1d(export_rows, exams_index.rows_any("week", week_nums))
+
+    df_export = df.iloc[export_rows]
 
     st.markdown("### Προεπισκόπηση Δεδομένων")
     st.write(f"Σύνολο εξετάσεων προς εξαγωγή: {len(df_export)}")
@@ -336,26 +348,39 @@ with tab_export_weekly:
 
         st.markdown("### Λήψη Αρχείου")
 
-        try:
-            word_file = create_weekly_calendar_document(
+        filename = f"Πρόγραμμα_Εξετάσεων_{program_selection}_{period_selection}_{selected_period['academic_year']}.docx"
+
+        # The document is built on request, once per distinct rows/options.
+        export_options = {"period": period_selection, "include_epitirites": include_epitirites}
+        download_export(
+            "📥 Λήψη Word Αρχείου",
+            create_weekly_calendar_document,
+            df_export,
+            file_name=filename,
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            help="Κατεβάστε το εβδομαδιαίο πρόγραμμα εξετάσεων σε μορφή Word",
+            **export_options,
+        )
+        if pdf_available():
+            download_export(
+                "📥 Λήψη PDF Αρχείου",
+                create_weekly_calendar_document,
                 df_export,
-                period=period_selection,
-                include_epitirites=include_epitirites,
-            )
-
-            filename = f"Πρόγραμμα_Εξετάσεων_{program_selection}_{period_selection}_{selected_period['academic_year']}.docx"
-
-            st.download_button(
-                label="📥 Λήψη Word Αρχείου",
-                data=word_file,
-                file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                help="Κατεβάστε το εβδομαδιαίο πρόγραμμα εξετάσεων σε μορφή Word"
+                file_name=filename.removesuffix(".docx") + ".pdf",
+                mime="application/pdf",
+                help="Κατεβάστε το εβδομαδιαίο πρόγραμμα εξετάσεων σε μορφή PDF",
+                **export_options,
+                output_format="pdf",
             )
-
-            st.success("✅ Το αρχείο είναι έτοιμο για λήψη!")
-
-        except Exception as e:
-            st.error(f"Σφάλμα κατά τη δημιουργία του αρχείου: {e}")
     else:
         st.warning("⚠️ Δεν υπάρχουν δεδομένα με τα επιλεγμένα φίλτρα.")
+
+    st.markdown("### Ημερολόγια (ICS)")
+    st.markdown("Ένα ημερολόγιο ανά διδάσκοντα (εξετάσεις) και ανά επιτηρητή (επιτηρήσεις), για όλο το πρόγραμμα.")
+    st.download_button(
+        label="📅 Λήψη όλων των ημερολογίων (zip)",
+        data=lambda: get_ics_feeds(INPUT_EXCEL, INPUT_SHEET, df).zip_bytes,
+        file_name=f"Ημερολόγια_Εξετάσεων_{program_selection}_{period_selection}_{selected_period['academic_year']}.zip",
+        mime="application/zip",
+        on_click="ignore",
+    )
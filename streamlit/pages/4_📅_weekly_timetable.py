@@ -6,7 +6,10 @@ import streamlit as st
 from streamlit_calendar import calendar
 
 from utils.colors import DEFAULT_SEMESTER_COLOR, SEMESTER_COLORS
-from utils.timetable_data import load_data
+from utils.export_cache import download_export
+from utils.file_watcher import start_file_watcher
+from utils.pdf_convert import pdf_available
+from utils.timetable_data import TEACHING_PERIODS, TIMETABLE_SHEET, load_data
 from utils.timetable_export import create_weekly_timetable_document
 
 st.set_page_config(
@@ -15,11 +18,13 @@ st.set_page_config(
     page_icon="📅",
 )
 
+start_file_watcher()
+
 st.title("📅 Εβδομαδιαίο Πρόγραμμα Μαθημάτων")
 
 period_selection = st.radio(
     "Επιλέξτε εξάμηνο:",
-    options=["Χειμερινό", "Εαρινό"],
+    options=TEACHING_PERIODS,
     index=1,
     key="period_selection"
 )
@@ -27,7 +32,7 @@ period_selection = st.radio(
 st.markdown(f"Έχετε επιλέξει: **{period_selection} Εξάμηνο**")
 
 INPUT_EXCEL = Path(__file__).parent.parent.parent / "files" / "timetables" / "2025-2026.xlsm"
-SHEET_NAME = 'timetable'
+SHEET_NAME = TIMETABLE_SHEET
 
 
 try:
@@ -456,23 +461,29 @@ try:
 
             st.markdown("### Λήψη Αρχείου")
 
-            try:
-                word_file = create_weekly_timetable_document(df_export, period_selection)
-
-                filename = f"Προγραμμα_Μαθηματων_{period_selection}_2025-2026.docx"
-
-                st.download_button(
-                    label="📥 Λήψη Word Αρχείου",
-                    data=word_file,
-                    file_name=filename,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    help="Κατεβάστε το εβδομαδιαίο πρόγραμμα μαθημάτων σε μορφή Word"
+            filename = f"Προγραμμα_Μαθηματων_{period_selection}_2025-2026.docx"
+
+            # The document is built on request, once per distinct rows/period.
+            download_export(
+                "📥 Λήψη Word Αρχείου",
+                create_weekly_timetable_document,
+                df_export,
+                file_name=filename,
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                help="Κατεβάστε το εβδομαδιαίο πρόγραμμα μαθημάτων σε μορφή Word",
+                period=period_selection,
+            )
+            if pdf_available():
+                download_export(
+                    "📥 Λήψη PDF Αρχείου",
+                    create_weekly_timetable_document,
+                    df_export,
+                    file_name=filename.removesuffix(".docx") + ".pdf",
+                    mime="application/pdf",
+                    help="Κατεβάστε το εβδομαδιαίο πρόγραμμα μαθημάτων σε μορφή PDF",
+                    period=period_selection,
+                    output_format="pdf",
                 )
-
-                st.success("✅ Το αρχείο είναι έτοιμο για λήψη!")
-
-            except Exception as e:
-                st.error(f"Σφάλμα κατά τη δημιουργία του αρχείου: {e}")
         else:
             st.warning("⚠️ Δεν υπάρχουν δεδομένα με τα επιλεγμένα φίλτρα.")
 
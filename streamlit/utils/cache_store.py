@@ -0,0 +1,81 @@
+"""Process-wide cache for derived data, grouped in named namespaces.
+
+``st.cache_data.clear()`` drops every cache in the app at once. Entries here
+live in a namespace named after the data source they were derived from (one
+per workbook, see ``file_namespace``), so a changed source invalidates exactly
+its own entries and nothing else.
+
+Values are shared between sessions as-is (no copy), so they must be treated as
+read-only.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from pathlib import Path
+from typing import TypeVar
+
+T = TypeVar("T")
+
+MAX_ENTRIES_PER_NAMESPACE = 32
+
+_store: dict[str, OrderedDict[Hashable, object]] = {}
+_lock = threading.RLock()
+
+
+def file_namespace(path: Path) -> str:
+    """Namespace of the entries derived from the file at ``path``."""
+    return f"file:{path.resolve()}"
+
+
+def cached(
+    namespace: str, key: Hashable, build: Callable[[], T], max_entries: int = MAX_ENTRIES_PER_NAMESPACE
+) -> T:
+    """Value stored under ``key`` in ``namespace``, built with ``build()`` on a miss.
+
+    Each namespace keeps its ``max_entries`` most recently used entries.
+    """
+    with _lock:
+        entries = _store.get(namespace)
+        if entries is not None and key in entries:
+            entries.move_to_end(key)
+            return entries[key]
+
+    value = build()
+    store(namespace, key, value, max_entries)
+    return value
+
+
+def store(namespace: str, key: Hashable, value: object, max_entries: int = MAX_ENTRIES_PER_NAMESPACE) -> None:
+    """Store ``value`` under ``key`` in ``namespace``, replacing any previous value."""
+    with _lock:
+        entries = _store.setdefault(namespace, OrderedDict())
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > max_entries:
+            entries.popitem(last=False)
+
+
+def peek(namespace: str, key: Hashable) -> object | None:
+    """Value stored under ``key`` in ``namespace``, or None; never builds anything."""
+    with _lock:
+        entries = _store.get(namespace)
+        if entries is None or key not in entries:
+            return None
+        entries.move_to_end(key)
+        return entries[key]
+
+
+def invalidate(namespace: str, key: Hashable | None = None) -> None:
+    """Drop one entry of ``namespace``, or the whole namespace if ``key`` is None."""
+    with _lock:
+        if key is None:
+            _store.pop(namespace, None)
+        elif namespace in _store:
+            _store[namespace].pop(key, None)
+
+
+def namespaces() -> list[str]:
+    """Namespaces that currently hold entries."""
+    with _lock:
+        return [name for name, entries in _store.items() if entries]
@@ -0,0 +1,212 @@
+"""Base Word document for the exports (landscape A4 with the grid styles predefined).
+
+python-docx's default template carries ~800 KB of styles (164 styles plus a
+``stylesWithEffects`` copy), which every export used to parse on open and
+re-compress on save, and each export then set page size and run fonts by hand.
+The base document is built once per process: landscape A4, Calibri, and the
+paragraph styles of the schedule grids (``GRID_HEADER_STYLE``,
+``GRID_TIME_STYLE``, ``GRID_BODY_STYLE``), keeping only the styles the exports
+reference. ``new_document`` clones it from its saved bytes.
+
+The exports write their content as WordprocessingML strings (``paragraph_xml``,
+``cell_xml``, ``table_xml``) and add it with ``append_blocks`` in one parse,
+instead of a python-docx call per paragraph and cell. ``document_bytes`` goes
+one step further and splices the strings into the base package's
+``word/document.xml`` directly, so an export that only appends blocks never
+opens or saves the package through python-docx.
+"""
+
+import io
+import zipfile
+from functools import cache
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.document import Document as DocumentObject
+from docx.enum.section import WD_ORIENT
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+from docx.shared import Mm, Pt, RGBColor
+
+FONT_NAME = 'Calibri'
+TABLE_STYLE = 'Light Grid Accent 1'
+# Built-in styles keep Word's ids, which style_id() does not derive.
+TABLE_STYLE_ID = 'LightGrid-Accent1'
+
+# Day names above the grid.
+GRID_HEADER_STYLE = 'Grid Header'
+# Time slots in the first column.
+GRID_TIME_STYLE = 'Grid Time'
+# Exam/class text in the grid cells.
+GRID_BODY_STYLE = 'Grid Body'
+
+# Styles the exports use by name; everything they depend on is kept as well.
+_USED_STYLE_IDS = {
+    'Normal', 'DefaultParagraphFont', 'TableNormal', 'NoList',
+    'Title', 'Heading1', TABLE_STYLE_ID,
+}
+_STYLES_WITH_EFFECTS = 'http://schemas.microsoft.com/office/2007/relationships/stylesWithEffects'
+
+
+def style_id(style_name: str) -> str:
+    """Style id python-docx gives a custom style called ``style_name`` (for raw XML)."""
+    return style_name.replace(' ', '')
+
+
+def _add_grid_style(doc: DocumentObject, name: str, size: int, bold: bool = False,
+                    white: bool = False, centered: bool = False) -> None:
+    style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+    style.base_style = doc.styles['Normal']
+    style.font.name = FONT_NAME
+    style.font.size = Pt(size)
+    if bold:
+        style.font.bold = True
+    if white:
+        style.font.color.rgb = RGBColor(255, 255, 255)
+    if centered:
+        style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+def _drop_unused_styles(doc: DocumentObject, keep: set[str]) -> None:
+    styles = doc.styles.element
+    by_id = {s.get(qn('w:styleId')): s for s in styles.iterchildren(qn('w:style'))}
+
+    pending = list(keep)
+    while pending:
+        style = by_id.get(pending.pop())
+        if style is None:
+            continue
+        for ref in ('w:basedOn', 'w:link', 'w:next'):
+            ref_el = style.find(qn(ref))
+            if ref_el is not None and ref_el.get(qn('w:val')) not in keep:
+                keep.add(ref_el.get(qn('w:val')))
+                pending.append(ref_el.get(qn('w:val')))
+
+    for sid, style in by_id.items():
+        if sid not in keep:
+            styles.remove(style)
+
+
+def build_base_document() -> bytes:
+    """Saved bytes of the base document (see the module docstring)."""
+    doc = Document()
+
+    section = doc.sections[0]
+    section.orientation = WD_ORIENT.LANDSCAPE
+    section.page_width = Mm(297)
+    section.page_height = Mm(210)
+
+    doc.styles['Normal'].font.name = FONT_NAME
+    _add_grid_style(doc, GRID_HEADER_STYLE, 10, bold=True, white=True, centered=True)
+    _add_grid_style(doc, GRID_TIME_STYLE, 9, bold=True, white=True, centered=True)
+    _add_grid_style(doc, GRID_BODY_STYLE, 8)
+
+    grid_styles = {style_id(name) for name in (GRID_HEADER_STYLE, GRID_TIME_STYLE, GRID_BODY_STYLE)}
+    _drop_unused_styles(doc, _USED_STYLE_IDS | grid_styles)
+
+    # Word rebuilds stylesWithEffects on save; the thumbnail shows the blank template.
+    for rels, reltype in ((doc.part.rels, _STYLES_WITH_EFFECTS), (doc.part.package.rels, RT.THUMBNAIL)):
+        for r_id in [r_id for r_id, rel in rels.items() if rel.reltype == reltype]:
+            del rels[r_id]
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+@cache
+def base_document_bytes() -> bytes:
+    """``build_base_document()``, built once per process."""
+    return build_base_document()
+
+
+def new_document() -> DocumentObject:
+    """A fresh copy of the base document, ready to be filled in."""
+    return Document(io.BytesIO(base_document_bytes()))
+
+
+@cache
+def _base_package() -> tuple[list[tuple[zipfile.ZipInfo, bytes]], str, str]:
+    """Members of the base document, and its ``word/document.xml`` split where the body content goes."""
+    with zipfile.ZipFile(io.BytesIO(base_document_bytes())) as zf:
+        members = [(info, zf.read(info)) for info in zf.infolist()]
+    document = dict((info.filename, data) for info, data in members)['word/document.xml'].decode('utf-8')
+    # The body of the base document holds only its section properties.
+    split = document.rindex('<w:sectPr')
+    return members, document[:split], document[split:]
+
+
+def document_bytes(blocks: list[str]) -> bytes:
+    """Saved base document with the paragraph/table ``blocks`` added to its body.
+
+    Gives what ``new_document``, ``append_blocks`` and ``save`` give, without
+    parsing or re-serialising the package.
+    """
+    members, head, tail = _base_package()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        for info, data in members:
+            if info.filename == 'word/document.xml':
+                data = f'{head}{"".join(blocks)}{tail}'.encode('utf-8')
+            zf.writestr(info, data)
+    return buffer.getvalue()
+
+
+@cache
+def base_block_width() -> int:
+    """``block_width`` of the base document."""
+    return block_width(new_document())
+
+
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+CENTERED = '<w:jc w:val="center"/>'
+
+
+def paragraph_xml(text: str, style: str | None = None, ppr: str = '') -> str:
+    """Paragraph of style id ``style`` holding ``text``, with line breaks as ``w:br`` (like python-docx ``cell.text``)."""
+    lines = [f'<w:t xml:space="preserve">{escape(line)}</w:t>' for line in text.split('\n')]
+    style_xml = f'<w:pStyle w:val="{style}"/>' if style else ''
+    ppr_xml = f'<w:pPr>{style_xml}{ppr}</w:pPr>' if style_xml or ppr else ''
+    return f'<w:p>{ppr_xml}<w:r>{"<w:br/>".join(lines)}</w:r></w:p>'
+
+
+def cell_xml(width: int, fill: str, paragraph: str = '<w:p/>', span: int = 1, merge: str | None = None) -> str:
+    """``w:tc`` of ``width`` twips; ``span`` grid columns, ``merge`` is ``'restart'``/``'continue'`` for vertical merges."""
+    span_xml = f'<w:gridSpan w:val="{span}"/>' if span > 1 else ''
+    merge_xml = {None: '', 'restart': '<w:vMerge w:val="restart"/>', 'continue': '<w:vMerge/>'}[merge]
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/>{span_xml}{merge_xml}<w:shd w:fill="{fill}"/></w:tcPr>'
+        f'{paragraph}</w:tc>'
+    )
+
+
+def table_xml(grid_widths: list[int], rows: list[list[str]], row_height: int | None = None) -> str:
+    """``w:tbl`` in ``TABLE_STYLE`` with the given grid columns (twips) and rows of ``cell_xml`` cells."""
+    tr_pr = f'<w:trPr><w:trHeight w:val="{row_height}"/></w:trPr>' if row_height else ''
+    grid_cols = ''.join(f'<w:gridCol w:w="{width}"/>' for width in grid_widths)
+    trs = ''.join(f'<w:tr>{tr_pr}{"".join(cells)}</w:tr>' for cells in rows)
+    return (
+        '<w:tbl>'
+        f'<w:tblPr><w:tblStyle w:val="{TABLE_STYLE_ID}"/><w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+        ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+        f'<w:tblGrid>{grid_cols}</w:tblGrid>'
+        f'{trs}</w:tbl>'
+    )
+
+
+def append_blocks(doc: DocumentObject, blocks: list[str]) -> None:
+    """Parse the paragraph/table ``blocks`` in one go and add them where python-docx would."""
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{"".join(blocks)}</w:body>')
+    section_properties = doc.element.body.sectPr
+    for block in list(fragment):
+        section_properties.addprevious(block)
+
+
+def block_width(doc: DocumentObject) -> int:
+    """Width between the page margins (EMU), what python-docx gives a new table."""
+    section = doc.sections[-1]
+    return section.page_width - section.left_margin - section.right_margin
@@ -0,0 +1,81 @@
+"""FullCalendar events for the exams calendar tab.
+
+All events of a loaded sheet are compiled once per file version with
+vectorised string/datetime operations; filtering by semester then only picks
+already-built events by row position (see ``utils.exams_index``).
+"""
+
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_store import cached, file_namespace
+from utils.colors import DEFAULT_SEMESTER_COLOR, SEMESTER_COLORS
+
+EXAM_DURATION = timedelta(hours=2)
+EVENT_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+@dataclass(frozen=True)
+class ExamCalendar:
+    """One event per row of the exam frame (``None`` where the exam has no start time)."""
+
+    events: list[dict | None]
+
+    def select(self, positions: np.ndarray | None = None) -> list[dict]:
+        """Events of the rows at ``positions`` (all rows if ``None``)."""
+        if positions is None:
+            return [event for event in self.events if event is not None]
+        return [event for event in map(self.events.__getitem__, positions) if event is not None]
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """Single-line text without quotes or backslashes, which break the calendar component."""
+    text = values.astype(object).where(values.notna(), "").astype(str)
+    text = text.str.replace(r"[\n\r]", " ", regex=True)
+    return text.str.replace(r"[\"'\\]", "", regex=True).str.strip()
+
+
+def _students_suffix(students: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(students, errors="coerce")
+    as_int = np.trunc(numeric).astype("Int64").astype(str)
+    text = as_int.where(numeric.notna(), students.astype(object).astype(str))
+    return ("\nΑρ. Φοιτ. " + text).where(students.notna(), "")
+
+
+def compile_calendar_events(df: pd.DataFrame, extra_column: str | None = None) -> ExamCalendar:
+    """FullCalendar events for a frame returned by ``exams_data.load_data``.
+
+    ``extra_column`` holds the student count shown under the title, if any.
+    """
+    semester = pd.to_numeric(df["semester"], errors="coerce").fillna(1).astype(int)
+    color = semester.map(SEMESTER_COLORS).fillna(DEFAULT_SEMESTER_COLOR)
+
+    title = (
+        "Εξ." + semester.astype(str)
+        + " - " + _clean_text(df["course_name"])
+        + " - " + _clean_text(df["instructor"])
+    )
+    if extra_column and extra_column in df.columns:
+        title = title + _students_suffix(df[extra_column])
+
+    has_start = df["start_dt"].notna().to_numpy()
+    start = df["start_dt"].dt.strftime(EVENT_TIME_FORMAT)
+    end = (df["start_dt"] + EXAM_DURATION).dt.strftime(EVENT_TIME_FORMAT)
+
+    events = [
+        {"title": t, "start": s, "end": e, "color": c} if ok else None
+        for t, s, e, c, ok in zip(title.tolist(), start.tolist(), end.tolist(), color.tolist(), has_start)
+    ]
+    return ExamCalendar(events)
+
+
+def get_exam_calendar(
+    input_excel: Path, input_sheet: str, df: pd.DataFrame, extra_column: str | None = None
+) -> ExamCalendar:
+    """Compiled events for ``df`` (loaded from ``input_sheet`` of ``input_excel``), once per file version."""
+    key = ("exam_calendar", input_excel.stat().st_mtime_ns, input_sheet, extra_column)
+    return cached(file_namespace(input_excel), key, lambda: compile_calendar_events(df, extra_column))
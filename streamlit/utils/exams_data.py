@@ -1,11 +1,16 @@
+import json
 import re
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from utils.sheet_cache import SIDECAR_DIR_NAME, atomic_write_bytes, read_sheet, sheet_names
+
 EXAM_FILE_RE = re.compile(r"exams-(\d{4})-(\d{2})\.xlsm$", re.IGNORECASE)
+PERIOD_INDEX_FILE_NAME = "exam_periods.json"
 
 GREEK_MONTHS_GENITIVE = {
     1: "Ιανουαρίου",
@@ -23,6 +28,17 @@ GREEK_MONTHS_GENITIVE = {
 }
 
 
+DAY_NAMES_GREEK = [
+    "Δευτέρα",
+    "Τρίτη",
+    "Τετάρτη",
+    "Πέμπτη",
+    "Παρασκευή",
+    "Σάββατο",
+    "Κυριακή",
+]
+
+
 def _period_name(month: int) -> str:
     """Greek name of the exam period implied by its month."""
     if month in (1, 2):
@@ -45,21 +61,20 @@ def _academic_year(year: int, month: int) -> str:
     return f"{start}-{start + 1}"
 
 
-@st.cache_data(show_spinner=False)
 def _exam_date_range(input_excel_str: str) -> tuple[date | None, date | None]:
     """(min, max) exam_date in the file, read from the first sheet that has it."""
     path = Path(input_excel_str)
     try:
-        excel_file = pd.ExcelFile(path)
+        available_sheets = sheet_names(path)
     except Exception:
         return None, None
 
-    sheets = list(dict.fromkeys(["ΔΙΠΑΕ", "ΤΕΙ", *excel_file.sheet_names]))
+    sheets = list(dict.fromkeys(["ΔΙΠΑΕ", "ΤΕΙ", *available_sheets]))
     for sheet in sheets:
-        if sheet not in excel_file.sheet_names:
+        if sheet not in available_sheets:
             continue
         try:
-            df = pd.read_excel(path, sheet_name=sheet)
+            df = read_sheet(path, sheet, columns=["exam_date"])
         except Exception:
             continue
         if "exam_date" not in df.columns:
@@ -72,17 +87,54 @@ def _exam_date_range(input_excel_str: str) -> tuple[date | None, date | None]:
     return None, None
 
 
+def _load_period_index(index_path: Path) -> dict:
+    try:
+        return json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _scan_period_file(path: Path, year: int, month: int) -> dict:
+    """Index entry for one exam file; the only step that opens the workbook."""
+    stat = path.stat()
+    start_date, end_date = _exam_date_range(str(path))
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "year": year,
+        "month": month,
+        "name": _period_name(month),
+        "academic_year": _academic_year(year, month),
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+    }
+
+
 def discover_exam_periods(exams_dir: Path) -> list[dict]:
-    """Find ``exams-yyyy-mm.xlsm`` files and return metadata sorted chronologically."""
+    """Find ``exams-yyyy-mm.xlsm`` files and return metadata sorted chronologically.
+
+    Per-file metadata is kept in ``.cache/exam_periods.json`` inside ``exams_dir``;
+    only files whose size or mtime changed since the last call are re-scanned.
+    """
+    index_path = exams_dir / SIDECAR_DIR_NAME / PERIOD_INDEX_FILE_NAME
+    index = _load_period_index(index_path)
+    refreshed: dict[str, dict] = {}
+
     periods: list[dict] = []
     for path in exams_dir.glob("exams-*.xlsm"):
         match = EXAM_FILE_RE.search(path.name)
         if not match:
             continue
         year, month = int(match.group(1)), int(match.group(2))
-        start_date, end_date = _exam_date_range(str(path))
-        name = _period_name(month)
-        academic_year = _academic_year(year, month)
+
+        entry = index.get(path.name)
+        stat = path.stat()
+        if not entry or entry.get("size") != stat.st_size or entry.get("mtime_ns") != stat.st_mtime_ns:
+            entry = _scan_period_file(path, year, month)
+        refreshed[path.name] = entry
+
+        name = entry["name"]
+        academic_year = entry["academic_year"]
         periods.append(
             {
                 "path": path,
@@ -91,11 +143,19 @@ def discover_exam_periods(exams_dir: Path) -> list[dict]:
                 "name": name,
                 "academic_year": academic_year,
                 "label": f"{name} {academic_year} ({GREEK_MONTHS_GENITIVE[month]} {year})",
-                "start_date": start_date,
-                "end_date": end_date,
+                "start_date": date.fromisoformat(entry["start_date"]) if entry["start_date"] else None,
+                "end_date": date.fromisoformat(entry["end_date"]) if entry["end_date"] else None,
             }
         )
 
+    if refreshed != index:
+        try:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            data = json.dumps(refreshed, ensure_ascii=False, indent=2).encode("utf-8")
+            atomic_write_bytes(index_path, data)
+        except OSError:
+            pass
+
     periods.sort(key=lambda p: (p["year"], p["month"]))
     return periods
 
@@ -129,6 +189,44 @@ def default_period_index(periods: list[dict], today: date | None = None) -> int:
     return len(periods) - 1
 
 
+EXAM_COLUMNS = [
+    "course_id",
+    "course_name",
+    "semester",
+    "instructor",
+    "exam_date",
+    "start_time",
+    "room",
+    "notes",
+    "epitirites",
+]
+# Student-count column kept next to EXAM_COLUMNS, per programme sheet.
+EXTRA_COLUMNS = {"ΔΙΠΑΕ": "students_total", "ΤΕΙ": "φοιτΤΕΙ"}
+
+
+def _exam_frame(df: pd.DataFrame, input_sheet: str, extra_column: str | None) -> pd.DataFrame:
+    missing = [c for c in EXAM_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Λείπουν οι στήλες: {missing}")
+
+    if extra_column and extra_column not in df.columns:
+        raise ValueError(f"Λείπει η στήλη '{extra_column}' στο sheet '{input_sheet}'")
+
+    return normalize_exams(df[EXAM_COLUMNS + ([extra_column] if extra_column else [])])
+
+
+def read_exams(
+    input_excel: Path,
+    input_sheet: str,
+    extra_column: str | None = None,
+) -> pd.DataFrame:
+    """``load_data`` without Streamlit (for batch jobs): raises instead of reporting in the page."""
+    if input_sheet not in sheet_names(input_excel):
+        raise ValueError(f"Το sheet '{input_sheet}' δεν βρέθηκε στο αρχείο {input_excel.name}")
+    df = read_sheet(input_excel, input_sheet, columns=EXAM_COLUMNS + ([extra_column] if extra_column else []))
+    return _exam_frame(df, input_sheet, extra_column)
+
+
 def load_data(
     input_excel: Path,
     input_sheet: str,
@@ -145,79 +243,99 @@ def load_data(
         st.info(f"Αναζητούμενη διαδρομή: {input_excel.absolute()}")
         st.stop()
 
+    keep_cols = EXAM_COLUMNS + ([extra_column] if extra_column else [])
+
     try:
-        excel_file = pd.ExcelFile(input_excel)
-        available_sheets = excel_file.sheet_names
+        available_sheets = sheet_names(input_excel)
 
         if input_sheet not in available_sheets:
             st.error(f"❌ Το sheet '{input_sheet}' δεν βρέθηκε στο αρχείο!")
             st.info(f"Διαθέσιμα sheets: {', '.join(available_sheets)}")
             st.stop()
 
-        df = pd.read_excel(input_excel, sheet_name=input_sheet)
+        # Only keep_cols are streamed from the sheet, and only on the
+        # first read: later reads come from the Arrow sidecar (see utils.sheet_cache).
+        df = read_sheet(input_excel, input_sheet, columns=keep_cols)
     except Exception as e:
         st.error(f"❌ Σφάλμα κατά το άνοιγμα του αρχείου: {e}")
         st.stop()
 
-    required_cols = [
-        "course_id",
-        "course_name",
-        "semester",
-        "instructor",
-        "exam_date",
-        "start_time",
-        "room",
-        "notes",
-        "epitirites",
-    ]
-    missing = [c for c in required_cols if c not in df.columns]
-    if missing:
-        raise ValueError(f"Λείπουν οι στήλες: {missing}")
+    return _exam_frame(df, input_sheet, extra_column)
 
-    if extra_column and extra_column not in df.columns:
-        raise ValueError(f"Λείπει η στήλη '{extra_column}' στο sheet '{input_sheet}'")
 
-    keep_cols = required_cols + ([extra_column] if extra_column else [])
-    df = df[keep_cols]
+def _code_strings(values: pd.Series) -> pd.Series:
+    """Codes that mix numbers (101, 101.0) and text ("ΔΟΜ704") as strings; missing -> "".
 
-    df["exam_date"] = pd.to_datetime(df["exam_date"]).dt.date
-    df = df.dropna(subset=["exam_date"])
+    Integer-valued floats lose their ".0" so pyarrow doesn't infer int64 and
+    fail on the strings; text passes through unchanged ("0101" stays "0101").
+    Columns hold a few hundred distinct codes at most, so the work is done
+    once per distinct value and broadcast with ``take``.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    uniques = pd.Series(uniques, dtype=object)
+    is_float = uniques.map(lambda v: isinstance(v, (float, np.floating))).astype(bool)
+    numeric = pd.to_numeric(uniques.where(is_float), errors="coerce")
+    is_integer = is_float & numeric.notna() & (numeric % 1 == 0)
+    integers = numeric.where(is_integer).astype("Int64").astype(str)
+    normalized = uniques.astype(str).where(~is_integer, integers).to_numpy()
 
-    day_names_greek = {
-        0: 'Δευτέρα',
-        1: 'Τρίτη',
-        2: 'Τετάρτη',
-        3: 'Πέμπτη',
-        4: 'Παρασκευή',
-        5: 'Σάββατο',
-        6: 'Κυριακή',
-    }
-    df["day_of_week"] = pd.to_datetime(df["exam_date"]).dt.dayofweek.map(day_names_greek)
+    # Append "" for the missing-value sentinel (-1 picks the last element).
+    lookup = pd.array([*normalized, ""], dtype="str")
+    return pd.Series(lookup.take(codes), index=values.index)
 
-    df["start_time"] = df["start_time"].astype(str)
 
-    # room / course_id can mix numeric codes (e.g. 101) and strings (e.g. "ΔΟΜ704");
-    # normalize to string so pyarrow doesn't infer int64 and fail on the strings.
-    def _to_str(v: object) -> str:
-        if pd.isna(v):
-            return ""
-        if isinstance(v, float) and v.is_integer():
-            return str(int(v))
-        return str(v)
-
-    df["room"] = df["room"].apply(_to_str)
-    df["course_id"] = df["course_id"].apply(_to_str)
-
-    df["start_dt"] = pd.to_datetime(
-        df["exam_date"].astype(str) + " " + df["start_time"],
-        errors="coerce",
+def semester_label(value: object) -> str:
+    """A semester as shown in documents and events: 7.0 -> "7", missing -> "".
+
+    Semesters arrive as floats from sheets with blank cells (exam sheets,
+    the perigrammata sheets).
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return "" if value is None or pd.isna(value) else str(value)
+
+
+def _time_offsets(start_time: pd.Series) -> pd.Series:
+    """"H:MM" / "HH:MM:SS" start times as offsets from midnight (NaT if unparsable)."""
+    codes, uniques = pd.factorize(start_time, use_na_sentinel=True)
+    parts = pd.Series(uniques, dtype=str).str.extract(
+        r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?", expand=True
     )
+    hours = pd.to_numeric(parts[0])
+    minutes = pd.to_numeric(parts[1])
+    seconds = pd.to_numeric(parts[2]).fillna(0)
+    offsets = pd.to_timedelta(hours * 3600 + minutes * 60 + seconds, unit="s").to_numpy()
+
+    lookup = np.append(offsets, np.timedelta64("NaT")).astype(offsets.dtype)
+    return pd.Series(lookup.take(codes), index=start_time.index)
+
+
+def normalize_exams(df: pd.DataFrame) -> pd.DataFrame:
+    """Typed, vectorised normalisation of the raw exam columns read by ``load_data``.
+
+    Drops rows without ``exam_date`` and adds ``day_of_week``, ``start_dt``,
+    ``iso_week_number`` and ``week_number`` (1-based, in order of the ISO weeks
+    present in the sheet).
+    """
+    exam_dt = pd.to_datetime(df["exam_date"]).dt.normalize()
+    df = df.loc[exam_dt.notna()].copy()
+    exam_dt = exam_dt.loc[df.index]
+
+    df["exam_date"] = exam_dt.dt.date
+    df["day_of_week"] = pd.Categorical.from_codes(
+        exam_dt.dt.dayofweek.to_numpy(), categories=DAY_NAMES_GREEK
+    )
+
+    df["start_time"] = df["start_time"].astype(str)
+    df["room"] = _code_strings(df["room"])
+    df["course_id"] = _code_strings(df["course_id"])
 
+    df["start_dt"] = exam_dt + _time_offsets(df["start_time"])
     df["iso_week_number"] = df["start_dt"].dt.isocalendar().week
 
-    unique_weeks = sorted(df["iso_week_number"].unique())
-    week_mapping = {iso_week: idx + 1 for idx, iso_week in enumerate(unique_weeks)}
-    df["week_number"] = df["iso_week_number"].map(week_mapping)
+    codes, _ = pd.factorize(df["iso_week_number"], sort=True)
+    week_number = pd.Series(codes + 1, index=df.index)
+    df["week_number"] = week_number.where(codes >= 0) if (codes < 0).any() else week_number
 
     return df
 
@@ -1,165 +1,140 @@
-import io
 from collections import defaultdict
 
 import pandas as pd
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import Inches, Pt, RGBColor
+from docx.shared import Inches
+
+from utils.docx_template import (
+    CENTERED,
+    GRID_BODY_STYLE,
+    GRID_HEADER_STYLE,
+    GRID_TIME_STYLE,
+    PAGE_BREAK_XML,
+    cell_xml,
+    document_bytes,
+    paragraph_xml,
+    style_id,
+    table_xml,
+)
+from utils.pdf_convert import finish_document
+
+TIME_SLOTS = ['9:00', '12:00', '15:00', '18:00']
+DAY_NAMES_SHORT = {0: 'Δευ', 1: 'Τρί', 2: 'Τετ', 3: 'Πέμ', 4: 'Παρ', 5: 'Σάβ', 6: 'Κυρ'}
+EXAM_SEPARATOR = '\n--------------------------------\n'
+
+HEADER_FILL = '4472C4'
+ROW_FILLS = ('E7EFF7', 'D9E2F3')
+TIME_COLUMN_WIDTH = Inches(0.6)
+DAY_COLUMN_WIDTH = Inches(2.0)
+
+# Cell formatting comes from the base document's grid styles, referenced by id.
+_HEADER = style_id(GRID_HEADER_STYLE)
+_TIME = style_id(GRID_TIME_STYLE)
+_BODY = style_id(GRID_BODY_STYLE)
+
+
+def _slot_row(start_time: object) -> int | None:
+    """Table row (1-based) of the time slot an exam starts in, or None."""
+    exam_time = str(start_time)
+    if ':' in exam_time:
+        exam_hour = int(exam_time.split(':')[0])
+    else:
+        try:
+            exam_hour = int(float(exam_time))
+        except Exception:
+            return None
+    for time_idx, time_slot in enumerate(TIME_SLOTS):
+        if exam_hour == int(time_slot.split(':')[0]):
+            return time_idx + 1
+    return None
+
+
+def _exam_text(exam: dict, include_epitirites: bool) -> str:
+    semester = f"Εξάμ.{int(exam['semester'])}" if pd.notna(exam['semester']) else ''
+    course = str(exam['course_name']) if pd.notna(exam['course_name']) else ''
+    instructor = f'({exam["instructor"]})' if pd.notna(exam['instructor']) else ''
+
+    text = f"{semester} - {course}\n{instructor}"
+    if pd.notna(exam['room']) and str(exam['room']):
+        text += f"\n{exam['room']}"
+    if include_epitirites and pd.notna(exam['epitirites']):
+        text += f"\nΕπιτηρητές: [{exam['epitirites']}]"
+    return text
+
+
+def _cell(width: int, fill: str, text: str = '', style: str = _BODY) -> str:
+    return cell_xml(width, fill, paragraph_xml(text, style) if text else '<w:p/>')
+
+
+def _week_table(days: list, grid: dict[tuple[int, int], list[str]]) -> str:
+    """``w:tbl`` of one week: a header row of days and one row per time slot."""
+    time_width = TIME_COLUMN_WIDTH.twips
+    day_width = DAY_COLUMN_WIDTH.twips
+
+    header = [_cell(time_width, HEADER_FILL)]
+    for day in days:
+        day_name = DAY_NAMES_SHORT.get(day.weekday(), '')
+        header.append(
+            _cell(day_width, HEADER_FILL, f'{day_name} {day.strftime("%d/%m")}', _HEADER)
+        )
+    rows = [header]
+
+    for row_idx, time_slot in enumerate(TIME_SLOTS, start=1):
+        row_fill = ROW_FILLS[(row_idx - 1) % 2]
+        cells = [_cell(time_width, HEADER_FILL, time_slot, _TIME)]
+        for col_idx in range(1, len(days) + 1):
+            exams = grid.get((row_idx, col_idx))
+            text = EXAM_SEPARATOR.join(exams) if exams else ''
+            cells.append(_cell(day_width, row_fill, text))
+        rows.append(cells)
+
+    return table_xml([time_width] + [day_width] * len(days), rows)
 
 
 def create_weekly_calendar_document(
     df: pd.DataFrame,
     period: str,
     include_epitirites: bool = True,
+    output_format: str = 'docx',
 ) -> bytes:
-    """Δημιουργεί Word έγγραφο με εβδομαδιαίο πρόγραμμα εξετάσεων σε μορφή ημερολογίου."""
-    doc = Document()
+    """Δημιουργεί Word έγγραφο με εβδομαδιαίο πρόγραμμα εξετάσεων σε μορφή ημερολογίου.
 
-    section = doc.sections[0]
-    section.orientation = 1  # Landscape
-    section.page_width = Inches(11)
-    section.page_height = Inches(8.5)
+    Με ``output_format='pdf'`` επιστρέφει το ίδιο έγγραφο σε PDF (μέσω LibreOffice).
+    """
+    # Title/Heading1 are the style ids of python-docx's add_heading levels 0 and 1.
+    blocks = [paragraph_xml(f'Πρόγραμμα Εξετάσεων {period} Εξάμηνο 2025-2026', 'Title', CENTERED)]
 
-    title = doc.add_heading(f'Πρόγραμμα Εξετάσεων {period} Εξάμηνο 2025-2026', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    # A few hundred rows at most: plain dicts sorted in Python beat a frame sort and to_dict.
+    columns = ['week_number', 'exam_date', 'start_time', 'semester', 'course_name', 'instructor', 'room', 'epitirites']
+    exams = [dict(zip(columns, values)) for values in zip(*(df[column].tolist() for column in columns))]
+    exams_by_week = defaultdict(list)
+    for exam in sorted(exams, key=lambda exam: (exam['week_number'], exam['exam_date'], exam['start_time'])):
+        exams_by_week[exam['week_number']].append(exam)
 
     weeks = sorted(df['week_number'].unique())
 
     for week_idx, week in enumerate(weeks):
-        df_week = df[df['week_number'] == week].sort_values(by=['exam_date', 'start_time'])
-
-        if df_week.empty:
-            continue
-
-        days = sorted(df_week['exam_date'].unique())
-        if not days:
+        week_exams = exams_by_week.get(week)
+        if not week_exams:
             continue
 
+        days = sorted({exam['exam_date'] for exam in week_exams})
         week_start = days[0]
         week_end = days[-1]
 
-        doc.add_heading(
+        blocks.append(paragraph_xml(
             f'Εβδομάδα {week_idx + 1} ({week_start.strftime("%d/%m/%Y")} - {week_end.strftime("%d/%m/%Y")})',
-            level=1,
-        )
+            'Heading1',
+        ))
 
-        time_slots = ['9:00', '12:00', '15:00', '18:00']
-        num_days = len(days)
-
-        table = doc.add_table(rows=len(time_slots) + 1, cols=num_days + 1)
-        table.style = 'Light Grid Accent 1'
-
-        table.rows[0].cells[0].text = ''
-
-        day_names_map = {0: 'Δευ', 1: 'Τρί', 2: 'Τετ', 3: 'Πέμ', 4: 'Παρ', 5: 'Σάβ', 6: 'Κυρ'}
-        for day_idx, day in enumerate(days):
-            cell = table.rows[0].cells[day_idx + 1]
-            day_num = pd.to_datetime(day).dayofweek
-            day_name = day_names_map.get(day_num, '')
-            cell.text = f'{day_name} {day.strftime("%d/%m")}'
-            for paragraph in cell.paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Calibri'
-                    run.font.bold = True
-                    run.font.size = Pt(10)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-
-        for time_idx, time_slot in enumerate(time_slots):
-            cell = table.rows[time_idx + 1].cells[0]
-            cell.text = time_slot
-            for paragraph in cell.paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Calibri'
-                    run.font.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-
-        cell_exams = defaultdict(list)
-
-        for day_idx, day in enumerate(days):
-            df_day = df_week[df_week['exam_date'] == day]
-
-            for _, exam in df_day.iterrows():
-                exam_time = str(exam['start_time'])
-
-                if ':' in exam_time:
-                    exam_hour = int(exam_time.split(':')[0])
-                else:
-                    try:
-                        exam_hour = int(float(exam_time))
-                    except Exception:
-                        continue
-
-                time_row = None
-                for time_idx, time_slot in enumerate(time_slots):
-                    slot_hour = int(time_slot.split(':')[0])
-                    if exam_hour == slot_hour:
-                        time_row = time_idx + 1
-                        break
-
-                if time_row is None:
-                    continue
-
-                cell_key = (time_row, day_idx + 1)
-                cell_exams[cell_key].append({
-                    'time': exam_time,
-                    'semester': f"Εξάμ.{int(exam['semester'])}" if pd.notna(exam['semester']) else '',
-                    'course': str(exam['course_name']) if pd.notna(exam['course_name']) else '',
-                    'instructor': f'({str(exam["instructor"])})' if pd.notna(exam['instructor']) else '',
-                    'room': str(exam['room']) if pd.notna(exam['room']) else '',
-                    'epitirites': f'Επιτηρητές: [{str(exam["epitirites"])}]' if pd.notna(exam['epitirites']) else '',
-                })
-
-        for col_idx in range(0, num_days + 1):
-            cell = table.rows[0].cells[col_idx]
-            shading_elm = OxmlElement('w:shd')
-            shading_elm.set(qn('w:fill'), '4472C4')
-            cell._element.get_or_add_tcPr().append(shading_elm)
-
-        for row_idx in range(1, len(time_slots) + 1):
-            row_color = 'E7EFF7' if row_idx % 2 == 1 else 'D9E2F3'
-
-            for col_idx in range(0, num_days + 1):
-                cell = table.rows[row_idx].cells[col_idx]
-                shading_elm = OxmlElement('w:shd')
-                if col_idx == 0:
-                    shading_elm.set(qn('w:fill'), '4472C4')
-                else:
-                    shading_elm.set(qn('w:fill'), row_color)
-                cell._element.get_or_add_tcPr().append(shading_elm)
-
-        for (time_row, day_col), exams in cell_exams.items():
-            cell = table.rows[time_row].cells[day_col]
-
-            cell_content = []
-            for exam in exams:
-                exam_text = f"{exam['semester']} - {exam['course']}\n{exam['instructor']}"
-                if exam['room']:
-                    exam_text += f"\n{exam['room']}"
-                if include_epitirites and exam['epitirites']:
-                    exam_text += f"\n{exam['epitirites']}"
-                cell_content.append(exam_text)
-
-            cell.text = '\n--------------------------------\n'.join(cell_content)
-
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.font.name = 'Calibri'
-                    run.font.size = Pt(8)
-
-        for row in table.rows:
-            row.cells[0].width = Inches(0.6)
-            for i in range(1, num_days + 1):
-                row.cells[i].width = Inches(2.0)
+        day_columns = {day: day_idx + 1 for day_idx, day in enumerate(days)}
+        grid = defaultdict(list)
+        for exam in week_exams:
+            time_row = _slot_row(exam['start_time'])
+            if time_row is not None:
+                grid[(time_row, day_columns[exam['exam_date']])].append(_exam_text(exam, include_epitirites))
+        blocks.append(_week_table(days, grid))
 
         if week_idx < len(weeks) - 1:
-            doc.add_page_break()
+            blocks.append(PAGE_BREAK_XML)
 
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return finish_document(document_bytes(blocks), output_format)
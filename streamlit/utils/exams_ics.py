@@ -0,0 +1,297 @@
+"""ICS calendar feeds of an exam sheet: one per instructor and one per supervisor.
+
+Every exam row is turned into its VEVENT text once per feed kind (with the
+``ics`` library), and each person's feed is the join of the events of their
+rows: the instructor groups come from the ``instructor`` column and the
+supervisor groups from ``supervisor_assignments``, in a single pass over the
+frame. Feeds carry no build timestamp, so the same exams always give the
+same bytes and the same ``etag``.
+
+Builds are incremental: events are reused by a digest of the row they came
+from, and a person whose events did not change gets the previous
+``IcsFeed`` object back (same bytes, same ETag). Calendar clients polling a
+feed therefore see a change only when that person's exams change.
+
+    cd streamlit
+    python -m utils.exams_ics ../files/exams/exams-2026-06.xlsm [--out DIR] [--zip]
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import re
+import threading
+import zipfile
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+from ics import Calendar, Event
+from ics.grammar.parse import ContentLine
+
+from utils.cache_store import cached, file_namespace
+from utils.exams_calendar import EXAM_DURATION
+from utils.exams_data import EXTRA_COLUMNS, read_exams, semester_label
+from utils.exams_supervisors import supervisor_assignments
+
+TIMEZONE = ZoneInfo("Europe/Athens")
+UID_DOMAIN = "civil.ihu.gr"
+
+INSTRUCTOR = "instructor"
+SUPERVISOR = "supervisor"
+# Feed kind -> calendar/file name prefix.
+FEED_KINDS = {INSTRUCTOR: "Εξετάσεις", SUPERVISOR: "Επιτηρήσεις"}
+
+# Columns an event is made of; a change in any of them changes the row digest.
+EVENT_COLUMNS = ["course_id", "course_name", "semester", "instructor", "start_dt", "room", "notes", "epitirites"]
+# Fixed zip timestamps, so the same feeds always give the same archive.
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+_UNSAFE_FILE_CHARS = re.compile(r'[\\/:*?"<>|]')
+
+
+@dataclass(frozen=True)
+class IcsFeed:
+    """The calendar of one person: ``data`` is the .ics file, ``etag`` a strong HTTP ETag."""
+
+    kind: str
+    person: str
+    data: bytes
+    etag: str
+
+    @property
+    def file_name(self) -> str:
+        return f"{FEED_KINDS[self.kind]}_{_UNSAFE_FILE_CHARS.sub('_', self.person)}.ics"
+
+
+@dataclass(frozen=True)
+class IcsFeeds:
+    """Every feed of an exam sheet, keyed by (kind, person)."""
+
+    feeds: dict[tuple[str, str], IcsFeed]
+    # What the next build reuses: VEVENT text per (kind, row digest) and the
+    # event digests each feed was joined from.
+    events: dict[tuple[str, int], str] = field(default_factory=dict, repr=False)
+    sources: dict[tuple[str, str], tuple[int, ...]] = field(default_factory=dict, repr=False)
+
+    def get(self, kind: str, person: str) -> IcsFeed | None:
+        return self.feeds.get((kind, person))
+
+    def calendar(self, kind: str, person: str) -> bytes:
+        """The .ics file of ``person`` (an empty calendar if they have no dated exams)."""
+        feed = self.get(kind, person)
+        return feed.data if feed else _make_feed(kind, person, []).data
+
+    def people(self, kind: str) -> list[str]:
+        return sorted(person for feed_kind, person in self.feeds if feed_kind == kind)
+
+    @cached_property
+    def zip_bytes(self) -> bytes:
+        """All feeds in one zip (``<kind>/<file name>``); identical feeds give identical bytes."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+            for key in sorted(self.feeds):
+                feed = self.feeds[key]
+                info = zipfile.ZipInfo(f"{FEED_KINDS[feed.kind]}/{feed.file_name}", _ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                bundle.writestr(info, feed.data)
+        return buffer.getvalue()
+
+
+def _text(values: pd.Series) -> pd.Series:
+    return values.astype(object).where(values.notna(), "").astype(str).str.strip()
+
+
+def _row_digests(df: pd.DataFrame) -> np.ndarray:
+    columns = [c for c in EVENT_COLUMNS if c in df.columns]
+    return pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+
+
+def _uids(df: pd.DataFrame) -> list[str]:
+    """Per-row UIDs that survive edits of room, notes or supervisors (a moved exam is a new event)."""
+    key = _text(df["course_id"]) + "|" + _text(df["course_name"]) + "|" + df["start_dt"].astype(str)
+    occurrence = key.groupby(key.to_numpy()).cumcount().astype(str)
+    digests = pd.util.hash_pandas_object(key + "|" + occurrence, index=False).to_numpy()
+    return [f"{digest:016x}" for digest in digests]
+
+
+def _event_text(kind: str, uid: str, exam: dict) -> str:
+    semester = semester_label(exam['semester'])
+    lines = [
+        f"Μάθημα: {exam['course_name']}",
+        f"Κωδικός: {exam['course_id']}",
+        f"Εξάμηνο: {semester}",
+    ]
+    if kind == INSTRUCTOR:
+        name = f"Εξ.{semester} - {exam['course_name']}"
+        if exam["epitirites"]:
+            lines.append(f"Επιτηρητές: {exam['epitirites']}")
+    else:
+        name = f"Επιτήρηση: {exam['course_name']} (Εξ.{semester})"
+        lines.append(f"Διδάσκων: {exam['instructor']}")
+    if exam["notes"]:
+        lines.append(f"Σημειώσεις: {exam['notes']}")
+
+    event = Event(
+        name=name,
+        begin=exam["start_dt"].to_pydatetime().replace(tzinfo=TIMEZONE),
+        duration=EXAM_DURATION,
+        uid=f"{kind}-{uid}@{UID_DOMAIN}",
+        description="\n".join(lines),
+        location=exam["room"] or None,
+    )
+    return event.serialize()
+
+
+def _feed_header(kind: str, person: str) -> str:
+    calendar = Calendar()
+    calendar.extra.append(ContentLine("X-WR-CALNAME", value=f"{FEED_KINDS[kind]} - {person}"))
+    calendar.extra.append(ContentLine("X-WR-TIMEZONE", value=TIMEZONE.key))
+    return calendar.serialize().removesuffix("END:VCALENDAR")
+
+
+def _make_feed(kind: str, person: str, events: list[str]) -> IcsFeed:
+    data = (_feed_header(kind, person) + "".join(f"{event}\r\n" for event in events) + "END:VCALENDAR\r\n").encode("utf-8")
+    return IcsFeed(kind, person, data, f'"{hashlib.sha256(data).hexdigest()[:32]}"')
+
+
+def build_ics_feeds(df: pd.DataFrame, previous: IcsFeeds | None = None) -> IcsFeeds:
+    """Feeds of every instructor and supervisor of a frame returned by ``exams_data.load_data``.
+
+    Events and feeds that did not change since ``previous`` are reused as they are.
+    """
+    df = df.loc[df["start_dt"].notna()].sort_values(by=["start_dt", "course_name"], kind="stable")
+    df = df.reset_index(drop=True)
+    previous = previous or IcsFeeds({})
+
+    instructors = _text(df["instructor"])
+    assignments = supervisor_assignments(df)
+    groups = {
+        INSTRUCTOR: {person: rows for person, rows in instructors.groupby(instructors.to_numpy()).indices.items() if person},
+        SUPERVISOR: {
+            person: np.sort(rows.to_numpy())
+            for person, rows in assignments.groupby("supervisor", observed=True)["exam_row"]
+        },
+    }
+
+    digests = _row_digests(df)
+    sources = {
+        (kind, person): tuple(int(digests[row]) for row in rows)
+        for kind, people in groups.items()
+        for person, rows in people.items()
+    }
+
+    # Only rows whose event is not in ``previous`` are turned into events.
+    events: dict[tuple[str, int], str] = {}
+    missing: dict[tuple[str, int], int] = {}
+    for (kind, person), source in sources.items():
+        for row, digest in zip(groups[kind][person], source):
+            if (kind, digest) in previous.events:
+                events[kind, digest] = previous.events[kind, digest]
+            else:
+                missing.setdefault((kind, digest), row)
+
+    if missing:
+        uids = _uids(df)
+        rows = sorted(set(missing.values()))
+        subset = df.iloc[rows]
+        exams = dict(zip(rows, subset.assign(
+            course_id=_text(subset["course_id"]),
+            course_name=_text(subset["course_name"]),
+            instructor=_text(subset["instructor"]),
+            room=_text(subset["room"]),
+            notes=_text(subset["notes"]),
+            epitirites=_text(subset["epitirites"]),
+        ).to_dict("records")))
+        for (kind, digest), row in missing.items():
+            events[kind, digest] = _event_text(kind, uids[row], exams[row])
+
+    feeds = {
+        key: previous.feeds[key] if previous.sources.get(key) == source
+        else _make_feed(*key, [events[key[0], digest] for digest in source])
+        for key, source in sources.items()
+    }
+    return IcsFeeds(feeds, events, sources)
+
+
+_latest: dict[tuple[str, str], IcsFeeds] = {}
+_latest_lock = threading.Lock()
+
+
+def get_ics_feeds(input_excel: Path, input_sheet: str, df: pd.DataFrame) -> IcsFeeds:
+    """Feeds for ``df`` (loaded from ``input_sheet`` of ``input_excel``), built once per file version.
+
+    A new file version is built on top of the previous one, so only the feeds
+    whose exams changed get new bytes and ETags.
+    """
+    namespace = file_namespace(input_excel)
+
+    def build() -> IcsFeeds:
+        with _latest_lock:
+            previous = _latest.get((namespace, input_sheet))
+        feeds = build_ics_feeds(df, previous)
+        with _latest_lock:
+            _latest[namespace, input_sheet] = feeds
+        return feeds
+
+    return cached(namespace, ("ics_feeds", input_excel.stat().st_mtime_ns, input_sheet), build)
+
+
+MANIFEST_FILE_NAME = "feeds.json"
+
+
+def write_feeds(feeds: IcsFeeds, out_dir: Path) -> list[Path]:
+    """Write one .ics per person into ``out_dir/<kind>/``; returns the files actually (re)written.
+
+    Files whose ETag is unchanged are left untouched (a static web server then
+    keeps answering 304), feeds of people no longer in the sheet are removed,
+    and ``feeds.json`` maps every file to its ETag.
+    """
+    manifest_path = out_dir / MANIFEST_FILE_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+
+    current = {f"{FEED_KINDS[feed.kind]}/{feed.file_name}": feed for feed in feeds.feeds.values()}
+    written = []
+    for name, feed in sorted(current.items()):
+        target = out_dir / name
+        if manifest.get(name) == feed.etag and target.exists():
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(feed.data)
+        written.append(target)
+
+    for name in manifest.keys() - current.keys():
+        (out_dir / name).unlink(missing_ok=True)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(
+        json.dumps({name: feed.etag for name, feed in sorted(current.items())}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path, help="exams-yyyy-mm.xlsm file")
+    parser.add_argument("--out", type=Path, help="output directory (default: output/ics next to the file)")
+    parser.add_argument("--zip", action="store_true", help="also write one zip of all feeds per programme")
+    args = parser.parse_args()
+
+    out_dir = args.out or args.path.parent / "output" / "ics"
+    for programme, extra_column in EXTRA_COLUMNS.items():
+        feeds = build_ics_feeds(read_exams(args.path, programme, extra_column))
+        written = write_feeds(feeds, out_dir / args.path.stem / programme)
+        print(f"{programme}: {len(feeds.feeds)} ημερολόγια, {len(written)} άλλαξαν")
+        if args.zip:
+            (out_dir / f"{args.path.stem}_{programme}_ics.zip").write_bytes(feeds.zip_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Inverted indexes over a loaded exam sheet for the exams page filters.
+
+Each tab of the exams page filters by instructor, semester, week, room or
+supervisor. Instead of masking the whole frame on every rerun, the index maps
+every value of those fields to the row positions holding it, so a filter costs
+O(result). Supervisors are indexed per person, split out of the comma-separated
+``epitirites`` column, so selecting one never matches a partial name.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_store import cached, file_namespace
+from utils.exams_supervisors import supervisor_assignments
+
+INDEXED_FIELDS = {
+    "instructor": "instructor",
+    "semester": "semester",
+    "week": "week_number",
+    "room": "room",
+}
+
+_EMPTY = np.empty(0, dtype=np.intp)
+
+
+@dataclass(frozen=True)
+class ExamsIndex:
+    """Row positions of a loaded exam frame, per value of each filterable field."""
+
+    postings: dict[str, dict[object, np.ndarray]] = field(default_factory=dict)
+
+    def keys(self, field_name: str) -> list:
+        """Sorted distinct values of ``field_name`` (e.g. for a selectbox)."""
+        return list(self.postings[field_name])
+
+    def rows(self, field_name: str, value: object) -> np.ndarray:
+        """Positions of the rows whose ``field_name`` equals ``value``."""
+        return self.postings[field_name].get(value, _EMPTY)
+
+    def rows_any(self, field_name: str, values: list) -> np.ndarray:
+        """Sorted positions of the rows matching any of ``values``."""
+        postings = self.postings[field_name]
+        hits = [postings[v] for v in values if v in postings]
+        return np.unique(np.concatenate(hits)) if hits else _EMPTY
+
+
+def build_exams_index(df: pd.DataFrame, assignments: pd.DataFrame | None = None) -> ExamsIndex:
+    """Build the index for a frame returned by ``exams_data.load_data``.
+
+    ``assignments`` is the frame's ``supervisor_assignments`` table, if already built.
+    """
+    postings: dict[str, dict[object, np.ndarray]] = {}
+    for name, column in INDEXED_FIELDS.items():
+        if column not in df.columns:
+            postings[name] = {}
+            continue
+        groups = df.groupby(df[column].to_numpy(), sort=True, dropna=True).indices
+        postings[name] = {
+            key.item() if isinstance(key, np.generic) else key: rows for key, rows in groups.items()
+        }
+
+    if assignments is None and "epitirites" in df.columns:
+        assignments = supervisor_assignments(df)
+    postings["supervisor"] = {}
+    if assignments is not None:
+        by_supervisor = assignments.groupby("supervisor", observed=True, sort=True)["exam_row"]
+        postings["supervisor"] = {name: np.sort(rows.to_numpy()) for name, rows in by_supervisor}
+    return ExamsIndex(postings)
+
+
+def get_exams_index(
+    input_excel: Path,
+    input_sheet: str,
+    df: pd.DataFrame,
+    assignments: pd.DataFrame | None = None,
+) -> ExamsIndex:
+    """Index for ``df`` (loaded from ``input_sheet`` of ``input_excel``), built once per file version."""
+    key = ("exams_index", input_excel.stat().st_mtime_ns, input_sheet)
+    return cached(file_namespace(input_excel), key, lambda: build_exams_index(df, assignments))
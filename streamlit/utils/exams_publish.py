@@ -0,0 +1,245 @@
+"""Batch publication of the exam schedules of one or more periods.
+
+For every ``exams-yyyy-mm.xlsm`` given, renders each programme (ΔΙΠΑΕ, ΤΕΙ)
+with and without supervisors across a process pool, writes the documents
+(default: ``files/exams/output``) plus one zip bundle per period, and reports
+how long each document took. With ``--pdf`` every document is also converted
+to PDF by one LibreOffice pool (see ``utils.pdf_convert``) and the PDFs
+go into the bundles as well.
+
+A file that lacks a programme sheet is reported for that programme and the
+rest of the batch goes on, like a document whose PDF conversion failed.
+Reruns are incremental: each output directory keeps a manifest of the exam
+file (size, mtime) every document was rendered from, and documents whose
+file is unchanged are reused (``--force`` renders everything again).
+
+    cd streamlit
+    python -m utils.exams_publish ../files/exams/exams-2026-06.xlsm [--out DIR] [--workers N] [--pdf] [--force]
+"""
+
+import argparse
+import json
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from utils.exams_data import EXTRA_COLUMNS, discover_exam_periods, read_exams
+from utils.exams_export import create_weekly_calendar_document
+from utils.pdf_convert import PdfConverterPool
+from utils.sheet_cache import atomic_write_bytes
+
+SUPERVISORS_SUFFIX = " (με επιτηρητές)"
+MANIFEST_FILE_NAME = ".exams_publish.json"
+
+
+@dataclass(frozen=True)
+class PublishJob:
+    """One document: a programme sheet of a period file, with or without supervisors."""
+
+    path: Path
+    programme: str
+    include_epitirites: bool
+    period_name: str
+    academic_year: str
+    # "yyyy-mm" of the exam file: period names repeat across the files of a year.
+    year_month: str
+
+    @property
+    def period_stem(self) -> str:
+        return f"{self.period_name}_{self.academic_year}_{self.year_month}"
+
+    @property
+    def file_stem(self) -> str:
+        suffix = SUPERVISORS_SUFFIX if self.include_epitirites else ""
+        return f"Πρόγραμμα_Εξετάσεων_{self.programme}_{self.period_stem}{suffix}"
+
+
+@dataclass(frozen=True)
+class PublishResult:
+    job: PublishJob
+    # None when the document could not be rendered (see ``error``).
+    output: Path | None
+    rows: int
+    seconds: float
+    pdf: Path | None = None
+    pdf_seconds: float | None = None
+    pdf_error: str | None = None
+    error: str | None = None
+    # Kept from an earlier run: the exam file has not changed since.
+    reused: bool = False
+
+
+def publication_jobs(paths: list[Path]) -> list[PublishJob]:
+    """Every (programme x supervisors variant) document of each exam file in ``paths``."""
+    jobs = []
+    for path in paths:
+        periods = {p["path"].resolve(): p for p in discover_exam_periods(path.parent)}
+        period = periods.get(path.resolve())
+        if period is None:
+            raise ValueError(f"{path.name}: δεν είναι αρχείο εξεταστικής (exams-yyyy-mm.xlsm)")
+        year_month = f"{period['year']:04d}-{period['month']:02d}"
+        for programme in EXTRA_COLUMNS:
+            for include_epitirites in (False, True):
+                jobs.append(
+                    PublishJob(path, programme, include_epitirites, period["name"], period["academic_year"], year_month)
+                )
+    return jobs
+
+
+def render_job(job: PublishJob, out_dir: Path) -> PublishResult:
+    """Render ``job`` into ``out_dir`` (runs in a worker process)."""
+    start = time.perf_counter()
+    df = read_exams(job.path, job.programme, EXTRA_COLUMNS[job.programme])
+    data = create_weekly_calendar_document(df, period=job.period_name, include_epitirites=job.include_epitirites)
+
+    output = out_dir / f"{job.file_stem}.docx"
+    output.write_bytes(data)
+    return PublishResult(job, output, len(df), time.perf_counter() - start)
+
+
+def write_bundle(results: list[PublishResult], target: Path) -> Path:
+    """Zip the documents of ``results`` into ``target``."""
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as bundle:
+        for result in results:
+            if result.output is None:
+                continue
+            bundle.write(result.output, arcname=result.output.name)
+            if result.pdf is not None:
+                bundle.write(result.pdf, arcname=result.pdf.name)
+    return target
+
+
+def convert_results(results: list[PublishResult], workers: int | None = None) -> list[PublishResult]:
+    """``results`` with a PDF next to each rendered document, all converted by one pool."""
+    pending = [i for i, result in enumerate(results) if result.output is not None and result.pdf is None]
+    if not pending:
+        return results
+    with PdfConverterPool(**({"workers": workers} if workers else {})) as pool:
+        conversions = pool.convert([results[i].output for i in pending])
+    results = list(results)
+    for i, conversion in zip(pending, conversions):
+        results[i] = replace(
+            results[i], pdf=conversion.pdf, pdf_seconds=conversion.seconds, pdf_error=conversion.error
+        )
+    return results
+
+
+def _source_stamp(path: Path) -> dict:
+    stat = path.stat()
+    return {"source": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _load_manifest(target: Path) -> dict:
+    try:
+        return json.loads((target / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _reused_result(job: PublishJob, target: Path, manifest: dict, stamp: dict, pdf: bool) -> PublishResult | None:
+    """The result of an earlier run of ``job``, if its exam file is unchanged and its document is still there."""
+    output = target / f"{job.file_stem}.docx"
+    entry = manifest.get(output.name)
+    if entry is None or {k: entry.get(k) for k in stamp} != stamp or not output.exists():
+        return None
+    pdf_path = output.with_suffix(".pdf")
+    return PublishResult(
+        job, output, entry["rows"], 0.0, pdf=pdf_path if pdf and pdf_path.exists() else None, reused=True
+    )
+
+
+def publish(
+    paths: list[Path],
+    out_dir: Path | None = None,
+    workers: int | None = None,
+    pdf: bool = False,
+    force: bool = False,
+) -> list[PublishResult]:
+    """Render every document of ``paths`` in parallel and bundle each period.
+
+    Documents go to ``out_dir`` (default: ``output`` next to each exam file);
+    with ``pdf`` each one is converted to PDF as well. Documents of exam files
+    unchanged since the last run into the same directory are reused, unless
+    ``force``. A programme sheet missing from a file gives results with
+    ``error`` set instead of failing the batch.
+    """
+    jobs = publication_jobs(paths)
+
+    # Parse each sheet once here, so the workers only memory-map its sidecar.
+    sheet_errors: dict[tuple[Path, str], str] = {}
+    for path, programme in dict.fromkeys((job.path, job.programme) for job in jobs):
+        try:
+            read_exams(path, programme, EXTRA_COLUMNS[programme])
+        except ValueError as e:
+            sheet_errors[path, programme] = str(e)
+
+    targets = {path: out_dir or path.parent / "output" for path in paths}
+    for target in targets.values():
+        target.mkdir(parents=True, exist_ok=True)
+    manifests = {target: _load_manifest(target) for target in set(targets.values())}
+    stamps = {path: _source_stamp(path) for path in paths}
+
+    results: dict[PublishJob, PublishResult] = {}
+    for job in jobs:
+        error = sheet_errors.get((job.path, job.programme))
+        if error is not None:
+            results[job] = PublishResult(job, None, 0, 0.0, error=error)
+            continue
+        target = targets[job.path]
+        reused = None if force else _reused_result(job, target, manifests[target], stamps[job.path], pdf)
+        if reused is not None:
+            results[job] = reused
+
+    pending = [job for job in jobs if job not in results]
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {job: pool.submit(render_job, job, targets[job.path]) for job in pending}
+            results.update((job, future.result()) for job, future in futures.items())
+    ordered = [results[job] for job in jobs]
+
+    if pdf:
+        ordered = convert_results(ordered, workers)
+
+    for result in ordered:
+        if result.output is not None and not result.reused:
+            target = targets[result.job.path]
+            manifests[target][result.output.name] = {**stamps[result.job.path], "rows": result.rows}
+    for target, manifest in manifests.items():
+        data = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+        atomic_write_bytes(target / MANIFEST_FILE_NAME, data)
+
+    for path in paths:
+        period_results = [r for r in ordered if r.job.path == path]
+        if any(r.output is not None for r in period_results):
+            job = period_results[0].job
+            write_bundle(period_results, targets[path] / f"Πρόγραμμα_Εξετάσεων_{job.period_stem}.zip")
+    return ordered
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", type=Path, nargs="+", help="exams-yyyy-mm.xlsm files")
+    parser.add_argument("--out", type=Path, help="output directory (default: output next to each file)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--pdf", action="store_true", help="also convert every document to PDF (needs LibreOffice)")
+    parser.add_argument("--force", action="store_true", help="render every document again, even if unchanged")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = publish(args.paths, args.out, args.workers, args.pdf, args.force)
+    for result in results:
+        if result.output is None:
+            print(f"{'':>8}  {'':>5}  {result.job.path.name} {result.job.programme}: {result.error}")
+            continue
+        status = "(αμετάβλητο)" if result.reused else ""
+        print(f"{result.seconds * 1000:>8.1f}ms {result.rows:>5} γραμμές  {result.output.name} {status}".rstrip())
+        if result.pdf_seconds is not None:
+            status = result.pdf.name if result.pdf else f"PDF: {result.pdf_error}"
+            print(f"{result.pdf_seconds * 1000:>8.1f}ms {'':>13}{status}")
+    rendered = sum(result.output is not None for result in results)
+    print(f"{rendered} έγγραφα σε {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Supervisor (επιτηρητές) assignments and workload aggregates for an exam sheet.
+
+The ``epitirites`` column holds a comma-separated list of supervisors per exam.
+It is exploded once into a long ``(exam_row, supervisor)`` table with a
+categorical supervisor column, and the per-supervisor aggregates the exams page
+shows (totals, weeks, daily loads, time-slot histogram) are computed alongside
+it, so neither the supervisor tab nor a department-wide report re-parses the
+strings.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_store import cached, file_namespace
+
+
+@dataclass(frozen=True)
+class SupervisorWorkload:
+    """Supervision assignments of one exam sheet plus precomputed aggregates."""
+
+    # One row per (exam, supervisor): exam_row (position in the exam frame),
+    # supervisor (categorical), exam_date, week_number, start_time.
+    assignments: pd.DataFrame
+    # Per supervisor: supervisions, weeks, days, max_per_day; busiest first.
+    summary: pd.DataFrame
+    # Supervisions per (supervisor, exam_date).
+    daily: pd.Series
+    # Supervisors x start_time counts.
+    time_slots: pd.DataFrame
+
+    @property
+    def supervisors(self) -> list[str]:
+        """All supervisors, alphabetically."""
+        return list(self.assignments["supervisor"].cat.categories)
+
+
+def supervisor_assignments(df: pd.DataFrame) -> pd.DataFrame:
+    """Long ``(exam_row, supervisor)`` table from the ``epitirites`` column of ``df``."""
+    names = pd.Series(df["epitirites"].to_numpy(), index=pd.RangeIndex(len(df))).dropna()
+    names = names.astype(str).str.split(",").explode().str.strip()
+    names = names[names != ""]
+
+    exam_rows = names.index.to_numpy(dtype=np.intp)
+    assignments = pd.DataFrame(
+        {
+            "exam_row": exam_rows,
+            "supervisor": pd.Categorical(names.to_numpy(), categories=sorted(names.unique())),
+        }
+    )
+    for column in ("exam_date", "week_number", "start_time"):
+        if column in df.columns:
+            assignments[column] = df[column].to_numpy()[exam_rows]
+
+    # A name listed twice for the same exam is one supervision.
+    return assignments.drop_duplicates(subset=["exam_row", "supervisor"], ignore_index=True)
+
+
+def build_supervisor_workload(df: pd.DataFrame) -> SupervisorWorkload:
+    """Assignments and aggregates for a frame returned by ``exams_data.load_data``."""
+    assignments = supervisor_assignments(df)
+    by_supervisor = assignments.groupby("supervisor", observed=False)
+
+    daily = assignments.groupby(["supervisor", "exam_date"], observed=True).size()
+    summary = pd.DataFrame(
+        {
+            "supervisions": by_supervisor.size(),
+            "weeks": by_supervisor["week_number"].nunique(),
+            "days": by_supervisor["exam_date"].nunique(),
+            "max_per_day": daily.groupby(level="supervisor", observed=False).max(),
+        }
+    )
+    summary["max_per_day"] = summary["max_per_day"].fillna(0).astype(int)
+    summary = summary.sort_values(by=["supervisions", "max_per_day"], ascending=False, kind="stable")
+
+    time_slots = (
+        assignments.groupby(["supervisor", "start_time"], observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .reindex(assignments["supervisor"].cat.categories, fill_value=0)
+    )
+    return SupervisorWorkload(assignments, summary, daily, time_slots)
+
+
+def get_supervisor_workload(input_excel: Path, input_sheet: str, df: pd.DataFrame) -> SupervisorWorkload:
+    """Workload for ``df`` (loaded from ``input_sheet`` of ``input_excel``), built once per file version."""
+    key = ("supervisor_workload", input_excel.stat().st_mtime_ns, input_sheet)
+    return cached(file_namespace(input_excel), key, lambda: build_supervisor_workload(df))
@@ -0,0 +1,93 @@
+"""Generated export files, cached by content.
+
+An export is identified by the function that builds it, a digest of the rows
+it is built from and its options, so every identical request (from any
+session) after the first is served from memory.
+
+``download_export`` builds a file only when asked to (a button), in the page
+run itself, so the outcome (the download button and "ready" message, or the
+error) is shown in that same run. An export that was already built is offered
+for download straight away. The reason of a failed build is kept next to the
+exports in ``utils.cache_store`` until the same export succeeds.
+"""
+
+import hashlib
+import json
+from collections.abc import Callable
+
+import pandas as pd
+import streamlit as st
+
+from utils.cache_store import cached, invalidate, peek, store
+
+EXPORTS_NAMESPACE = "exports"
+FAILURES_NAMESPACE = "exports:failures"
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Digest of the columns, dtypes and values of ``df`` (row order included)."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()], ensure_ascii=False).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _export_key(build: Callable[..., bytes], df: pd.DataFrame, options: dict) -> tuple[str, str, str]:
+    return (
+        f"{build.__module__}.{build.__qualname__}",
+        frame_digest(df),
+        json.dumps(options, sort_keys=True, ensure_ascii=False, default=str),
+    )
+
+
+def cached_export(build: Callable[..., bytes], df: pd.DataFrame, **options) -> bytes:
+    """``build(df, **options)``, computed once per distinct (rows, options)."""
+    key = _export_key(build, df, options)
+    try:
+        data = cached(EXPORTS_NAMESPACE, key, lambda: build(df, **options))
+    except Exception as e:
+        store(FAILURES_NAMESPACE, key, str(e))
+        raise
+    invalidate(FAILURES_NAMESPACE, key)
+    return data
+
+
+def export_error(build: Callable[..., bytes], df: pd.DataFrame, **options) -> str | None:
+    """Why the last ``cached_export`` of the same export failed, or None."""
+    return peek(FAILURES_NAMESPACE, _export_key(build, df, options))
+
+
+def download_export(
+    label: str,
+    build: Callable[..., bytes],
+    df: pd.DataFrame,
+    *,
+    file_name: str,
+    mime: str,
+    help: str | None = None,
+    **options,
+) -> None:
+    """Download button for ``build(df, **options)``, behind a button that builds it.
+
+    The build runs in this page run, so its error or the "ready" message is
+    shown right away; an export already built is offered without the button.
+    """
+    key = _export_key(build, df, options)
+    data = peek(EXPORTS_NAMESPACE, key)
+
+    if data is None:
+        build_label = label.replace("📥 Λήψη", "⚙️ Δημιουργία", 1)
+        widget_key = hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        if st.button(build_label, key=f"build-{widget_key}", help=help):
+            try:
+                data = cached_export(build, df, **options)
+            except Exception:
+                pass  # recorded by cached_export, reported just below
+        if data is None:
+            error = export_error(build, df, **options)
+            if error:
+                st.error(f"Σφάλμα κατά τη δημιουργία του αρχείου: {error}")
+            return
+
+    st.download_button(label=label, data=data, file_name=file_name, mime=mime, help=help, on_click="ignore")
+    st.success("✅ Το αρχείο είναι έτοιμο για λήψη!")
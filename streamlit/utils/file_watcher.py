@@ -0,0 +1,138 @@
+"""Background watcher that keeps the caches of the Excel source files fresh.
+
+A daemon thread polls ``files/exams`` and ``files/timetables`` every few
+seconds by (size, mtime). When a workbook changes, only what was derived from
+that file is dropped (its ``utils.cache_store`` namespace and pooled handle)
+and rebuilt right away: its sidecars and, for an exam workbook, the index,
+supervisor workload and calendar of every programme sheet; for the timetable
+workbook, the timetable of each teaching period. The next page view is
+already warm and other files keep their caches.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import streamlit as st
+
+from utils.cache_store import file_namespace, invalidate
+from utils.exams_calendar import get_exam_calendar
+from utils.exams_data import EXAM_FILE_RE, EXTRA_COLUMNS, discover_exam_periods, read_exams
+from utils.exams_index import get_exams_index
+from utils.exams_supervisors import get_supervisor_workload
+from utils.sheet_cache import close_workbook, refresh_sidecars, sheet_names
+from utils.timetable_data import TEACHING_PERIODS, TIMETABLE_SHEET, get_timetable, timetable_sheet_names
+
+FILES_DIR = Path(__file__).resolve().parent.parent.parent / "files"
+EXAMS_DIR = FILES_DIR / "exams"
+TIMETABLES_DIR = FILES_DIR / "timetables"
+POLL_INTERVAL_SECONDS = 2.0
+
+logger = logging.getLogger(__name__)
+
+Stamp = tuple[int, int]
+
+
+def _snapshot(directory: Path, pattern: str) -> dict[Path, Stamp]:
+    stamps = {}
+    for path in directory.glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # removed between glob and stat
+        stamps[path] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+class FileWatcher:
+    """Polls directories and calls a handler for every workbook that changed."""
+
+    def __init__(self, interval: float = POLL_INTERVAL_SECONDS):
+        self.interval = interval
+        self._watches: list[tuple[Path, str, Callable[[Path], None]]] = []
+        self._stamps: dict[Path, Stamp] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def watch(self, directory: Path, pattern: str, handler: Callable[[Path], None]) -> None:
+        """Call ``handler(path)`` when a file matching ``pattern`` in ``directory`` changes."""
+        self._watches.append((directory, pattern, handler))
+        self._stamps.update(_snapshot(directory, pattern))
+
+    def poll(self) -> list[Path]:
+        """Check every watched directory once; returns the changed (or new) files."""
+        changed = []
+        for directory, pattern, handler in self._watches:
+            for path, stamp in _snapshot(directory, pattern).items():
+                if self._stamps.get(path) == stamp:
+                    continue
+                self._stamps[path] = stamp
+                changed.append(path)
+                try:
+                    handler(path)
+                except Exception:
+                    # A half-saved workbook fails to parse; the next save triggers another pass.
+                    logger.exception("Refreshing caches of %s failed", path)
+        return changed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def refresh_workbook(path: Path) -> None:
+    """Drop everything derived from the workbook at ``path`` and rebuild its sidecars."""
+    invalidate(file_namespace(path))
+    close_workbook(path)
+    refresh_sidecars(path)
+
+
+def warm_exams_workbook(path: Path) -> None:
+    """Build what the exams page derives from each programme sheet of ``path``, as the page does."""
+    available = sheet_names(path)
+    for sheet, extra_column in EXTRA_COLUMNS.items():
+        if sheet not in available:
+            continue
+        df = read_exams(path, sheet, extra_column)
+        workload = get_supervisor_workload(path, sheet, df)
+        get_exams_index(path, sheet, df, workload.assignments)
+        get_exam_calendar(path, sheet, df, extra_column)
+
+
+def refresh_exams_workbook(path: Path) -> None:
+    refresh_workbook(path)
+    if EXAM_FILE_RE.search(path.name):
+        discover_exam_periods(path.parent)
+        warm_exams_workbook(path)
+
+
+def warm_timetable_workbook(path: Path) -> None:
+    """Build the timetable of each teaching period of ``path``, as the timetable page does."""
+    if TIMETABLE_SHEET not in timetable_sheet_names(path):
+        return
+    for teaching_period in TEACHING_PERIODS:
+        get_timetable(path, TIMETABLE_SHEET, teaching_period)
+
+
+def refresh_timetable_workbook(path: Path) -> None:
+    refresh_workbook(path)
+    warm_timetable_workbook(path)
+
+
+@st.cache_resource(show_spinner=False)
+def start_file_watcher() -> FileWatcher:
+    """Start the process-wide watcher once (every session gets the same one)."""
+    watcher = FileWatcher()
+    watcher.watch(EXAMS_DIR, "*.xlsm", refresh_exams_workbook)
+    watcher.watch(TIMETABLES_DIR, "*.xlsm", refresh_timetable_workbook)
+    watcher.start()
+    return watcher
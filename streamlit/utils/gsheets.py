@@ -0,0 +1,275 @@
+"""Google Sheets tabs loaded as CSV and kept as local snapshots.
+
+Every fetched tab is stored under ``files/.cache/gsheets/<spreadsheet id>/`` as
+Parquet, with its fetch time and the SHA-256 of the CSV in ``meta.json``.
+``load_gsheet`` serves the snapshot at once (from memory, else from disk) and
+only waits for Google when a tab was never fetched. A snapshot older than
+``SNAPSHOT_TTL_SECONDS``, or one asked for with ``reload_gsheet``, is
+refreshed in a background thread: pages keep the current frame until the new
+one is in, and keep it for good while Google is slow or unreachable. A refresh
+whose CSV hashes the same as the snapshot only records the new fetch time; the
+CSV is not parsed and the frame stays the very same object.
+
+All fetches share one ``httpx.Client``, i.e. one keep-alive connection pool,
+and run on the store's refresh threads, so the tabs a page needs
+(``gsheet_snapshots``, ``prefetch_gsheets``) are fetched concurrently and a
+cold page waits about as long as its slowest tab. Each tab has its own budget:
+``FETCH_ATTEMPTS`` tries, retried on connection errors and 429/5xx answers,
+within ``FETCH_DEADLINE_SECONDS`` (each request's timeout is cut to the time
+left).
+
+Each spreadsheet is one ``utils.cache_store`` namespace for the entries
+derived from its tabs (keyed by the content hashes they were built from).
+When a tab's content changes the whole namespace is dropped, since an entry
+may combine several tabs; every other cache of the app (other spreadsheets,
+exams, timetables) is left alone.
+
+The returned frames are shared between sessions and must not be modified in place.
+"""
+
+import hashlib
+import io
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import cache
+from pathlib import Path
+
+import httpx
+import pandas as pd
+
+from utils.cache_store import invalidate
+from utils.sheet_cache import atomic_write_bytes
+
+GSHEET_CSV_URL = "https://docs.google.com/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent.parent / "files" / ".cache" / "gsheets"
+SNAPSHOT_TTL_SECONDS = 15 * 60
+META_FILE_NAME = "meta.json"
+# Tabs refreshed at the same time; also the size of the connection pool.
+REFRESH_WORKERS = 4
+
+FETCH_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+FETCH_ATTEMPTS = 3
+FETCH_DEADLINE_SECONDS = 60.0
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A tab as last fetched: ``fetched_at`` is when Google last answered (``time.time()``)."""
+
+    frame: pd.DataFrame
+    fetched_at: float
+    sha256: str
+    # When a refresh was last attempted, and why it failed if it did.
+    checked_at: float
+    error: str | None = None
+
+
+def gsheet_namespace(sheet_id: str) -> str:
+    """Namespace of the entries derived from the tabs of spreadsheet ``sheet_id``."""
+    return f"gsheet:{sheet_id}"
+
+
+def _parse_csv(data: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(data), dtype_backend='pyarrow', index_col=0)
+
+
+@cache
+def sheet_client() -> httpx.Client:
+    """Process-wide client: one keep-alive connection pool for every tab fetch."""
+    limits = httpx.Limits(max_connections=REFRESH_WORKERS, max_keepalive_connections=REFRESH_WORKERS)
+    return httpx.Client(timeout=FETCH_TIMEOUT, limits=limits, follow_redirects=True)
+
+
+def _fetch_csv(url: str) -> bytes:
+    """The CSV at ``url``, retried within the per-tab attempt and time budget.
+
+    Every request is given at most the time left until the deadline, so a
+    slow answer cannot stretch a tab's fetch past ``FETCH_DEADLINE_SECONDS``.
+    """
+    deadline = time.monotonic() + FETCH_DEADLINE_SECONDS
+    for attempt in range(1, FETCH_ATTEMPTS + 1):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise httpx.TimeoutException(f"{url}: no answer within {FETCH_DEADLINE_SECONDS:g}s")
+        timeout = httpx.Timeout(min(FETCH_TIMEOUT.read, remaining), connect=min(FETCH_TIMEOUT.connect, remaining))
+        delay = RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+        try:
+            response = sheet_client().get(url, timeout=timeout)
+        except httpx.TransportError:
+            if attempt == FETCH_ATTEMPTS or time.monotonic() + delay >= deadline:
+                raise
+        else:
+            last = attempt == FETCH_ATTEMPTS or time.monotonic() + delay >= deadline
+            if response.status_code not in RETRY_STATUS_CODES or last:
+                response.raise_for_status()
+                return response.content
+        time.sleep(delay)
+
+
+def fetch_gsheet(sheet_id: str, sheet_name: str) -> pd.DataFrame:
+    """Download tab ``sheet_name`` of spreadsheet ``sheet_id`` (no cache, no snapshot)."""
+    return _parse_csv(_fetch_csv(GSHEET_CSV_URL.format(sheet_id=sheet_id, sheet_name=sheet_name)))
+
+
+class SnapshotStore:
+    """Parquet snapshots of Google Sheets tabs under ``root``, refreshed in the background."""
+
+    def __init__(self, root: Path = SNAPSHOT_DIR, ttl: float = SNAPSHOT_TTL_SECONDS, url: str = GSHEET_CSV_URL):
+        self.root = root
+        self.ttl = ttl
+        self.url = url
+        self._snapshots: dict[tuple[str, str], Snapshot] = {}
+        self._refreshing: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._meta_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix="gsheet-refresh")
+
+    def _dir(self, sheet_id: str) -> Path:
+        return self.root / sheet_id
+
+    def _load_meta(self, sheet_id: str) -> dict:
+        try:
+            return json.loads((self._dir(sheet_id) / META_FILE_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_entry(self, sheet_id: str, sheet_name: str, entry: dict) -> None:
+        with self._meta_lock:
+            meta = self._load_meta(sheet_id)
+            meta[sheet_name] = entry
+            self._dir(sheet_id).mkdir(parents=True, exist_ok=True)
+            data = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+            atomic_write_bytes(self._dir(sheet_id) / META_FILE_NAME, data)
+
+    def _read_snapshot(self, sheet_id: str, sheet_name: str) -> Snapshot | None:
+        entry = self._load_meta(sheet_id).get(sheet_name)
+        if entry is None:
+            return None
+        try:
+            frame = pd.read_parquet(self._dir(sheet_id) / entry["file"], dtype_backend="pyarrow")
+        except (OSError, ValueError):
+            return None
+        return Snapshot(frame, entry["fetched_at"], entry["sha256"], entry["fetched_at"])
+
+    def _current(self, key: tuple[str, str]) -> Snapshot | None:
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = self._read_snapshot(*key)
+            if snapshot is not None:
+                with self._lock:
+                    snapshot = self._snapshots.setdefault(key, snapshot)
+        return snapshot
+
+    def _refresh(self, sheet_id: str, sheet_name: str) -> Snapshot:
+        key = (sheet_id, sheet_name)
+        current = self._current(key)
+        now = time.time()
+        try:
+            data = _fetch_csv(self.url.format(sheet_id=sheet_id, sheet_name=sheet_name))
+        except Exception as e:
+            if current is not None:
+                with self._lock:
+                    self._snapshots[key] = replace(current, checked_at=now, error=str(e))
+            raise
+
+        digest = hashlib.sha256(data).hexdigest()
+        file_name = f"{hashlib.sha1(sheet_name.encode('utf-8')).hexdigest()[:16]}.parquet"
+        if current is not None and current.sha256 == digest:
+            snapshot = replace(current, fetched_at=now, checked_at=now, error=None)
+        else:
+            snapshot = Snapshot(_parse_csv(data), now, digest, now)
+            try:
+                self._dir(sheet_id).mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(self._dir(sheet_id) / file_name, snapshot.frame.to_parquet())
+            except Exception:
+                # A snapshot that cannot be written only costs the offline copy.
+                pass
+
+        try:
+            self._save_entry(sheet_id, sheet_name, {"file": file_name, "fetched_at": now, "sha256": digest})
+        except OSError:
+            pass
+        with self._lock:
+            self._snapshots[key] = snapshot
+        if current is None or current.sha256 != digest:
+            invalidate(gsheet_namespace(sheet_id))
+        return snapshot
+
+    def refresh(self, sheet_id: str, sheet_name: str) -> Future:
+        """Refetch a tab in the background; one refresh per tab at a time. The future gives the ``Snapshot``."""
+        key = (sheet_id, sheet_name)
+        with self._lock:
+            future = self._refreshing.get(key)
+            if future is None or future.done():
+                future = self._refreshing[key] = self._executor.submit(self._refresh, sheet_id, sheet_name)
+            return future
+
+    def _stale(self, snapshot: Snapshot | None) -> bool:
+        return snapshot is None or time.time() - snapshot.checked_at > self.ttl
+
+    def prefetch(self, sheet_id: str, sheet_names: list[str]) -> None:
+        """Start refreshing every tab of ``sheet_names`` that is missing or stale, without waiting."""
+        for sheet_name in sheet_names:
+            if self._stale(self._current((sheet_id, sheet_name))):
+                self.refresh(sheet_id, sheet_name)
+
+    def get_many(self, sheet_id: str, sheet_names: list[str]) -> dict[str, Snapshot]:
+        """Snapshots of several tabs; the missing ones are fetched concurrently."""
+        self.prefetch(sheet_id, sheet_names)
+        return {sheet_name: self.get(sheet_id, sheet_name) for sheet_name in sheet_names}
+
+    def get(self, sheet_id: str, sheet_name: str) -> Snapshot:
+        """The current snapshot of a tab, refreshed in the background once older than ``ttl``.
+
+        Only a tab with no snapshot at all waits for the fetch (and raises if it fails).
+        """
+        snapshot = self._current((sheet_id, sheet_name))
+        if snapshot is None:
+            return self.refresh(sheet_id, sheet_name).result()
+        if self._stale(snapshot):
+            self.refresh(sheet_id, sheet_name)
+        return snapshot
+
+    def sheet_names(self, sheet_id: str) -> list[str]:
+        """Tabs of ``sheet_id`` with a snapshot (in memory or on disk)."""
+        with self._lock:
+            loaded = {name for sid, name in self._snapshots if sid == sheet_id}
+        return sorted(loaded | set(self._load_meta(sheet_id)))
+
+
+@cache
+def snapshot_store() -> SnapshotStore:
+    """Process-wide store, shared by every session."""
+    return SnapshotStore()
+
+
+def gsheet_snapshot(sheet_id: str, sheet_name: str) -> Snapshot:
+    """Snapshot of tab ``sheet_name``, with its fetch time and last refresh error."""
+    return snapshot_store().get(sheet_id, sheet_name)
+
+
+def gsheet_snapshots(sheet_id: str, sheet_names: list[str]) -> dict[str, Snapshot]:
+    """Snapshots of the tabs ``sheet_names``, the missing ones fetched concurrently."""
+    return snapshot_store().get_many(sheet_id, sheet_names)
+
+
+def prefetch_gsheets(sheet_id: str, sheet_names: list[str]) -> None:
+    """Refresh the missing or stale tabs of ``sheet_names`` in the background."""
+    snapshot_store().prefetch(sheet_id, sheet_names)
+
+
+def load_gsheet(sheet_id: str, sheet_name: str) -> pd.DataFrame:
+    """Tab ``sheet_name`` of spreadsheet ``sheet_id``, served from its snapshot."""
+    return gsheet_snapshot(sheet_id, sheet_name).frame
+
+
+def reload_gsheet(sheet_id: str, sheet_name: str | None = None) -> None:
+    """Refetch tab ``sheet_name`` (or every tab of the spreadsheet if None) in the background."""
+    for name in [sheet_name] if sheet_name is not None else snapshot_store().sheet_names(sheet_id):
+        snapshot_store().refresh(sheet_id, name)
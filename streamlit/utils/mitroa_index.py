@@ -0,0 +1,92 @@
+"""Index from the fields (γνωστικά αντικείμενα) of the registry to their external electors.
+
+The ``antikeimena`` sheet lists the electors of each field as hyphen-joined
+codes (``Εξωτερικοί Ιδίου``, ``Εξωτερικοί Συναφούς``) that refer to the index
+of the ``eklektores`` sheet. The lists are parsed once per version of the two
+sheets into CSR arrays, one pair per kind: ``offsets[i]:offsets[i + 1]`` is
+the slice of ``positions`` holding the row positions in ``eklektores`` of the
+electors of field ``i``. A report is then a slice and a ``take``, with no
+string parsing and no scan of the registry.
+
+Codes missing from ``eklektores`` are dropped, and an elector listed under
+both kinds of a field counts as Ιδίου.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from utils.cache_store import cached
+from utils.gsheets import Snapshot, gsheet_namespace
+
+ANTIKEIMENO_COLUMN = "Γνωστικό αντικείμενο"
+# Characterisation -> column of the hyphen-joined elector codes.
+KINDS = {"Ιδίου": "Εξωτερικοί Ιδίου", "Συναφούς": "Εξωτερικοί Συναφούς"}
+KIND_COLUMN = "Χαρακτηρισμός"
+
+
+def _codes(value: object) -> list[int]:
+    """Elector codes of one cell: ``"12-7-"`` -> ``[12, 7]``."""
+    if value is None or pd.isna(value):
+        return []
+    if not isinstance(value, str):
+        return [int(value)]
+    return [int(code) for code in value.split('-') if code.strip()]
+
+
+@dataclass(frozen=True)
+class EklektoresIndex:
+    """Electors of every field of the registry, as row positions of the ``eklektores`` frame."""
+
+    antikeimena: list[str]
+    offsets: dict[str, np.ndarray]
+    positions: dict[str, np.ndarray]
+    # Field name -> its row in the CSR arrays.
+    field_rows: dict[str, int]
+
+    def eklektores(self, antikeimeno: str, kind: str) -> np.ndarray:
+        """Row positions of the ``kind`` (Ιδίου/Συναφούς) electors of ``antikeimeno``."""
+        i = self.field_rows.get(antikeimeno)
+        if i is None:
+            return self.positions[kind][:0]
+        offsets = self.offsets[kind]
+        return self.positions[kind][offsets[i]:offsets[i + 1]]
+
+    def report(self, df_eklektores: pd.DataFrame, antikeimeno: str) -> pd.DataFrame:
+        """The electors of ``antikeimeno``, with their characterisation as first column."""
+        rows = {kind: self.eklektores(antikeimeno, kind) for kind in KINDS}
+        selected = df_eklektores.take(np.concatenate(list(rows.values())))
+        kinds = np.repeat(list(rows), [len(r) for r in rows.values()])
+        return selected.assign(**{KIND_COLUMN: kinds})[[KIND_COLUMN, *df_eklektores.columns]]
+
+
+def build_eklektores_index(df_eklektores: pd.DataFrame, df_antikeimena: pd.DataFrame) -> EklektoresIndex:
+    """Parse the elector lists of ``df_antikeimena`` against ``df_eklektores``; the first row of a field wins."""
+    first = df_antikeimena.drop_duplicates(ANTIKEIMENO_COLUMN)
+    first = first[first[ANTIKEIMENO_COLUMN].notna()]
+    names = first[ANTIKEIMENO_COLUMN].astype(str).tolist()
+    registry = pd.Index(df_eklektores.index)
+
+    offsets: dict[str, np.ndarray] = {}
+    positions: dict[str, np.ndarray] = {}
+    listed = [np.empty(0, dtype=np.intp)] * len(names)
+    for kind, column in KINDS.items():
+        cells = first[column].tolist() if column in first.columns else [None] * len(names)
+        lists = []
+        for i, cell in enumerate(cells):
+            found = registry.get_indexer_for(_codes(cell))
+            found = pd.unique(found[found >= 0])
+            found = found[~np.isin(found, listed[i])]
+            listed[i] = np.concatenate([listed[i], found])
+            lists.append(found)
+        offsets[kind] = np.concatenate([[0], np.cumsum([len(found) for found in lists])]).astype(np.intp)
+        positions[kind] = np.concatenate(lists).astype(np.intp) if lists else np.empty(0, dtype=np.intp)
+
+    return EklektoresIndex(sorted(names), offsets, positions, {name: i for i, name in enumerate(names)})
+
+
+def eklektores_index(sheet_id: str, eklektores: Snapshot, antikeimena: Snapshot) -> EklektoresIndex:
+    """Index of the registry spreadsheet ``sheet_id``, built once per version of its two tabs."""
+    key = ("eklektores_index", eklektores.sha256, antikeimena.sha256)
+    return cached(gsheet_namespace(sheet_id), key, lambda: build_eklektores_index(eklektores.frame, antikeimena.frame))
@@ -0,0 +1,364 @@
+"""PDF conversion of generated .docx files with a pool of headless LibreOffice workers.
+
+``docx2pdf`` needs MS Word, so the PDFs were made by hand. LibreOffice
+converts headlessly, but a cold ``soffice`` spends seconds starting (and
+creating its user profile) before converting anything.
+
+With LibreOffice's Python bridge (``uno``, the python3-uno package or the
+Python bundled with LibreOffice) every worker is a persistent listener: one
+``soffice --accept=socket,...;urp;`` process per user profile, started once
+and driven over UNO, so a conversion (including a single download from the
+pages) costs only the load and PDF export. A listener that crashes or
+exceeds the per-document timeout is killed and restarted on its next
+document, which is retried once.
+
+Without the bridge the pool falls back to the command line: each worker keeps
+an initialised profile, but every batch starts its own
+``soffice --convert-to pdf`` process, so startup is paid per batch (and per
+download). Documents a batch did not produce (crash, timeout) are retried one
+by one with a per-document timeout.
+
+Either way a document that still fails is reported in its
+``ConversionResult`` instead of failing the rest.
+"""
+
+import atexit
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+try:
+    import uno
+except ImportError:  # plain virtualenv: no listeners, command-line conversion only
+    uno = None
+
+SOFFICE_CANDIDATES = (
+    "soffice",
+    "libreoffice",
+    r"C:\Program Files\LibreOffice\program\soffice.exe",
+    "/Applications/LibreOffice.app/Contents/MacOS/soffice",
+)
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT_SECONDS = 60.0
+DEFAULT_BATCH_SIZE = 8
+OUTPUT_FORMATS = ("docx", "pdf")
+LISTENER_HOST = "127.0.0.1"
+PDF_FILTER = "writer_pdf_Export"
+CONVERSION_ERROR = "η μετατροπή απέτυχε ή ξεπέρασε το χρονικό όριο"
+
+
+class PdfConversionError(RuntimeError):
+    """LibreOffice is missing or could not convert a document."""
+
+
+@dataclass(frozen=True)
+class ConversionResult:
+    source: Path
+    pdf: Path | None
+    seconds: float
+    error: str | None = None
+
+
+def find_soffice() -> str | None:
+    """Path of the LibreOffice executable, or None if it is not installed."""
+    for candidate in SOFFICE_CANDIDATES:
+        found = shutil.which(candidate) or (candidate if Path(candidate).is_file() else None)
+        if found:
+            return found
+    return None
+
+
+def pdf_available() -> bool:
+    """Whether PDF output can be offered (LibreOffice is installed)."""
+    return find_soffice() is not None
+
+
+def _popen(command: list[str]) -> subprocess.Popen:
+    # A session of its own, so the soffice.bin it forks can be killed along with it.
+    popen_kwargs = {"start_new_session": True} if os.name == "posix" else {}
+    return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_kwargs)
+
+
+def _kill(process: subprocess.Popen) -> None:
+    # soffice forks soffice.bin, which would otherwise keep the profile locked.
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+    process.wait()
+
+
+def _run(command: list[str], timeout: float) -> bool:
+    """Run ``command``; on timeout kill it with every process it started. Returns success."""
+    process = _popen(command)
+    try:
+        return process.wait(timeout=timeout) == 0
+    except subprocess.TimeoutExpired:
+        _kill(process)
+        return False
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind((LISTENER_HOST, 0))
+        return s.getsockname()[1]
+
+
+def _properties(**values) -> tuple:
+    properties = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name, prop.Value = name, value
+        properties.append(prop)
+    return tuple(properties)
+
+
+class _Listener:
+    """One persistent headless ``soffice`` with its own profile, driven over UNO.
+
+    (Re)started on demand; ``close`` kills it, which also aborts a conversion
+    in progress.
+    """
+
+    def __init__(self, soffice: str, profile: Path, timeout: float):
+        self.soffice = soffice
+        self.profile = profile
+        self.timeout = timeout
+        self._process: subprocess.Popen | None = None
+        self._desktop = None
+
+    def _start(self) -> None:
+        port = _free_port()
+        connection = f"socket,host={LISTENER_HOST},port={port};urp;StarOffice.ComponentContext"
+        self._process = _popen([
+            self.soffice,
+            f"-env:UserInstallation={self.profile.as_uri()}",
+            "--headless", "--invisible", "--norestore", "--nolockcheck", "--nodefault",
+            f"--accept={connection}",
+        ])
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                context = resolver.resolve(f"uno:{connection}")
+                break
+            except Exception:
+                # Not accepting yet (the first start also creates the profile).
+                if self._process.poll() is not None or time.monotonic() > deadline:
+                    self.close()
+                    raise PdfConversionError("Το LibreOffice δεν ξεκίνησε") from None
+                time.sleep(0.1)
+        self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+
+    def start(self) -> "_Listener":
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+        return self
+
+    def convert(self, source: Path, target: Path) -> None:
+        self.start()
+        # A hung conversion is aborted by killing the listener under it.
+        expired = threading.Event()
+        watchdog = threading.Timer(self.timeout, lambda: (expired.set(), self.close()))
+        watchdog.start()
+        try:
+            document = self._desktop.loadComponentFromURL(source.resolve().as_uri(), "_blank", 0, _properties(Hidden=True))
+            try:
+                document.storeToURL(target.resolve().as_uri(), _properties(FilterName=PDF_FILTER))
+            finally:
+                document.close(True)
+        finally:
+            watchdog.cancel()
+        if expired.is_set() or not target.exists():
+            raise PdfConversionError(f"{source.name}: {CONVERSION_ERROR}")
+
+    def close(self) -> None:
+        process, self._process, self._desktop = self._process, None, None
+        if process is not None and process.poll() is None:
+            _kill(process)
+
+
+class PdfConverterPool:
+    """Headless LibreOffice workers, one user profile each, converting .docx files to PDF.
+
+    Workers are persistent UNO listeners when ``uno`` can be imported, else
+    profiles for per-batch ``soffice --convert-to`` runs (``listening`` tells which).
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        soffice: str | None = None,
+    ):
+        self.soffice = soffice or find_soffice()
+        if self.soffice is None:
+            raise PdfConversionError("Το LibreOffice (soffice) δεν βρέθηκε για τη μετατροπή σε PDF")
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.listening = uno is not None
+
+        self._root = Path(tempfile.mkdtemp(prefix="pdf-pool-"))
+        self._profiles: queue.Queue[Path] = queue.Queue()
+        self._listeners: queue.Queue[_Listener] = queue.Queue()
+        self._all_listeners: list[_Listener] = []
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-worker")
+        profiles = [self._root / f"profile-{i}" for i in range(workers)]
+        if self.listening:
+            self._all_listeners = [_Listener(self.soffice, profile, timeout) for profile in profiles]
+            for warmup in [self._executor.submit(listener.start) for listener in self._all_listeners]:
+                self._listeners.put(warmup.result())
+        else:
+            for warmup in [self._executor.submit(self._warm_profile, profile) for profile in profiles]:
+                self._profiles.put(warmup.result())
+
+    def _command(self, profile: Path, out_dir: Path, sources: list[Path]) -> list[str]:
+        return [
+            self.soffice,
+            f"-env:UserInstallation={profile.as_uri()}",
+            "--headless", "--norestore", "--nolockcheck",
+            "--convert-to", "pdf", "--outdir", str(out_dir),
+            *map(str, sources),
+        ]
+
+    def _warm_profile(self, profile: Path) -> Path:
+        # First start only creates the user profile; later conversions reuse it.
+        _run([self.soffice, f"-env:UserInstallation={profile.as_uri()}", "--headless",
+              "--norestore", "--terminate_after_init"], self.timeout)
+        return profile
+
+    def _convert_batch(self, sources: list[Path], timeout: float) -> dict[Path, tuple[Path | None, float]]:
+        profile = self._profiles.get()
+        try:
+            with tempfile.TemporaryDirectory(dir=self._root) as tmp:
+                start = time.perf_counter()
+                _run(self._command(profile, Path(tmp), sources), timeout)
+                per_document = (time.perf_counter() - start) / len(sources)
+
+                converted = {}
+                for source in sources:
+                    produced = Path(tmp) / f"{source.stem}.pdf"
+                    if produced.exists():
+                        target = source.with_suffix(".pdf")
+                        shutil.move(produced, target)
+                        converted[source] = (target, per_document)
+                    else:
+                        converted[source] = (None, per_document)
+                return converted
+        finally:
+            self._profiles.put(profile)
+
+    def _batches(self, sources: list[Path]) -> list[list[Path]]:
+        # soffice names outputs by stem, so a batch never holds the same stem twice.
+        batches: list[list[Path]] = []
+        for source in sources:
+            for batch in batches:
+                if len(batch) < self.batch_size and all(s.stem != source.stem for s in batch):
+                    batch.append(source)
+                    break
+            else:
+                batches.append([source])
+        return batches
+
+    def _convert_listening(self, source: Path) -> ConversionResult:
+        start = time.perf_counter()
+        target = source.with_suffix(".pdf")
+        listener = self._listeners.get()
+        try:
+            # A failed conversion leaves the listener killed; the retry restarts it.
+            for _ in range(2):
+                try:
+                    listener.convert(source, target)
+                    return ConversionResult(source, target, time.perf_counter() - start)
+                except Exception:
+                    listener.close()
+            return ConversionResult(source, None, time.perf_counter() - start, CONVERSION_ERROR)
+        finally:
+            self._listeners.put(listener)
+
+    def convert(self, sources: list[Path]) -> list[ConversionResult]:
+        """Convert ``sources`` to PDFs next to them; results follow the order of ``sources``."""
+        if self.listening:
+            return list(self._executor.map(self._convert_listening, sources))
+
+        done: dict[Path, tuple[Path | None, float]] = {}
+        batches = self._batches(sources)
+        for converted in self._executor.map(lambda b: self._convert_batch(b, self.timeout * len(b)), batches):
+            done.update(converted)
+
+        # Fallback queue: whatever a batch missed is retried alone, so one bad
+        # document cannot take the rest of its batch down with it.
+        fallback = [source for source in sources if done[source][0] is None]
+        for converted in self._executor.map(lambda s: self._convert_batch([s], self.timeout), fallback):
+            done.update(converted)
+
+        return [
+            ConversionResult(source, pdf, seconds, None if pdf else CONVERSION_ERROR)
+            for source in sources
+            for pdf, seconds in [done[source]]
+        ]
+
+    def convert_bytes(self, data: bytes, name: str = "document") -> bytes:
+        """PDF bytes of the .docx ``data``."""
+        with tempfile.TemporaryDirectory(dir=self._root) as tmp:
+            source = Path(tmp) / f"{name}.docx"
+            source.write_bytes(data)
+            result = self.convert([source])[0]
+            if result.pdf is None:
+                raise PdfConversionError(f"{name}: {result.error}")
+            return result.pdf.read_bytes()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for listener in self._all_listeners:
+            listener.close()
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def __enter__(self) -> "PdfConverterPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_shared_lock = threading.Lock()
+
+
+@cache
+def _shared_pool() -> PdfConverterPool:
+    pool = PdfConverterPool()
+    atexit.register(pool.close)
+    return pool
+
+
+def shared_pool() -> PdfConverterPool:
+    """Process-wide pool, started on first use."""
+    with _shared_lock:
+        return _shared_pool()
+
+
+def docx_to_pdf(data: bytes) -> bytes:
+    """Convert a generated .docx (bytes) to PDF through the shared pool."""
+    return shared_pool().convert_bytes(data)
+
+
+def finish_document(data: bytes, output_format: str = "docx") -> bytes:
+    """An export's .docx ``data`` in ``output_format`` (one of ``OUTPUT_FORMATS``)."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Άγνωστη μορφή αρχείου: {output_format}")
+    return docx_to_pdf(data) if output_format == "pdf" else data
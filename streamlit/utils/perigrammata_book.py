@@ -0,0 +1,308 @@
+"""The course-syllabus book: every outline of a perigrammata sheet in one .docx.
+
+Replaces the notebook routine (render each row, save it, merge the files with
+``docxcompose``). The rows of a sheet are rendered through the docxtpl
+template on a process pool (each worker compiles the template once, see
+``utils.perigrammata_export``), then composed in semester order into one
+document: a heading per semester (rows without one come last, unheaded) and
+a section break before every course. A course whose render fails is left out
+and reported with its error.
+
+Builds are incremental: ``BuildManifest`` keeps, per sheet (language and
+programme), the content digest of every course code's row and the template
+version it was rendered with, and the rendered outlines themselves under
+``<out>/.cache/perigrammata/<sheet>/``. A build renders only the courses that
+were added or changed since the last one (all of them after a template
+change), reuses the stored .docx of the rest and reports the change list.
+``--full`` renders every course again but still reports the changes against
+the previous build.
+
+    cd streamlit
+    python -m utils.perigrammata_book SHEET_ID [--sheets gr_2025 gr eng] [--out DIR] [--workers N] [--full]
+"""
+
+import argparse
+import io
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+from docx import Document
+from docx.oxml import OxmlElement
+from docxcompose.composer import Composer
+
+from utils.exams_data import semester_label
+from utils.gsheets import fetch_gsheet
+from utils.perigrammata_export import TEMPLATE_FILES, course_context, course_digest, template_store
+from utils.sheet_cache import atomic_write_bytes
+
+# Sheet of the perigrammata spreadsheet -> template language.
+SHEET_LANGS = {"gr_2025": "Ελληνικά", "gr": "Ελληνικά", "eng": "Αγγλικά"}
+SEMESTER_HEADINGS = {"Ελληνικά": "ΕΞΑΜΗΝΟ {}", "Αγγλικά": "SEMESTER {}"}
+BUILD_CACHE_DIR = Path(".cache") / "perigrammata"
+MANIFEST_FILE_NAME = "manifest.json"
+
+
+@dataclass(frozen=True)
+class CourseRender:
+    """One row of the sheet: its render time and, if it failed, the error."""
+
+    row: int
+    code: str
+    examino: str
+    seconds: float
+    error: str | None = None
+    # Taken from the previous build instead of rendered.
+    cached: bool = False
+
+
+@dataclass(frozen=True)
+class CourseChange:
+    """A course code whose outline differs from the previous build: added, changed or removed."""
+
+    code: str
+    change: str
+
+
+@dataclass(frozen=True)
+class SyllabusBook:
+    data: bytes
+    courses: list[CourseRender]
+    render_seconds: float
+    compose_seconds: float
+    changes: list[CourseChange]
+
+
+class BuildManifest:
+    """Course digests and rendered outlines of the last build of one sheet, kept under ``root``.
+
+    ``manifest.json`` maps each course code to the digest of its row, the
+    template version and the file of its outline; outlines are named by
+    digest and version, so identical rows share one.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        try:
+            manifest = json.loads((root / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            manifest = {}
+        self.courses: dict[str, dict] = manifest.get("courses", {})
+
+    @staticmethod
+    def _file_name(digest: str, version: str) -> str:
+        return f"{digest}-{version}.docx"
+
+    def lookup(self, code: str, digest: str, version: str) -> bytes | None:
+        """The stored outline of ``code`` if it was built from the same row and template."""
+        entry = self.courses.get(code)
+        if entry is None or entry["digest"] != digest or entry["template"] != version:
+            return None
+        try:
+            return (self.root / entry["file"]).read_bytes()
+        except OSError:
+            return None
+
+    def changes(self, digests: dict[str, str], version: str) -> list[CourseChange]:
+        """What ``digests`` (course code -> digest) changed since the build recorded here."""
+        changes = []
+        for code, digest in digests.items():
+            entry = self.courses.get(code)
+            if entry is None:
+                changes.append(CourseChange(code, "added"))
+            elif entry["digest"] != digest or entry["template"] != version:
+                changes.append(CourseChange(code, "changed"))
+        changes.extend(CourseChange(code, "removed") for code in self.courses if code not in digests)
+        return changes
+
+    def save(self, outlines: dict[str, tuple[str, bytes]], version: str) -> None:
+        """Record this build (course code -> (digest, outline)) and drop the outlines no course uses anymore."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        courses = {}
+        for code, (digest, data) in outlines.items():
+            file_name = self._file_name(digest, version)
+            if not (self.root / file_name).exists():
+                atomic_write_bytes(self.root / file_name, data)
+            courses[code] = {"digest": digest, "template": version, "file": file_name}
+
+        manifest = {"template": version, "courses": courses}
+        atomic_write_bytes(
+            self.root / MANIFEST_FILE_NAME,
+            json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+        used = {entry["file"] for entry in courses.values()}
+        for path in self.root.glob("*.docx"):
+            if path.name not in used:
+                path.unlink(missing_ok=True)
+        self.courses = courses
+
+
+def semester_order(df: pd.DataFrame) -> list[int]:
+    """Row positions of ``df`` by semester (numeric first), keeping the sheet order within one."""
+    numeric = pd.to_numeric(df['examino'], errors='coerce')
+    order = pd.DataFrame({'numeric': numeric.to_numpy(), 'label': df['examino'].astype(str).to_numpy()})
+    return order.sort_values(['numeric', 'label'], kind='stable', na_position='last').index.tolist()
+
+
+def _render_course(lang: str, context: dict[str, object]) -> tuple[bytes | None, float, str | None]:
+    """Render one outline (runs in a worker process)."""
+    start = time.perf_counter()
+    try:
+        data = template_store().render(lang, context)
+    except Exception as e:
+        return None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+    return data, time.perf_counter() - start, None
+
+
+def _section_break(composer: Composer) -> None:
+    """End the current section (a new page), with the page setup of the master document."""
+    body = composer.doc.element.body
+    paragraph = OxmlElement('w:p')
+    properties = OxmlElement('w:pPr')
+    properties.append(deepcopy(body.sectPr))
+    paragraph.append(properties)
+    body.insert(composer.append_index(), paragraph)
+
+
+def _semester_heading(lang: str, semester: str) -> Document:
+    # A document of its own, so the composer brings its Heading 1 style along
+    # (the Greek template has none).
+    doc = Document()
+    doc.add_heading(SEMESTER_HEADINGS[lang].format(semester), level=1)
+    return doc
+
+
+def _compose(lang: str, semesters: list[tuple[str, list[bytes]]]) -> bytes:
+    # The template itself is the master, emptied: its styles, page setup and
+    # headers are the book's.
+    master = Document(TEMPLATE_FILES[lang])
+    body = master.element.body
+    for element in list(body):
+        if element is not body.sectPr:
+            body.remove(element)
+
+    composer = Composer(master)
+    first = True
+    for semester, documents in semesters:
+        for position, data in enumerate(documents):
+            if not first:
+                _section_break(composer)
+            first = False
+            if position == 0 and semester:
+                composer.append(_semester_heading(lang, semester))
+            composer.append(Document(io.BytesIO(data)))
+
+    buffer = io.BytesIO()
+    composer.save(buffer)
+    return buffer.getvalue()
+
+
+def _course_codes(rows: list[dict[str, object]]) -> list[str]:
+    """Manifest key of each row: its course code, numbered from the second row with the same code on."""
+    seen: dict[str, int] = {}
+    codes = []
+    for row in rows:
+        code = str(row.get('code', ''))
+        seen[code] = seen.get(code, 0) + 1
+        codes.append(code if seen[code] == 1 else f"{code}#{seen[code]}")
+    return codes
+
+
+def build_book(
+    df: pd.DataFrame,
+    lang: str,
+    workers: int | None = None,
+    manifest: BuildManifest | None = None,
+    full: bool = False,
+) -> SyllabusBook:
+    """The syllabus book of the perigrammata rows ``df``, rendered with the ``lang`` template.
+
+    With a ``manifest`` only the courses changed since its build are rendered
+    (all of them if ``full``), the changes are reported against it and it is
+    updated to this build.
+    """
+    order = semester_order(df)
+    rows = df.reset_index(drop=True).to_dict('records')
+    codes = _course_codes(rows)
+    contexts = [course_context(row) for row in rows]
+    digests = [course_digest(context) for context in contexts]
+    version = template_store().version(lang)
+
+    rendered: dict[int, tuple[bytes | None, float, str | None]] = {}
+    if manifest is not None and not full:
+        for position in order:
+            data = manifest.lookup(codes[position], digests[position], version)
+            if data is not None:
+                rendered[position] = (data, 0.0, None)
+    cached = set(rendered)
+
+    start = time.perf_counter()
+    pending = [position for position in order if position not in cached]
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {position: pool.submit(_render_course, lang, contexts[position]) for position in pending}
+            rendered.update((position, future.result()) for position, future in futures.items())
+    render_seconds = time.perf_counter() - start
+
+    courses = []
+    semesters: dict[str, list[bytes]] = {}
+    for position in order:
+        data, seconds, error = rendered[position]
+        examino = semester_label(rows[position].get('examino'))
+        courses.append(CourseRender(position, codes[position], examino, seconds, error, position in cached))
+        if data is not None:
+            semesters.setdefault(examino, []).append(data)
+
+    changes = []
+    if manifest is not None:
+        changes = manifest.changes(dict(zip(codes, digests)), version)
+        # Failed courses stay out of the manifest, so the next build retries them.
+        manifest.save(
+            {codes[p]: (digests[p], rendered[p][0]) for p in order if rendered[p][0] is not None},
+            version,
+        )
+
+    start = time.perf_counter()
+    data = _compose(lang, list(semesters.items()))
+    return SyllabusBook(data, courses, render_seconds, time.perf_counter() - start, changes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sheet_id", help="Google Sheets id of the perigrammata spreadsheet")
+    parser.add_argument("--sheets", nargs="+", choices=list(SHEET_LANGS), default=list(SHEET_LANGS))
+    parser.add_argument("--out", type=Path, default=Path("."), help="output directory (default: current)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--full", action="store_true", help="render every course again, ignoring the stored outlines")
+    args = parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for sheet in args.sheets:
+        manifest = BuildManifest(args.out / BUILD_CACHE_DIR / sheet)
+        book = build_book(fetch_gsheet(args.sheet_id, sheet), SHEET_LANGS[sheet], args.workers, manifest, args.full)
+        target = args.out / f"Περιγράμματα Μαθημάτων_{sheet}.docx"
+        target.write_bytes(book.data)
+
+        for course in book.courses:
+            if course.cached:
+                continue
+            status = f"  {course.error}" if course.error else ""
+            print(f"{course.seconds * 1000:>8.1f}ms  εξ.{course.examino:<3} {course.code}{status}")
+        for change in book.changes:
+            print(f"  {change.change:<8} {change.code}")
+        failed = sum(course.error is not None for course in book.courses)
+        reused = sum(course.cached for course in book.courses)
+        print(
+            f"{sheet}: {len(book.courses) - failed} μαθήματα"
+            + (f" ({failed} απέτυχαν)" if failed else "")
+            + f", {len(book.changes)} αλλαγές, {reused} από την προηγούμενη έκδοση"
+            + f", απόδοση {book.render_seconds:.2f}s, σύνθεση {book.compose_seconds:.2f}s -> {target}"
+        )
+
+
+if __name__ == "__main__":
+    main()
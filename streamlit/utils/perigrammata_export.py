@@ -0,0 +1,246 @@
+"""Course outline (περίγραμμα) documents rendered from the docxtpl templates in ``files/``.
+
+Every render of a fresh ``DocxTemplate`` unzips the template, cleans its XML
+for jinja2 (``patch_xml``) and compiles it again, although neither the
+template nor the cleaned XML changes between courses. ``TemplateStore``
+loads each language's template once per process from ``files/`` and keeps
+one ``CompiledTemplate`` per language, which cleans and compiles each XML
+part once and reuses it for every render.
+
+``TemplateStore.refresh`` optionally checks the GitHub copy of a template
+with a conditional request (``If-None-Match``/``If-Modified-Since``): an
+unchanged template costs a 304 and nothing else, a changed one becomes the
+new version. ``version`` (a digest of the template bytes) changes exactly
+when the template does.
+
+``course_index`` turns a sheet into an (examino, code) -> ``Course`` lookup
+once per sheet version, each course holding its prepared template context and
+a digest of it; ``render_course`` memoises the rendered bytes by (code,
+digest, template version) in a namespace per language and sheet, large enough
+for a whole curriculum, so downloading the same outline again costs nothing
+until its row or the template changes.
+"""
+
+import hashlib
+import io
+import json
+import threading
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import pandas as pd
+import requests
+from docxtpl import DocxTemplate
+from jinja2 import Environment
+
+from utils.cache_store import cached
+from utils.gsheets import Snapshot, gsheet_namespace
+
+FILES_DIR = Path(__file__).resolve().parent.parent.parent / "files"
+TEMPLATE_FILES = {
+    'Ελληνικά': FILES_DIR / "perigrammata-template-gr.docx",
+    'Αγγλικά': FILES_DIR / "perigrammata-template-eng.docx",
+}
+TEMPLATE_URLS = {
+    'Ελληνικά': r"https://github.com/panagop/civil_ihu_pyappz/raw/main/files/perigrammata-template-gr.docx",
+    'Αγγλικά': r"https://github.com/panagop/civil_ihu_pyappz/raw/main/files/perigrammata-template-eng.docx",
+}
+REFRESH_TIMEOUT_SECONDS = 5
+# Rendered outlines kept per (language, sheet): a curriculum has well over a hundred courses.
+RENDER_CACHE_ENTRIES = 256
+
+
+class _CompilingEnvironment(Environment):
+    """jinja2 environment that compiles each template source once."""
+
+    def __init__(self):
+        super().__init__()
+        self._compiled = {}
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is not None or template_class is not None:
+            return super().from_string(source, globals, template_class)
+        template = self._compiled.get(source)
+        if template is None:
+            template = self._compiled[source] = super().from_string(source)
+        return template
+
+
+class CompiledTemplate(DocxTemplate):
+    """A ``DocxTemplate`` whose cleaned and compiled XML parts are reused across renders.
+
+    Not thread safe: ``render`` and ``save`` work on one document, so callers
+    sharing an instance serialise them (``TemplateStore.render`` does).
+    """
+
+    def __init__(self, data: bytes):
+        super().__init__(io.BytesIO(data))
+        self._environment = _CompilingEnvironment()
+        self._patched = {}
+
+    def patch_xml(self, src_xml):
+        patched = self._patched.get(src_xml)
+        if patched is None:
+            patched = self._patched[src_xml] = super().patch_xml(src_xml)
+        return patched
+
+    def render(self, context, jinja_env=None, autoescape=False) -> None:
+        super().render(context, jinja_env or self._environment, autoescape)
+
+    def render_bytes(self, row_dict: dict[str, object]) -> bytes:
+        self.render(row_dict)
+        buffer = io.BytesIO()
+        self.save(buffer)
+        return buffer.getvalue()
+
+
+@dataclass
+class _Loaded:
+    template: CompiledTemplate
+    version: str
+    lock: threading.Lock
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+def _version(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+class TemplateStore:
+    """The course outline template of each language, loaded once and compiled once."""
+
+    def __init__(self, files: dict[str, Path] = TEMPLATE_FILES, urls: dict[str, str] = TEMPLATE_URLS):
+        self.files = files
+        self.urls = urls
+        self._loaded: dict[str, _Loaded] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, lang: str) -> _Loaded:
+        with self._lock:
+            loaded = self._loaded.get(lang)
+            if loaded is None:
+                data = self.files[lang].read_bytes()
+                loaded = self._loaded[lang] = _Loaded(CompiledTemplate(data), _version(data), threading.Lock())
+            return loaded
+
+    def version(self, lang: str) -> str:
+        """Digest of the template ``lang`` currently renders with."""
+        return self._get(lang).version
+
+    def render(self, lang: str, row_dict: dict[str, object]) -> bytes:
+        """Συμπληρώνει το πρότυπο της γλώσσας ``lang`` με τα στοιχεία ενός μαθήματος."""
+        loaded = self._get(lang)
+        with loaded.lock:
+            return loaded.template.render_bytes(row_dict)
+
+    def refresh(self, lang: str, timeout: float = REFRESH_TIMEOUT_SECONDS) -> bool:
+        """Check the remote copy of template ``lang``; True if a new version was loaded."""
+        current = self._get(lang)
+        headers = {}
+        if current.etag:
+            headers['If-None-Match'] = current.etag
+        if current.last_modified:
+            headers['If-Modified-Since'] = current.last_modified
+
+        response = requests.get(self.urls[lang], headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return False
+        response.raise_for_status()
+
+        data = response.content
+        version = _version(data)
+        loaded = _Loaded(
+            current.template if version == current.version else CompiledTemplate(data),
+            version,
+            current.lock if version == current.version else threading.Lock(),
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified'),
+        )
+        with self._lock:
+            self._loaded[lang] = loaded
+        return version != current.version
+
+
+@cache
+def template_store() -> TemplateStore:
+    """Process-wide store, shared by every session."""
+    return TemplateStore()
+
+
+def course_context(row: dict[str, object]) -> dict[str, object]:
+    """Template context of a sheet row: missing values become empty strings."""
+    return {k: ('' if v is None or (not isinstance(v, (list, dict)) and pd.isna(v)) else v) for k, v in row.items()}
+
+
+def course_digest(context: dict[str, object]) -> str:
+    """Digest of a course's template context; changes exactly when its rendered outline can."""
+    data = json.dumps(context, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class Course:
+    examino: object
+    code: object
+    context: dict[str, object]
+    digest: str
+
+
+class CourseIndex:
+    """The courses of a perigrammata sheet by (examino, code); the first row wins on duplicates."""
+
+    def __init__(self, df: pd.DataFrame):
+        self._courses: dict[tuple[object, object], Course] = {}
+        self._codes: dict[object, list[object]] = {}
+        for row in df.to_dict('records'):
+            key = (row.get('examino'), row.get('code'))
+            if key in self._courses:
+                continue
+            context = course_context(row)
+            self._courses[key] = Course(*key, context, course_digest(context))
+            self._codes.setdefault(key[0], []).append(key[1])
+
+    @property
+    def semesters(self) -> list[object]:
+        """Semesters in order of first appearance in the sheet."""
+        return list(self._codes)
+
+    def codes(self, examino: object) -> list[object]:
+        return self._codes.get(examino, [])
+
+    def get(self, examino: object, code: object) -> Course | None:
+        return self._courses.get((examino, code))
+
+    def __iter__(self):
+        return iter(self._courses.values())
+
+    def __len__(self) -> int:
+        return len(self._courses)
+
+
+def course_index(sheet_id: str, sheet_name: str, snapshot: Snapshot) -> CourseIndex:
+    """Index of tab ``sheet_name``, built once per version (content hash) of its snapshot."""
+    return cached(
+        gsheet_namespace(sheet_id),
+        ("course_index", sheet_name, snapshot.sha256),
+        lambda: CourseIndex(snapshot.frame),
+    )
+
+
+def render_namespace(lang: str, sheet_name: str) -> str:
+    """Namespace of the outlines rendered from tab ``sheet_name`` with the ``lang`` template."""
+    return f"perigrammata:docx:{lang}:{sheet_name}"
+
+
+def render_course(lang: str, sheet_name: str, course: Course) -> bytes:
+    """The outline of ``course``, rendered once per (row content, template version)."""
+    store = template_store()
+    key = (course.code, course.digest, store.version(lang))
+    return cached(
+        render_namespace(lang, sheet_name),
+        key,
+        lambda: store.render(lang, course.context),
+        max_entries=RENDER_CACHE_ENTRIES,
+    )
@@ -0,0 +1,304 @@
+"""Persistent Arrow IPC sidecars for Excel workbooks.
+
+Parsing an ``.xlsm`` through openpyxl takes seconds, so every sheet that is read
+once is written next to the workbook as an uncompressed Arrow IPC (Feather v2)
+file under ``<workbook dir>/.cache/<workbook name>/``. Later reads memory-map
+the sidecar and never touch openpyxl.
+
+A sidecar is valid while the workbook's size and mtime are unchanged. When only
+the mtime moved (e.g. after a git checkout) the content hash decides, so an
+untouched workbook keeps its sidecars.
+
+Sidecar misses are parsed through a small process-wide pool of workbooks keyed
+by (path, mtime): per workbook version, the openpyxl handle (whole sheets) and
+the parsed ``WorkbookParts`` (column projections, see ``utils.xlsx_reader``),
+each built on first use, so shared strings and styles are parsed once no
+matter how many sheets or projections are read. Least recently used workbooks
+are closed first. The pool lock only guards the pool; each openpyxl handle has
+its own lock, so parses of different workbooks run concurrently.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from utils.xlsx_reader import WorkbookParts, read_columns, workbook_parts
+
+SIDECAR_DIR_NAME = ".cache"
+META_FILE_NAME = "meta.json"
+WORKBOOK_POOL_SIZE = 4
+
+_workbook_pool: OrderedDict[tuple[str, int], "_PooledWorkbook"] = OrderedDict()
+_workbook_pool_lock = threading.RLock()
+_meta_lock = threading.Lock()
+
+
+def _sidecar_dir(path: Path) -> Path:
+    return path.parent / SIDECAR_DIR_NAME / path.name
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _tmp_path(target: Path) -> Path:
+    return target.with_name(f"{target.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def atomic_write_bytes(target: Path, data: bytes) -> None:
+    """Write ``data`` to ``target`` so readers never see a partial file."""
+    tmp = _tmp_path(target)
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+
+
+def _save_meta(cache_dir: Path, meta: dict) -> None:
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+        atomic_write_bytes(cache_dir / META_FILE_NAME, data)
+    except OSError:
+        # Like a sidecar, metadata that cannot be written only costs speed:
+        # the caller carries on with the in-memory ``meta``.
+        pass
+
+
+def _load_meta(cache_dir: Path) -> dict | None:
+    try:
+        return json.loads((cache_dir / META_FILE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _current_meta(path: Path) -> dict:
+    """Sidecar metadata for ``path``, dropping stale sidecars if the workbook changed."""
+    cache_dir = _sidecar_dir(path)
+    stat = path.stat()
+    meta = _load_meta(cache_dir)
+
+    if meta and meta.get("size") == stat.st_size and meta.get("mtime_ns") == stat.st_mtime_ns:
+        return meta
+
+    digest = _content_hash(path)
+    if meta and meta.get("size") == stat.st_size and meta.get("sha256") == digest:
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _save_meta(cache_dir, meta)
+        return meta
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    meta = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": digest,
+        "sheet_names": None,
+        "sheets": {},
+    }
+    _save_meta(cache_dir, meta)
+    return meta
+
+
+def _stringify(v: object) -> object:
+    if pd.isna(v):
+        return v
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Make a raw sheet storable as Arrow: string column names, no mixed object columns.
+
+    Mixed columns such as ``course_id`` (101 next to "ΔΟΜ704") become strings with
+    integer-valued floats written without the trailing ".0"; missing values stay missing.
+    """
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].map(_stringify)
+    return df
+
+
+class _PooledWorkbook:
+    """One version of a workbook: its openpyxl handle and its parsed parts, each built on first use."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        # openpyxl streams sheets from the open zip, so the handle is used under this lock.
+        self.lock = threading.Lock()
+        self._excel: pd.ExcelFile | None = None
+        self._parts: WorkbookParts | None = None
+        self._parts_lock = threading.Lock()
+
+    def excel(self) -> pd.ExcelFile:
+        """The openpyxl handle; call with ``lock`` held."""
+        if self._excel is None:
+            self._excel = pd.ExcelFile(self.path)
+        return self._excel
+
+    @property
+    def parts(self) -> WorkbookParts:
+        with self._parts_lock:
+            if self._parts is None:
+                self._parts = workbook_parts(self.path)
+            return self._parts
+
+    def close(self) -> None:
+        with self.lock:
+            if self._excel is not None:
+                self._excel.close()
+                self._excel = None
+
+
+def _workbook(path: Path) -> _PooledWorkbook:
+    """Pooled workbook for the current version of ``path``."""
+    resolved = str(path.resolve())
+    key = (resolved, path.stat().st_mtime_ns)
+
+    with _workbook_pool_lock:
+        handle = _workbook_pool.get(key)
+        if handle is not None:
+            _workbook_pool.move_to_end(key)
+            return handle
+
+        # Older versions of the same file are never valid again.
+        evicted = [_workbook_pool.pop(k) for k in [k for k in _workbook_pool if k[0] == resolved]]
+        handle = _workbook_pool[key] = _PooledWorkbook(path)
+        while len(_workbook_pool) > WORKBOOK_POOL_SIZE:
+            evicted.append(_workbook_pool.popitem(last=False)[1])
+
+    # Closing waits for a parse in progress, so it happens outside the pool lock.
+    for workbook in evicted:
+        workbook.close()
+    return handle
+
+
+def parse_sheet(path: Path, sheet: str) -> pd.DataFrame:
+    """Parse ``sheet`` with openpyxl through the pooled workbook handle (no sidecar)."""
+    workbook = _workbook(path)
+    with workbook.lock:
+        return workbook.excel().parse(sheet)
+
+
+def parse_sheet_names(path: Path) -> list[str]:
+    """Sheet names read through the pooled workbook handle (no sidecar)."""
+    workbook = _workbook(path)
+    with workbook.lock:
+        return list(workbook.excel().sheet_names)
+
+
+def parse_columns(path: Path, sheet: str, columns: list[str]) -> pd.DataFrame:
+    """Only ``columns`` of ``sheet``, streamed with the pooled parsed parts of the workbook (no sidecar)."""
+    return read_columns(path, sheet, columns, _workbook(path).parts)
+
+
+def close_workbook(path: Path) -> None:
+    """Close the pooled handles of ``path`` (every version of it)."""
+    resolved = str(path.resolve())
+    with _workbook_pool_lock:
+        closing = [_workbook_pool.pop(k) for k in [k for k in _workbook_pool if k[0] == resolved]]
+    for workbook in closing:
+        workbook.close()
+
+
+def close_workbooks() -> None:
+    """Close every pooled workbook handle."""
+    with _workbook_pool_lock:
+        closing = list(_workbook_pool.values())
+        _workbook_pool.clear()
+    for workbook in closing:
+        workbook.close()
+
+
+def sheet_names(path: Path) -> list[str]:
+    """Sheet names of the workbook, served from the sidecar metadata when fresh."""
+    meta = _current_meta(path)
+    if meta["sheet_names"] is None:
+        meta["sheet_names"] = parse_sheet_names(path)
+        _save_meta(_sidecar_dir(path), meta)
+    return meta["sheet_names"]
+
+
+def read_sheet(path: Path, sheet: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Raw contents of ``sheet`` as ``pd.read_excel`` would return them.
+
+    With ``columns``, only those columns are read (streamed from the sheet XML,
+    see ``utils.xlsx_reader``) and requested columns the sheet lacks are simply
+    absent. Each projection gets its own sidecar.
+
+    The first read parses the workbook and writes the sidecar; later reads
+    memory-map the sidecar. Column names are always strings.
+    """
+    meta = _current_meta(path)
+    cache_dir = _sidecar_dir(path)
+
+    sidecar_key = sheet if columns is None else json.dumps([sheet, list(columns)], ensure_ascii=False)
+    file_name = meta["sheets"].get(sidecar_key)
+    if file_name:
+        try:
+            return feather.read_table(cache_dir / file_name, memory_map=True).to_pandas()
+        except (OSError, ValueError):
+            pass
+
+    if columns is None:
+        df = _arrow_safe(parse_sheet(path, sheet))
+    else:
+        df = _arrow_safe(parse_columns(path, sheet, list(columns)))
+
+    file_name = f"{hashlib.sha1(sidecar_key.encode('utf-8')).hexdigest()[:16]}.arrow"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = _tmp_path(cache_dir / file_name)
+        feather.write_feather(df, tmp, compression="uncompressed")
+        os.replace(tmp, cache_dir / file_name)
+    except Exception:
+        # A sidecar that cannot be written only costs speed, never correctness.
+        return df
+
+    with _meta_lock:
+        # Another sheet of the same workbook may have been stored meanwhile.
+        latest = _load_meta(cache_dir)
+        if latest is None or latest.get("sha256") != meta["sha256"]:
+            latest = meta
+        latest["sheets"][sidecar_key] = file_name
+        _save_meta(cache_dir, latest)
+    return df
+
+
+def refresh_sidecars(path: Path) -> int:
+    """Rebuild the sidecars ``path`` had before it changed; returns how many were rebuilt.
+
+    Only sheets and column projections that were actually read before are
+    re-read, so a changed workbook is warm again before the next page view.
+    """
+    previous = _load_meta(_sidecar_dir(path))
+    keys = list(previous["sheets"]) if previous else []
+
+    rebuilt = 0
+    # Excel forbids "[" in sheet names, so a JSON list is always a projection.
+    for key in keys:
+        sheet, columns = json.loads(key) if key.startswith("[") else (key, None)
+        try:
+            read_sheet(path, sheet, columns=columns)
+        except (KeyError, ValueError):
+            continue  # the sheet was renamed or removed
+        rebuilt += 1
+    if previous and previous.get("sheet_names") is not None:
+        sheet_names(path)
+    return rebuilt
+
+
+def clear_sidecars(path: Path) -> None:
+    """Delete all sidecars of the workbook at ``path``."""
+    shutil.rmtree(_sidecar_dir(path), ignore_errors=True)
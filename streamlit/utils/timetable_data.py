@@ -1,8 +1,92 @@
+"""Weekly timetable of the teaching period, read from the timetable workbook.
+
+The frame of each (sheet, teaching period) is built once per version of the
+workbook and kept in the workbook's ``utils.cache_store`` namespace, which
+the file watcher drops and rebuilds when the workbook changes (see
+``utils.file_watcher``).
+"""
+
 from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
+from utils.cache_store import cached, file_namespace
+from utils.sheet_cache import parse_sheet, parse_sheet_names
+
+TIMETABLE_SHEET = "timetable"
+TEACHING_PERIODS = ["Χειμερινό", "Εαρινό"]
+TIMETABLE_COLUMNS = [
+    "course_id",
+    "course_name",
+    "class_name",
+    "semester",
+    "teaching_period",
+    "instructors",
+    "day",
+    "start_time",
+    "duration",
+    "room",
+    "notes",
+]
+
+
+def timetable_sheet_names(input_excel: Path) -> list[str]:
+    """Sheet names of the timetable workbook, read once per file version."""
+    key = ("sheet_names", input_excel.stat().st_mtime_ns)
+    return cached(file_namespace(input_excel), key, lambda: parse_sheet_names(input_excel))
+
+
+def _timetable_sheet(input_excel: Path, sheet_name: str) -> pd.DataFrame:
+    key = ("timetable_sheet", input_excel.stat().st_mtime_ns, sheet_name)
+    return cached(file_namespace(input_excel), key, lambda: parse_sheet(input_excel, sheet_name))
+
+
+def read_timetable(input_excel: Path, sheet_name: str, teaching_period: str) -> pd.DataFrame:
+    """``load_data`` without Streamlit (for the file watcher): raises instead of reporting in the page."""
+    if sheet_name not in timetable_sheet_names(input_excel):
+        raise ValueError(f"Το sheet '{sheet_name}' δεν βρέθηκε στο αρχείο {input_excel.name}")
+
+    df = _timetable_sheet(input_excel, sheet_name)
+    missing = [c for c in TIMETABLE_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Λείπουν οι στήλες: {missing}")
+
+    df = df[df['teaching_period'] == teaching_period].copy()
+
+    # room / course_id can mix numeric codes (e.g. 101) and strings (e.g. "ΔΟΜ704");
+    # normalize to string so pyarrow doesn't infer int64 and fail on the strings.
+    def _to_str(v: object) -> str:
+        if pd.isna(v):
+            return ""
+        if isinstance(v, float) and v.is_integer():
+            return str(int(v))
+        return str(v)
+
+    df["room"] = df["room"].apply(_to_str)
+    df["course_id"] = df["course_id"].apply(_to_str)
+
+    # Column-wise, so a teaching period without classes gives an empty frame, not an error.
+    course_name = df['course_name'].astype(str)
+    df['full_class_name'] = course_name.where(
+        df['class_name'].isna(), course_name + " - " + df['class_name'].astype(str)
+    )
+
+    df['start_hour'] = df['start_time'].apply(
+        lambda x: x.hour if hasattr(x, 'hour') else int(x)
+    )
+
+    df['end_hour'] = df['start_hour'] + df['duration']
+    df['end_time'] = df['end_hour'].astype(int).astype(str) + ":00"
+
+    return df
+
+
+def get_timetable(input_excel: Path, sheet_name: str, teaching_period: str) -> pd.DataFrame:
+    """``read_timetable``, built once per file version; the frame is shared, treat it as read-only."""
+    key = ("timetable", input_excel.stat().st_mtime_ns, sheet_name, teaching_period)
+    return cached(file_namespace(input_excel), key, lambda: read_timetable(input_excel, sheet_name, teaching_period))
+
 
 def load_data(input_excel: Path, sheet_name: str, teaching_period: str) -> pd.DataFrame:
     """Διαβάζει τα δεδομένα του εβδομαδιαίου προγράμματος από το Excel."""
@@ -13,63 +97,14 @@ def load_data(input_excel: Path, sheet_name: str, teaching_period: str) -> pd.Da
         st.stop()
 
     try:
-        excel_file = pd.ExcelFile(input_excel)
-        available_sheets = excel_file.sheet_names
+        available_sheets = timetable_sheet_names(input_excel)
 
         if sheet_name not in available_sheets:
             st.error(f"❌ Το sheet '{sheet_name}' δεν βρέθηκε στο αρχείο!")
             st.info(f"Διαθέσιμα sheets: {', '.join(available_sheets)}")
             st.stop()
 
-        df = pd.read_excel(input_excel, sheet_name=sheet_name)
-
-        required_cols = [
-            "course_id",
-            "course_name",
-            "class_name",
-            "semester",
-            "teaching_period",
-            "instructors",
-            "day",
-            "start_time",
-            "duration",
-            "room",
-            "notes",
-        ]
-        missing = [c for c in required_cols if c not in df.columns]
-        if missing:
-            raise ValueError(f"Λείπουν οι στήλες: {missing}")
-
-        df = df[df['teaching_period'] == teaching_period]
-
-        # room / course_id can mix numeric codes (e.g. 101) and strings (e.g. "ΔΟΜ704");
-        # normalize to string so pyarrow doesn't infer int64 and fail on the strings.
-        def _to_str(v: object) -> str:
-            if pd.isna(v):
-                return ""
-            if isinstance(v, float) and v.is_integer():
-                return str(int(v))
-            return str(v)
-
-        df["room"] = df["room"].apply(_to_str)
-        df["course_id"] = df["course_id"].apply(_to_str)
-
-        df['full_class_name'] = df.apply(
-            lambda row: f"{row['course_name']} - {row['class_name']}"
-            if pd.notna(row['class_name']) else str(row['course_name']),
-            axis=1,
-        )
-
-        df['start_hour'] = df['start_time'].apply(
-            lambda x: x.hour if hasattr(x, 'hour') else int(x)
-        )
-
-        df['end_hour'] = df['start_hour'] + df['duration']
-        df['end_time'] = df.apply(
-            lambda row: f"{int(row['end_hour'])}:00",
-            axis=1,
-        )
-
+        df = get_timetable(input_excel, sheet_name, teaching_period)
     except Exception as e:
         st.error(f"❌ Σφάλμα κατά το άνοιγμα του αρχείου: {e}")
         st.stop()
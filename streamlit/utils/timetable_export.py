@@ -1,233 +1,199 @@
-import io
-from collections import defaultdict
+from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import Inches, Pt, RGBColor
-
-
-def create_weekly_timetable_document(df: pd.DataFrame, period: str) -> bytes:
-    """Δημιουργεί Word έγγραφο με εβδομαδιαίο πρόγραμμα μαθημάτων."""
-    doc = Document()
-
-    section = doc.sections[0]
-    section.orientation = 1  # Landscape
-    section.page_width = Inches(11)
-    section.page_height = Inches(8.5)
-
-    title = doc.add_heading(
-        f'Εβδομαδιαίο Πρόγραμμα Μαθημάτων - {period} Εξάμηνο 2025-2026', 0)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
+from docx.shared import Emu, Inches
+
+from utils.docx_template import (
+    CENTERED,
+    GRID_BODY_STYLE,
+    GRID_HEADER_STYLE,
+    GRID_TIME_STYLE,
+    PAGE_BREAK_XML,
+    base_block_width,
+    cell_xml,
+    document_bytes,
+    paragraph_xml,
+    style_id,
+    table_xml,
+)
+from utils.pdf_convert import finish_document
+
+DAY_NAMES = ['Δευτέρα', 'Τρίτη', 'Τετάρτη', 'Πέμπτη', 'Παρασκευή']
+FIRST_HOUR = 9
+TIME_SLOTS = [f"{h}:00" for h in range(FIRST_HOUR, 22)]
+
+HEADER_FILL = '4472C4'
+CLASS_FILL = 'E7EFF7'
+EMPTY_FILL = 'FFFFFF'
+TIME_COLUMN_WIDTH = Inches(0.7)
+# Width of one class column; narrower when a semester needs more columns than fit the page.
+LANE_WIDTH = Inches(1.5)
+ROW_HEIGHT = Inches(0.4)
+
+_HEADER = style_id(GRID_HEADER_STYLE)
+_TIME = style_id(GRID_TIME_STYLE)
+_BODY = style_id(GRID_BODY_STYLE)
+
+
+@dataclass
+class _Block:
+    """A class in the grid: ``rows`` time slots from ``row``, in ``lane`` (None: all lanes of the day)."""
+
+    row: int
+    rows: int
+    lane: int | None
+    text: str
+
+
+def _start_slots(start_time: pd.Series) -> pd.Series:
+    """Grid row (0-based time slot) each class starts in; -1 outside the grid or unparsable."""
+    text = start_time.astype(str)
+    with_colon = text.str.contains(':', regex=False)
+    hours = pd.to_numeric(text.str.split(':').str[0].where(with_colon, text), errors='coerce')
+    slots = np.trunc(hours.to_numpy(dtype=float)) - FIRST_HOUR
+    valid = (slots >= 0) & (slots < len(TIME_SLOTS))
+    return pd.Series(np.where(valid, slots, -1).astype(int), index=start_time.index)
+
+
+def _class_texts(df: pd.DataFrame) -> pd.Series:
+    def text(column: str) -> pd.Series:
+        return df[column].astype(object).where(df[column].notna(), '').astype(str)
+
+    room = text('room')
+    return text('full_class_name') + '\n' + text('instructors') + ('\n' + room).where(room != '', '')
+
+
+class _DayGrid:
+    """Which (slot, lane) cells of one day are taken; full-width blocks take every lane."""
+
+    def __init__(self):
+        self.blocks: list[_Block] = []
+        self.full_rows: set[int] = set()
+        self.lane_rows: dict[int, set[int]] = {}
+
+    def _lane_free(self, lane: int, rows: range) -> bool:
+        return self.full_rows.isdisjoint(rows) and self.lane_rows.get(lane, set()).isdisjoint(rows)
+
+    def _narrow_full_blocks(self, rows: range) -> None:
+        """Full-width blocks overlapping ``rows`` keep only lane 0, leaving room beside them."""
+        for block in self.blocks:
+            block_rows = range(block.row, block.row + block.rows)
+            if block.lane is None and not self.full_rows.isdisjoint(rows) and not set(block_rows).isdisjoint(rows):
+                block.lane = 0
+                self.full_rows.difference_update(block_rows)
+                self.lane_rows.setdefault(0, set()).update(block_rows)
+
+    def place(self, classes: list[tuple[int, str]], row: int, lanes: int) -> int:
+        """Place the classes starting at ``row``; returns the lanes the day now needs."""
+        if len(classes) == 1:
+            rows = range(row, row + classes[0][0])
+            if self.full_rows.isdisjoint(rows) and all(taken.isdisjoint(rows) for taken in self.lane_rows.values()):
+                self.full_rows.update(rows)
+                self.blocks.append(_Block(row, len(rows), None, classes[0][1]))
+                return lanes
+
+        self._narrow_full_blocks(range(row, row + max(duration for duration, _ in classes)))
+        # Simultaneous classes side by side: the i-th in lane i, or the first lane still free.
+        for index, (duration, text) in enumerate(classes):
+            rows = range(row, row + duration)
+            lane = index if self._lane_free(index, rows) else next(
+                lane for lane in range(lanes + len(classes)) if self._lane_free(lane, rows)
+            )
+            self.lane_rows.setdefault(lane, set()).update(rows)
+            self.blocks.append(_Block(row, len(rows), lane, text))
+            lanes = max(lanes, lane + 1)
+        return lanes
+
+
+def _semester_grids(df_sem: pd.DataFrame) -> tuple[list[_DayGrid], int]:
+    """The five day grids of a semester and the lanes (columns per day) they need."""
+    slots_total = len(TIME_SLOTS)
+    grouped = df_sem.groupby(['day_idx', 'slot'], sort=True)[['rows', 'text']]
+
+    # As many lanes as the most classes starting together; more only if overlaps need them.
+    lanes = int(grouped.size().max())
+    grids = [_DayGrid() for _ in DAY_NAMES]
+    for (day_idx, slot), group in grouped:
+        classes = [(min(rows, slots_total - slot), text) for rows, text in zip(group['rows'], group['text'])]
+        lanes = grids[day_idx].place(classes, slot, lanes)
+    return grids, lanes
+
+
+def _semester_table(grids: list[_DayGrid], lanes: int, width: int) -> str:
+    time_width = TIME_COLUMN_WIDTH.twips
+    lane_width = min(LANE_WIDTH, Emu((width - TIME_COLUMN_WIDTH) // (len(DAY_NAMES) * lanes))).twips
+    day_width = lane_width * lanes
+
+    rows = [[cell_xml(time_width, HEADER_FILL, paragraph_xml('Ώρα'))]]
+    rows[0] += [cell_xml(day_width, HEADER_FILL, paragraph_xml(day, _HEADER), lanes) for day in DAY_NAMES]
+
+    # cells[row][day][lane]: (block, starts here) for every grid cell a block covers.
+    cells = [[[None] * lanes for _ in DAY_NAMES] for _ in TIME_SLOTS]
+    for day_idx, grid in enumerate(grids):
+        for block in grid.blocks:
+            for row in range(block.row, block.row + block.rows):
+                for lane in range(lanes) if block.lane is None else [block.lane]:
+                    cells[row][day_idx][lane] = (block, row == block.row)
+
+    for row, time_slot in enumerate(TIME_SLOTS):
+        row_cells = [cell_xml(time_width, HEADER_FILL, paragraph_xml(time_slot, _TIME))]
+        for day_cells in cells[row]:
+            if all(cell is None for cell in day_cells):
+                row_cells.append(cell_xml(day_width, EMPTY_FILL, span=lanes))
+                continue
+            lane = 0
+            while lane < lanes:
+                covered = day_cells[lane]
+                if covered is None:
+                    row_cells.append(cell_xml(lane_width, EMPTY_FILL))
+                    lane += 1
+                    continue
+                block, starts = covered
+                span = lanes if block.lane is None else 1
+                fill = CLASS_FILL if block.text.strip() else EMPTY_FILL
+                paragraph = paragraph_xml(block.text, _BODY, CENTERED) if starts else '<w:p/>'
+                merge = None if block.rows == 1 else 'restart' if starts else 'continue'
+                row_cells.append(cell_xml(lane_width * span, fill, paragraph, span, merge))
+                lane += span
+        rows.append(row_cells)
+
+    grid_widths = [time_width] + [lane_width] * (len(DAY_NAMES) * lanes)
+    return table_xml(grid_widths, rows, ROW_HEIGHT.twips)
+
+
+def create_weekly_timetable_document(df: pd.DataFrame, period: str, output_format: str = 'docx') -> bytes:
+    """Δημιουργεί Word έγγραφο με εβδομαδιαίο πρόγραμμα μαθημάτων.
+
+    Με ``output_format='pdf'`` επιστρέφει το ίδιο έγγραφο σε PDF (μέσω LibreOffice).
+    """
+    # Title/Heading1 are the style ids of python-docx's add_heading levels 0 and 1.
+    blocks = [paragraph_xml(f'Εβδομαδιαίο Πρόγραμμα Μαθημάτων - {period} Εξάμηνο 2025-2026', 'Title', CENTERED)]
+
+    # Grid position, length and text of every class, computed once for all semesters.
+    classes = pd.DataFrame({
+        'semester': df['semester'],
+        'day_idx': df['day'].map({day: idx for idx, day in enumerate(DAY_NAMES)}),
+        'slot': _start_slots(df['start_time']),
+        'rows': pd.to_numeric(df['duration'], errors='coerce').fillna(1).astype(int).clip(lower=1),
+        'text': _class_texts(df),
+    })
+    classes = classes[classes['day_idx'].notna() & (classes['slot'] >= 0)].astype({'day_idx': int})
+    by_semester = dict(list(classes.groupby('semester', sort=False)))
+
+    width = base_block_width()
     semesters = sorted(df['semester'].unique())
-
     for sem_idx, semester in enumerate(semesters):
-        df_sem = df[df['semester'] == semester]
-
-        if df_sem.empty:
-            continue
-
-        doc.add_heading(f'Εξάμηνο {int(semester)}', level=1)
-
-        time_slots = list(range(9, 22))
-        time_slots_str = [f"{h}:00" for h in time_slots]
-
-        day_names = ['Δευτέρα', 'Τρίτη', 'Τετάρτη', 'Πέμπτη', 'Παρασκευή']
-
-        cell_classes = defaultdict(list)
-
-        for day_idx, day_name in enumerate(day_names):
-            df_day = df_sem[df_sem['day'] == day_name]
-
-            for _, class_row in df_day.iterrows():
-                start_time_str = str(class_row['start_time'])
-                if ':' in start_time_str:
-                    class_hour = int(start_time_str.split(':')[0])
-                else:
-                    try:
-                        class_hour = int(float(start_time_str))
-                    except Exception:
-                        continue
-
-                try:
-                    time_idx = time_slots.index(class_hour)
-                except ValueError:
-                    continue
+        blocks.append(paragraph_xml(f'Εξάμηνο {int(semester)}', 'Heading1'))
 
-                cell_key = (time_idx, day_idx)
-                cell_classes[cell_key].append({
-                    'course': str(class_row['full_class_name']) if pd.notna(class_row['full_class_name']) else '',
-                    'instructor': str(class_row['instructors']) if pd.notna(class_row['instructors']) else '',
-                    'room': str(class_row['room']) if pd.notna(class_row['room']) else '',
-                    'duration': int(class_row['duration']) if pd.notna(class_row['duration']) else 1,
-                })
-
-        max_simultaneous = 1
-        for classes in cell_classes.values():
-            max_simultaneous = max(max_simultaneous, len(classes))
-
-        total_cols = 1 + (len(day_names) * max_simultaneous)
-        table = doc.add_table(rows=len(time_slots) + 1, cols=total_cols)
-        table.style = 'Light Grid Accent 1'
-
-        table.rows[0].cells[0].text = 'Ώρα'
-
-        for day_idx, day_name in enumerate(day_names):
-            start_col = 1 + (day_idx * max_simultaneous)
-            cell = table.rows[0].cells[start_col]
-
-            if max_simultaneous > 1:
-                for sub_col in range(1, max_simultaneous):
-                    cell.merge(table.rows[0].cells[start_col + sub_col])
-
-            cell.text = day_name
-            for paragraph in cell.paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Calibri'
-                    run.font.bold = True
-                    run.font.size = Pt(10)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-
-        processed_cells = {}
-
-        for time_idx, time_slot in enumerate(time_slots_str):
-            row_idx = time_idx + 1
-
-            cell = table.rows[row_idx].cells[0]
-            cell.text = time_slot
-            for paragraph in cell.paragraphs:
-                paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                for run in paragraph.runs:
-                    run.font.name = 'Calibri'
-                    run.font.bold = True
-                    run.font.size = Pt(9)
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-
-            for day_idx in range(len(day_names)):
-                cell_key = (time_idx, day_idx)
-                classes = cell_classes.get(cell_key, [])
-
-                start_col = 1 + (day_idx * max_simultaneous)
-
-                if len(classes) <= 1:
-                    if (time_idx, day_idx, 0) in processed_cells:
-                        continue
-
-                    if len(classes) == 1:
-                        cls = classes[0]
-                        duration = cls['duration']
-
-                        for dur in range(duration):
-                            for sub_col_idx in range(max_simultaneous):
-                                processed_cells[(time_idx + dur, day_idx, sub_col_idx)] = True
-
-                        cells_to_merge = []
-                        for dur_offset in range(duration):
-                            if time_idx + dur_offset < len(time_slots):
-                                for sub_col_offset in range(max_simultaneous):
-                                    cells_to_merge.append(
-                                        table.rows[row_idx + dur_offset].cells[start_col + sub_col_offset])
-
-                        cell = cells_to_merge[0]
-
-                        for merge_cell in cells_to_merge[1:]:
-                            if merge_cell != cell:
-                                try:
-                                    cell.merge(merge_cell)
-                                except Exception:
-                                    pass
-
-                        class_text = f"{cls['course']}\n{cls['instructor']}"
-                        if cls['room']:
-                            class_text += f"\n{cls['room']}"
-                        cell.text = class_text
-
-                        for paragraph in cell.paragraphs:
-                            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            for run in paragraph.runs:
-                                run.font.name = 'Calibri'
-                                run.font.size = Pt(8)
-                    else:
-                        for sub_col_idx in range(max_simultaneous):
-                            processed_cells[(time_idx, day_idx, sub_col_idx)] = True
-
-                        if max_simultaneous > 1:
-                            cell = table.rows[row_idx].cells[start_col]
-                            for sub_col_offset in range(1, max_simultaneous):
-                                next_col_cell = table.rows[row_idx].cells[start_col + sub_col_offset]
-                                try:
-                                    cell.merge(next_col_cell)
-                                except Exception:
-                                    pass
-                else:
-                    for cls_idx, cls in enumerate(classes[:max_simultaneous]):
-                        if (time_idx, day_idx, cls_idx) in processed_cells:
-                            continue
-
-                        col = start_col + cls_idx
-                        duration = cls['duration']
-
-                        for dur in range(duration):
-                            processed_cells[(time_idx + dur, day_idx, cls_idx)] = True
-
-                        cell = table.rows[row_idx].cells[col]
-
-                        if duration > 1:
-                            for dur_offset in range(1, duration):
-                                if time_idx + dur_offset < len(time_slots):
-                                    next_cell = table.rows[row_idx + dur_offset].cells[col]
-                                    try:
-                                        cell.merge(next_cell)
-                                    except Exception:
-                                        pass
-
-                        class_text = f"{cls['course']}\n{cls['instructor']}"
-                        if cls['room']:
-                            class_text += f"\n{cls['room']}"
-                        cell.text = class_text
-
-                        for paragraph in cell.paragraphs:
-                            paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                            for run in paragraph.runs:
-                                run.font.name = 'Calibri'
-                                run.font.size = Pt(8)
-
-        for col_idx in range(0, total_cols):
-            cell = table.rows[0].cells[col_idx]
-            shading_elm = OxmlElement('w:shd')
-            shading_elm.set(qn('w:fill'), '4472C4')
-            cell._element.get_or_add_tcPr().append(shading_elm)
-
-        for row_idx in range(1, len(time_slots) + 1):
-            for col_idx in range(0, total_cols):
-                cell = table.rows[row_idx].cells[col_idx]
-                shading_elm = OxmlElement('w:shd')
-
-                if col_idx == 0:
-                    shading_elm.set(qn('w:fill'), '4472C4')
-                else:
-                    cell_text = cell.text.strip()
-                    if cell_text:
-                        shading_elm.set(qn('w:fill'), 'E7EFF7')
-                    else:
-                        shading_elm.set(qn('w:fill'), 'FFFFFF')
-
-                cell._element.get_or_add_tcPr().append(shading_elm)
-
-        for row in table.rows:
-            row.height = Inches(0.4)
-            row.cells[0].width = Inches(0.7)
-            for i in range(1, len(day_names) * max_simultaneous + 1):
-                row.cells[i].width = Inches(1.5)
+        df_sem = by_semester.get(semester)
+        if df_sem is None:
+            grids, lanes = [_DayGrid() for _ in DAY_NAMES], 1
+        else:
+            grids, lanes = _semester_grids(df_sem)
+        blocks.append(_semester_table(grids, lanes, width))
 
         if sem_idx < len(semesters) - 1:
-            doc.add_page_break()
+            blocks.append(PAGE_BREAK_XML)
 
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return finish_document(document_bytes(blocks), output_format)
@@ -0,0 +1,276 @@
+"""Column-projected streaming reader for ``.xlsx``/``.xlsm`` sheets.
+
+``pd.read_excel`` materialises every cell of a sheet (formulas, validation
+helpers, scratch columns) even when the caller keeps a handful of columns.
+``read_columns`` streams the raw sheet XML with lxml instead: it finds the
+header row, then decodes only the cells that sit under the requested headers.
+
+Values follow openpyxl's conventions (shared/inline strings, date and time
+number formats, the 1904 date system), so the resulting frame can stand in for
+the corresponding columns of ``pd.read_excel``.
+
+The parts every sheet needs (shared strings, date styles, sheet locations,
+date system) are parsed into ``WorkbookParts``; callers reading several
+sheets or projections of one workbook parse them once and pass them along
+(``utils.sheet_cache`` pools them per workbook version).
+"""
+
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from lxml import etree
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_C = f"{{{NS_MAIN}}}c"
+_V = f"{{{NS_MAIN}}}v"
+_T = f"{{{NS_MAIN}}}t"
+_IS = f"{{{NS_MAIN}}}is"
+_ROW = f"{{{NS_MAIN}}}row"
+_SI = f"{{{NS_MAIN}}}si"
+_RPH = f"{{{NS_MAIN}}}rPh"
+
+# Values pd.read_excel turns into NaN by default that can realistically appear here.
+_NA_STRINGS = {"", "#N/A", "N/A", "NA", "NULL", "NaN", "nan", "None"}
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column index of a cell reference such as ``"AB12"``."""
+    idx = 0
+    for ch in ref:
+        if ch.isdigit():
+            break
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def _sheet_parts(zf: zipfile.ZipFile) -> tuple[dict[str, str], datetime]:
+    """Zip member of every sheet, by name, and the workbook's date epoch."""
+    workbook = etree.fromstring(zf.read("xl/workbook.xml"))
+    pr = workbook.find(f"{{{NS_MAIN}}}workbookPr")
+    date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+    epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+    rels = etree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{{{NS_PKG_REL}}}Relationship")}
+
+    parts = {}
+    for el in workbook.iter(f"{{{NS_MAIN}}}sheet"):
+        target = targets.get(el.get(f"{{{NS_REL}}}id"))
+        if target is None:
+            continue
+        if target.startswith("/"):
+            parts[el.get("name")] = target.lstrip("/")
+        else:
+            parts[el.get("name")] = posixpath.normpath(posixpath.join("xl", target))
+    return parts, epoch
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    strings: list[str] = []
+    with zf.open("xl/sharedStrings.xml") as f:
+        for _, si in etree.iterparse(f, tag=_SI):
+            # Rich text is split over runs; phonetic hints (rPh) are not part of the text.
+            strings.append("".join(t.text or "" for t in si.iter(_T) if t.getparent().tag != _RPH))
+            si.clear()
+    return strings
+
+
+def _date_styles(zf: zipfile.ZipFile) -> set[int]:
+    """Indices of the cell formats (``s`` attribute) that display dates or times."""
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    styles = etree.fromstring(zf.read("xl/styles.xml"))
+    formats = dict(BUILTIN_FORMATS)
+    for fmt in styles.iter(f"{{{NS_MAIN}}}numFmt"):
+        formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+
+    cell_xfs = styles.find(f"{{{NS_MAIN}}}cellXfs")
+    if cell_xfs is None:
+        return set()
+    return {
+        idx
+        for idx, xf in enumerate(cell_xfs.iter(f"{{{NS_MAIN}}}xf"))
+        if is_date_format(formats.get(int(xf.get("numFmtId", 0)), "General"))
+    }
+
+
+@dataclass(frozen=True)
+class WorkbookParts:
+    """What reading any sheet of a workbook needs, parsed once."""
+
+    shared_strings: list[str]
+    date_styles: frozenset[int]
+    sheet_parts: dict[str, str]
+    epoch: datetime
+
+
+def workbook_parts(path: Path) -> WorkbookParts:
+    """Parse the shared strings, date styles, sheet locations and date system of ``path``."""
+    with zipfile.ZipFile(path) as zf:
+        sheet_parts, epoch = _sheet_parts(zf)
+        return WorkbookParts(_shared_strings(zf), frozenset(_date_styles(zf)), sheet_parts, epoch)
+
+
+def _cell_value(c: etree._Element, shared: list[str], date_styles: frozenset[int], epoch: datetime) -> object:
+    cell_type = c.get("t", "n")
+    if cell_type == "inlineStr":
+        is_el = c.find(_IS)
+        text = "".join(t.text or "" for t in is_el.iter(_T)) if is_el is not None else ""
+        return np.nan if text in _NA_STRINGS else text
+
+    v = c.find(_V)
+    if v is None or v.text is None:
+        return np.nan
+    raw = v.text
+
+    if cell_type == "s":
+        text = shared[int(raw)]
+        return np.nan if text in _NA_STRINGS else text
+    if cell_type in ("str", "d"):
+        return np.nan if raw in _NA_STRINGS else raw
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type == "e":
+        return np.nan
+
+    number = float(raw)
+    if int(c.get("s", 0)) in date_styles:
+        return from_excel(number, epoch)
+    if number.is_integer() and "." not in raw and "E" not in raw.upper():
+        return int(number)
+    return number
+
+
+# Rows searched for the header before settling on the best candidate so far.
+HEADER_SCAN_ROWS = 20
+
+
+def _header_positions(values: dict[int, object], wanted: set[str]) -> dict[int, str]:
+    """Column index -> requested name, for the cells of a row that hold one (first occurrence wins)."""
+    found: dict[int, str] = {}
+    for idx, value in values.items():
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        name = str(value)
+        if name in wanted and name not in found.values():
+            found[idx] = name
+    return found
+
+
+class _Columns:
+    """Values of the requested columns below the header row, padded the way ``pd.read_excel`` pads them."""
+
+    def __init__(self, header_row: int, positions: dict[int, str]):
+        self.positions = positions
+        self.data: dict[str, list] = {name: [] for name in positions.values()}
+        self.last_row = header_row
+        self.last_filled = 0
+
+    def add(self, row_number: int, values: dict[int, object], filled: bool) -> None:
+        """Append a row; ``filled`` says whether any of its cells, requested or not, has a value."""
+        # Rows absent from the XML are blank rows for pd.read_excel too.
+        for _ in range(row_number - self.last_row - 1):
+            for column in self.data.values():
+                column.append(np.nan)
+
+        row_values = {name: values[idx] for idx, name in self.positions.items() if idx in values}
+        for name, column in self.data.items():
+            column.append(row_values.get(name, np.nan))
+        # pd.read_excel drops trailing rows without values in *any* column.
+        if filled:
+            self.last_filled = len(next(iter(self.data.values())))
+        self.last_row = row_number
+
+    def frame(self, columns: list[str]) -> pd.DataFrame:
+        ordered = [name for name in columns if name in self.data]
+        return pd.DataFrame({name: self.data[name][: self.last_filled] for name in ordered})
+
+
+def _best_header(
+    rows: list[tuple[int, dict[int, object], bool]], wanted: set[str]
+) -> tuple[int, dict[int, str]] | None:
+    """Index into ``rows`` of the row holding the most requested names (the first on ties), with its positions."""
+    best: tuple[int, dict[int, str]] | None = None
+    for i, (_, values, _) in enumerate(rows):
+        found = _header_positions(values, wanted)
+        if found and (best is None or len(found) > len(best[1])):
+            best = (i, found)
+    return best
+
+
+def read_columns(path: Path, sheet: str, columns: list[str], parts: WorkbookParts | None = None) -> pd.DataFrame:
+    """Only ``columns`` of ``sheet``, streamed from the sheet XML.
+
+    ``parts`` are the workbook's parsed ``workbook_parts`` (parsed here if not
+    given). The header row is the row holding the most requested names: the
+    scan stops at the first row holding all of them, or after
+    ``HEADER_SCAN_ROWS`` rows once some row holds any, so a title or note
+    above the table that happens to contain one name is not taken for the
+    header. Requested columns missing from the header are absent from the
+    result, so callers can report them the same way as with ``pd.read_excel``.
+    """
+    wanted = set(columns)
+    parts = parts or workbook_parts(path)
+    part = parts.sheet_parts.get(sheet)
+    if part is None:
+        raise ValueError(f"Worksheet named '{sheet}' not found")
+    shared, date_styles, epoch = parts.shared_strings, parts.date_styles, parts.epoch
+
+    result: _Columns | None = None
+    # Fully decoded rows seen while the header is still undecided.
+    candidates: list[tuple[int, dict[int, object], bool]] = []
+
+    def settle() -> _Columns | None:
+        best = _best_header(candidates, wanted)
+        if best is None:
+            candidates.clear()
+            return None
+        i, positions = best
+        table = _Columns(candidates[i][0], positions)
+        for row_number, values, filled in candidates[i + 1:]:
+            table.add(row_number, values, filled)
+        candidates.clear()
+        return table
+
+    with zipfile.ZipFile(path) as zf, zf.open(part) as f:
+        last_row = 0
+        for _, row in etree.iterparse(f, tag=_ROW):
+            row_number = int(row.get("r")) if row.get("r") else last_row + 1
+            last_row = row_number
+
+            values: dict[int, object] = {}
+            filled = False
+            for col_pos, c in enumerate(row.iter(_C)):
+                ref = c.get("r")
+                idx = _column_index(ref) if ref else col_pos
+                if result is None or idx in result.positions:
+                    values[idx] = _cell_value(c, shared, date_styles, epoch)
+                filled = filled or c.find(_V) is not None or c.find(_IS) is not None
+
+            row.clear()
+            while row.getprevious() is not None:
+                del row.getparent()[0]
+
+            if result is not None:
+                result.add(row_number, values, filled)
+                continue
+
+            candidates.append((row_number, values, filled))
+            if len(_header_positions(values, wanted)) == len(wanted) or len(candidates) >= HEADER_SCAN_ROWS:
+                result = settle()
+
+    if result is None:
+        result = settle()
+    return result.frame(columns) if result is not None else pd.DataFrame()
@@ -0,0 +1,88 @@
+"""Compiled FullCalendar events of ``utils.exams_calendar`` against the per-row construction they replace."""
+
+import os
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.colors import DEFAULT_SEMESTER_COLOR, SEMESTER_COLORS  # noqa: E402
+from utils.exams_calendar import compile_calendar_events, get_exam_calendar  # noqa: E402
+
+
+def _exams() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "course_name": ["Στατική\nΙ", 'Η "Υδραυλική"', "Οδοποιία", "Γεωτεχνική", None],
+            "instructor": ["Παπαδόπουλος", "Γεωργίου\\", "Νικολάου", None, "Ιωάννου"],
+            "semester": [1, 3, np.nan, 9, 5],
+            "students_total": [40.0, np.nan, "~30", 12, 7],
+            "start_dt": pd.to_datetime(
+                ["2026-06-15 09:00", "2026-06-15 12:00", None, "2026-06-16 09:00", "2026-06-17 15:30"]
+            ),
+        }
+    )
+
+
+def _row_events(df: pd.DataFrame, extra_column: str | None) -> list[dict]:
+    """Events built row by row, as the exams page did before they were compiled."""
+
+    def clean_text(value):
+        if pd.notna(value):
+            text = str(value).replace("\n", " ").replace("\r", " ")
+            return text.replace('"', "").replace("'", "").replace("\\", "").strip()
+        return ""
+
+    events = []
+    for _, row in df.iterrows():
+        if pd.isna(row["start_dt"]):
+            continue
+        semester = int(row["semester"]) if pd.notna(row["semester"]) else 1
+        students = row.get(extra_column) if extra_column else None
+        suffix = ""
+        if pd.notna(students):
+            try:
+                suffix = f"\nΑρ. Φοιτ. {int(float(students))}"
+            except (TypeError, ValueError):
+                suffix = f"\nΑρ. Φοιτ. {students}"
+        events.append(
+            {
+                "title": f"Εξ.{semester} - {clean_text(row['course_name'])} - {clean_text(row['instructor'])}{suffix}",
+                "start": row["start_dt"].strftime("%Y-%m-%dT%H:%M:%S"),
+                "end": (row["start_dt"] + timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "color": SEMESTER_COLORS.get(semester, DEFAULT_SEMESTER_COLOR),
+            }
+        )
+    return events
+
+
+def test_events_match_the_per_row_construction():
+    df = _exams()
+    for extra_column in (None, "students_total"):
+        assert compile_calendar_events(df, extra_column).select() == _row_events(df, extra_column)
+
+
+def test_select_picks_rows_without_start_time_out():
+    df = _exams()
+    calendar = compile_calendar_events(df)
+    positions = np.flatnonzero(df["semester"].isin([1, 3]) | df["semester"].isna())
+    assert calendar.select(positions) == _row_events(df.iloc[positions], None)
+
+
+def test_events_are_recompiled_when_the_workbook_changes(tmp_path):
+    workbook = tmp_path / "exams-2026-06.xlsm"
+    workbook.write_bytes(b"")
+    df = _exams()
+
+    first = get_exam_calendar(workbook, "ΔΙΠΑΕ", df, "students_total")
+    assert get_exam_calendar(workbook, "ΔΙΠΑΕ", df, "students_total") is first
+
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    changed = df.iloc[:1]
+    rebuilt = get_exam_calendar(workbook, "ΔΙΠΑΕ", changed, "students_total")
+    assert rebuilt is not first
+    assert rebuilt.select() == _row_events(changed, "students_total")
@@ -0,0 +1,22 @@
+"""Normalisation of the exam sheet columns in ``utils.exams_data``."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.exams_data import _code_strings, semester_label  # noqa: E402
+
+
+def test_code_strings_only_reformat_floats():
+    values = pd.Series(["0101", 101.0, "ΔΟΜ704", np.nan, " 7", "1e3", 12, 2.5], dtype=object)
+
+    assert _code_strings(values).tolist() == ["0101", "101", "ΔΟΜ704", "", " 7", "1e3", "12", "2.5"]
+
+
+def test_semester_label():
+    assert [semester_label(v) for v in [7.0, 7, "7", 2.5, np.nan, None, "Επιλογής"]] == [
+        "7", "7", "7", "2.5", "", "", "Επιλογής"
+    ]
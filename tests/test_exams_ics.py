@@ -0,0 +1,68 @@
+"""Calendar feeds of ``utils.exams_ics``: one VCALENDAR per person, UTC start times, stable ETags."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+from ics import Calendar
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.exams_ics import INSTRUCTOR, SUPERVISOR, build_ics_feeds  # noqa: E402
+
+
+def _exams(room: str = "Α1") -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "course_id": ["101", "305", "702"],
+            "course_name": ["Στατική", "Υδραυλική", "Οδοποιία"],
+            "semester": [1.0, 3.0, 7.0],
+            "instructor": ["Παπαδόπουλος", "Παπαδόπουλος", "Γεωργίου"],
+            # Athens local times: summer (UTC+3) and winter (UTC+2).
+            "start_dt": pd.to_datetime(["2026-06-15 09:00", "2026-06-16 12:00", "2026-01-20 15:00"]),
+            "room": [room, "Β2", "Γ3"],
+            "notes": [None, "Με βιβλία", None],
+            "epitirites": ["Κ. Αλεξίου, Μ. Βλάχου", "Κ. Αλεξίου", "Μ. Βλάχου"],
+        }
+    )
+
+
+def _lines(data: bytes) -> list[str]:
+    return data.decode("utf-8").splitlines()
+
+
+def test_one_calendar_per_feed():
+    feeds = build_ics_feeds(_exams())
+    assert feeds.people(INSTRUCTOR) == ["Γεωργίου", "Παπαδόπουλος"]
+    assert feeds.people(SUPERVISOR) == ["Κ. Αλεξίου", "Μ. Βλάχου"]
+
+    for feed in feeds.feeds.values():
+        lines = _lines(feed.data)
+        assert lines.count("BEGIN:VCALENDAR") == 1 and lines[0] == "BEGIN:VCALENDAR"
+        assert lines.count("END:VCALENDAR") == 1 and lines[-1] == "END:VCALENDAR"
+        assert lines.count("BEGIN:VEVENT") == lines.count("END:VEVENT")
+        # The ics library reads it back as a single calendar.
+        Calendar(feed.data.decode("utf-8"))
+
+    assert _lines(feeds.calendar(INSTRUCTOR, "Παπαδόπουλος")).count("BEGIN:VEVENT") == 2
+    assert _lines(feeds.calendar(SUPERVISOR, "Μ. Βλάχου")).count("BEGIN:VEVENT") == 2
+    empty = _lines(feeds.calendar(INSTRUCTOR, "Κανείς"))
+    assert empty.count("BEGIN:VCALENDAR") == 1 and "BEGIN:VEVENT" not in empty
+
+
+def test_start_times_are_utc():
+    feeds = build_ics_feeds(_exams())
+    starts = [line for line in _lines(feeds.calendar(INSTRUCTOR, "Παπαδόπουλος")) if line.startswith("DTSTART")]
+    assert starts == ["DTSTART:20260615T060000Z", "DTSTART:20260616T090000Z"]
+    starts = [line for line in _lines(feeds.calendar(INSTRUCTOR, "Γεωργίου")) if line.startswith("DTSTART")]
+    assert starts == ["DTSTART:20260120T130000Z"]
+
+
+def test_unchanged_feeds_keep_their_bytes_and_etag():
+    first = build_ics_feeds(_exams())
+    assert build_ics_feeds(_exams()).feeds == first.feeds
+
+    changed = build_ics_feeds(_exams(room="Δ4"), previous=first)
+    assert changed.feeds[INSTRUCTOR, "Γεωργίου"] is first.feeds[INSTRUCTOR, "Γεωργίου"]
+    for key in [(INSTRUCTOR, "Παπαδόπουλος"), (SUPERVISOR, "Κ. Αλεξίου"), (SUPERVISOR, "Μ. Βλάχου")]:
+        assert changed.feeds[key].etag != first.feeds[key].etag
+        assert "LOCATION:Δ4" in _lines(changed.feeds[key].data)
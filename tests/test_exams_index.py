@@ -0,0 +1,70 @@
+"""Inverted filter indexes of ``utils.exams_index`` against plain pandas filtering."""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.exams_index import build_exams_index, get_exams_index  # noqa: E402
+
+
+def _exams() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "instructor": ["Παπαδόπουλος", "Γεωργίου", "Παπαδόπουλος", "Νικολάου", None],
+            "semester": [1, 3, 1, 5, 3],
+            "week_number": [1, 1, 2, 2, 2],
+            "room": ["Α1", "Β2", "Α1", "", "Β2"],
+            "epitirites": ["Κ. Αλεξίου, Μ. Βλάχου", None, "Μ. Βλάχου,Μ. Βλάχου", "Κ. Αλεξίου", " , Δ. Γκίκας"],
+        }
+    )
+
+
+def test_postings_match_a_pandas_groupby():
+    df = _exams()
+    index = build_exams_index(df)
+
+    fields = {"instructor": "instructor", "semester": "semester", "week": "week_number", "room": "room"}
+    for field, column in fields.items():
+        expected = {key: list(rows) for key, rows in df.groupby(column, sort=True).indices.items()}
+        assert index.keys(field) == list(expected)
+        for key, rows in expected.items():
+            assert index.rows(field, key).tolist() == rows
+    assert index.rows("instructor", "Κανείς").size == 0
+
+
+def test_supervisor_rows_match_the_split_lists():
+    df = _exams()
+    index = build_exams_index(df)
+
+    people = df["epitirites"].dropna().str.split(",").explode().str.strip()
+    people = people[people != ""]
+    assert index.keys("supervisor") == sorted(people.unique())
+    for name in people.unique():
+        assert index.rows("supervisor", name).tolist() == sorted(set(people.index[people == name]))
+
+
+def test_rows_any_is_the_union():
+    index = build_exams_index(_exams())
+    assert index.rows_any("semester", [3, 5, 7]).tolist() == [1, 3, 4]
+    assert index.rows_any("semester", [7]).size == 0
+
+
+def test_index_is_rebuilt_when_the_workbook_changes(tmp_path):
+    workbook = tmp_path / "exams-2026-06.xlsm"
+    workbook.write_bytes(b"")
+    df = _exams()
+
+    first = get_exams_index(workbook, "ΔΙΠΑΕ", df)
+    assert get_exams_index(workbook, "ΔΙΠΑΕ", df) is first
+
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    changed = df.assign(room=["Γ3"] * len(df))
+    rebuilt = get_exams_index(workbook, "ΔΙΠΑΕ", changed)
+    assert rebuilt is not first
+    assert rebuilt.keys("room") == ["Γ3"]
+    assert np.array_equal(rebuilt.rows("room", "Γ3"), np.arange(len(df)))
@@ -0,0 +1,88 @@
+"""Batch publication of ``utils.exams_publish`` on small generated exam files."""
+
+import os
+import sys
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils import sheet_cache  # noqa: E402
+from utils.exams_data import EXAM_COLUMNS  # noqa: E402
+from utils.exams_publish import publish  # noqa: E402
+
+
+def _save(path: Path, sheets: dict[str, str], room: str = "Α1") -> None:
+    """Exam file with one exam per programme sheet; ``sheets`` maps sheet -> student-count column."""
+    wb = Workbook()
+    wb.remove(wb.active)
+    for sheet, extra_column in sheets.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(EXAM_COLUMNS + [extra_column])
+        ws.append([101, "Στατική", 1, "Παπαδόπουλος", datetime(2026, 6, 15), "9:00", room, None, "Κ. Αλεξίου", 40])
+    wb.save(path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def exams_dir(tmp_path):
+    _save(tmp_path / "exams-2026-06.xlsm", {"ΔΙΠΑΕ": "students_total"})
+    _save(tmp_path / "exams-2026-09.xlsm", {"ΔΙΠΑΕ": "students_total", "ΤΕΙ": "φοιτΤΕΙ"})
+    yield tmp_path
+    sheet_cache.close_workbooks()
+
+
+def _publish(exams_dir: Path, **kwargs):
+    paths = [exams_dir / "exams-2026-06.xlsm", exams_dir / "exams-2026-09.xlsm"]
+    return publish(paths, exams_dir / "out", workers=1, **kwargs)
+
+
+def test_file_names_and_bundles(exams_dir):
+    results = _publish(exams_dir)
+    out = exams_dir / "out"
+
+    june = "Εαρινό_2025-2026_2026-06"
+    september = "Επαναληπτική Σεπτεμβρίου_2025-2026_2026-09"
+    expected = {
+        f"Πρόγραμμα_Εξετάσεων_{programme}_{period}{suffix}.docx"
+        for programme, period in [("ΔΙΠΑΕ", june), ("ΔΙΠΑΕ", september), ("ΤΕΙ", september)]
+        for suffix in ("", " (με επιτηρητές)")
+    }
+    assert {r.output.name for r in results if r.output is not None} == expected
+    assert {p.name for p in out.glob("*.docx")} == expected
+
+    with zipfile.ZipFile(out / f"Πρόγραμμα_Εξετάσεων_{june}.zip") as bundle:
+        assert sorted(bundle.namelist()) == sorted(name for name in expected if june in name)
+    assert (out / f"Πρόγραμμα_Εξετάσεων_{september}.zip").exists()
+
+
+def test_missing_programme_sheet_is_reported_per_file(exams_dir):
+    results = _publish(exams_dir)
+
+    failed = [r for r in results if r.output is None]
+    assert {(r.job.path.name, r.job.programme, r.job.include_epitirites) for r in failed} == {
+        ("exams-2026-06.xlsm", "ΤΕΙ", False),
+        ("exams-2026-06.xlsm", "ΤΕΙ", True),
+    }
+    assert all("ΤΕΙ" in r.error for r in failed)
+    assert all(r.error is None and r.rows == 1 for r in results if r.output is not None)
+
+
+def test_rerun_only_renders_changed_files(exams_dir):
+    first = _publish(exams_dir)
+    assert not any(r.reused for r in first)
+
+    again = _publish(exams_dir)
+    assert all(r.reused for r in again if r.output is not None)
+    assert [r.output for r in again] == [r.output for r in first]
+
+    _save(exams_dir / "exams-2026-06.xlsm", {"ΔΙΠΑΕ": "students_total"}, room="Β2")
+    changed = _publish(exams_dir)
+    rendered = {(r.job.path.name, r.reused) for r in changed if r.output is not None}
+    assert rendered == {("exams-2026-06.xlsm", False), ("exams-2026-09.xlsm", True)}
+
+    assert not any(r.reused for r in _publish(exams_dir, force=True))
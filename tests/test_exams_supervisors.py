@@ -0,0 +1,84 @@
+"""Supervisor workload of ``utils.exams_supervisors`` against plain pandas aggregates."""
+
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.exams_supervisors import build_supervisor_workload, get_supervisor_workload  # noqa: E402
+
+
+def _exams() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "exam_date": [date(2026, 6, d) for d in (15, 15, 16, 23, 23)],
+            "week_number": [1, 1, 1, 2, 2],
+            "start_time": ["9:00", "12:00", "9:00", "9:00", "12:00"],
+            "epitirites": [
+                "Κ. Αλεξίου, Μ. Βλάχου",
+                "Κ. Αλεξίου",
+                None,
+                "Μ. Βλάχου, Μ. Βλάχου",
+                "Κ. Αλεξίου,Δ. Γκίκας",
+            ],
+        }
+    )
+
+
+def _long(df: pd.DataFrame) -> pd.DataFrame:
+    """One row per (exam, supervisor), the obvious way."""
+    rows = [
+        {"exam_row": i, "supervisor": name, **df.iloc[i][["exam_date", "week_number", "start_time"]].to_dict()}
+        for i, cell in enumerate(df["epitirites"])
+        if isinstance(cell, str)
+        for name in dict.fromkeys(n.strip() for n in cell.split(","))
+        if name
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_summary_matches_a_pandas_groupby():
+    df = _exams()
+    workload = build_supervisor_workload(df)
+    long = _long(df)
+
+    assert workload.supervisors == sorted(long["supervisor"].unique())
+    assert len(workload.assignments) == len(long)
+
+    grouped = long.groupby("supervisor")
+    expected = pd.DataFrame(
+        {
+            "supervisions": grouped.size(),
+            "weeks": grouped["week_number"].nunique(),
+            "days": grouped["exam_date"].nunique(),
+            "max_per_day": long.groupby(["supervisor", "exam_date"]).size().groupby(level=0).max(),
+        }
+    )
+    summary = workload.summary.copy()
+    summary.index = summary.index.astype(str)
+    pd.testing.assert_frame_equal(summary.sort_index(), expected.sort_index(), check_dtype=False, check_names=False)
+    assert summary.index[0] == "Κ. Αλεξίου"  # busiest first
+
+    slots = long.groupby(["supervisor", "start_time"]).size().unstack(fill_value=0)
+    time_slots = workload.time_slots.copy()
+    time_slots.index = time_slots.index.astype(str)
+    pd.testing.assert_frame_equal(time_slots, slots, check_dtype=False, check_names=False)
+
+
+def test_workload_is_rebuilt_when_the_workbook_changes(tmp_path):
+    workbook = tmp_path / "exams-2026-06.xlsm"
+    workbook.write_bytes(b"")
+    df = _exams()
+
+    first = get_supervisor_workload(workbook, "ΤΕΙ", df)
+    assert get_supervisor_workload(workbook, "ΤΕΙ", df) is first
+
+    stat = workbook.stat()
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rebuilt = get_supervisor_workload(workbook, "ΤΕΙ", df.assign(epitirites="Ε. Ζαχαρίου"))
+    assert rebuilt is not first
+    assert rebuilt.supervisors == ["Ε. Ζαχαρίου"]
+    assert int(rebuilt.summary.loc["Ε. Ζαχαρίου", "supervisions"]) == len(df)
@@ -0,0 +1,64 @@
+"""``utils.export_cache.download_export`` in a minimal Streamlit script."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils import cache_store  # noqa: E402
+from utils.export_cache import EXPORTS_NAMESPACE, FAILURES_NAMESPACE  # noqa: E402
+
+READY = "Το αρχείο είναι έτοιμο για λήψη!"
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    yield
+    cache_store.invalidate(EXPORTS_NAMESPACE)
+    cache_store.invalidate(FAILURES_NAMESPACE)
+
+
+def _script():
+    import pandas as pd
+    import streamlit as st
+
+    from utils.export_cache import download_export
+
+    def export(df, fail):
+        if fail:
+            raise RuntimeError("το πρότυπο λείπει")
+        return df.to_csv().encode("utf-8")
+
+    df = pd.DataFrame({"room": ["Α1", "Β2"]})
+    download_export("📥 Λήψη CSV", export, df, file_name="rooms.csv", mime="text/csv", fail=st.session_state.fail)
+
+
+def _app(fail: bool) -> AppTest:
+    at = AppTest.from_function(_script)
+    at.session_state.fail = fail
+    return at.run()
+
+
+def test_build_error_is_shown_in_the_run_that_builds():
+    at = _app(fail=True)
+    assert not at.error
+    at.button[0].click().run()
+
+    assert [e.value for e in at.error] == ["Σφάλμα κατά τη δημιουργία του αρχείου: το πρότυπο λείπει"]
+    assert not at.success
+    assert FAILURES_NAMESPACE in cache_store.namespaces()
+
+
+def test_built_export_is_offered_with_the_ready_message():
+    at = _app(fail=False)
+    assert at.button[0].label == "⚙️ Δημιουργία CSV"
+    at.button[0].click().run()
+
+    # The leading emoji is rendered as the message icon.
+    assert [(s.icon, s.value) for s in at.success] == [("✅", READY)]
+    assert not at.error
+
+    # Built once: a new session gets the download straight away.
+    assert [s.value for s in _app(fail=False).success] == [READY]
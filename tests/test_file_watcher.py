@@ -0,0 +1,118 @@
+"""``utils.file_watcher``: a changed workbook drops its own caches and is rebuilt right away."""
+
+import json
+import os
+import sys
+from datetime import datetime, time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils import cache_store, sheet_cache  # noqa: E402
+from utils.cache_store import file_namespace  # noqa: E402
+from utils.exams_data import EXAM_COLUMNS, read_exams  # noqa: E402
+from utils.file_watcher import FileWatcher, refresh_exams_workbook, refresh_timetable_workbook  # noqa: E402
+from utils.sheet_cache import SIDECAR_DIR_NAME  # noqa: E402
+from utils.timetable_data import TIMETABLE_COLUMNS, TIMETABLE_SHEET  # noqa: E402
+
+
+def _save(path: Path, sheet: str, header: list[str], rows: list[list]) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    # Saved twice within the timer resolution the mtime could stay put.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _save_exams(path: Path, room: str) -> None:
+    exam = {
+        "course_id": 101,
+        "course_name": "Στατική",
+        "semester": 1,
+        "instructor": "Παπαδόπουλος",
+        "exam_date": datetime(2026, 6, 15),
+        "start_time": "9:00",
+        "room": room,
+        "notes": None,
+        "epitirites": "Κ. Αλεξίου, Μ. Βλάχου",
+        "students_total": 40,
+    }
+    _save(path, "ΔΙΠΑΕ", list(exam), [list(exam.values())])
+
+
+@pytest.fixture
+def exams_dir(tmp_path):
+    yield tmp_path
+    sheet_cache.close_workbooks()
+
+
+def test_changed_exam_workbook_drops_its_namespace_and_rebuilds(exams_dir):
+    path = exams_dir / "exams-2026-06.xlsm"
+    other = exams_dir / "exams-2026-09.xlsm"
+    _save_exams(path, "Α1")
+    _save_exams(other, "Α1")
+    assert read_exams(path, "ΔΙΠΑΕ", "students_total")["room"].tolist() == ["Α1"]
+
+    watcher = FileWatcher()
+    watcher.watch(exams_dir, "*.xlsm", refresh_exams_workbook)
+    stale = cache_store.cached(file_namespace(path), "stale", object)
+    kept = cache_store.cached(file_namespace(other), "kept", object)
+
+    assert watcher.poll() == []
+    _save_exams(path, "Β2")
+    assert watcher.poll() == [path]
+
+    # Only the changed workbook lost its entries ...
+    assert cache_store.peek(file_namespace(path), "stale") is None
+    assert cache_store.peek(file_namespace(other), "kept") is kept
+    assert stale is not None
+
+    # ... and its sidecar projection was rewritten from the new contents, before any page asked.
+    cache_dir = exams_dir / SIDECAR_DIR_NAME / path.name
+    meta = json.loads((cache_dir / "meta.json").read_text(encoding="utf-8"))
+    assert meta["mtime_ns"] == path.stat().st_mtime_ns
+    projection = json.dumps(["ΔΙΠΑΕ", EXAM_COLUMNS + ["students_total"]], ensure_ascii=False)
+    sidecar = feather.read_table(cache_dir / meta["sheets"][projection]).to_pandas()
+    assert sidecar["room"].tolist() == ["Β2"]
+
+    # The derived tables of the programme sheet are warm again.
+    mtime_ns = path.stat().st_mtime_ns
+    for name in ("exams_index", "supervisor_workload"):
+        assert cache_store.peek(file_namespace(path), (name, mtime_ns, "ΔΙΠΑΕ")) is not None
+    assert cache_store.peek(file_namespace(path), ("exam_calendar", mtime_ns, "ΔΙΠΑΕ", "students_total")) is not None
+
+
+def test_changed_timetable_is_reloaded_into_the_cache(exams_dir):
+    path = exams_dir / "2025-2026.xlsm"
+    row = dict.fromkeys(TIMETABLE_COLUMNS) | {
+        "course_id": 101,
+        "course_name": "Στατική",
+        "semester": 1,
+        "teaching_period": "Εαρινό",
+        "instructors": "Παπαδόπουλος",
+        "day": "Δευτέρα",
+        "start_time": time(9),
+        "duration": 2,
+        "room": "Α1",
+    }
+    _save(path, TIMETABLE_SHEET, list(row), [list(row.values())])
+
+    watcher = FileWatcher()
+    watcher.watch(exams_dir, "*.xlsm", refresh_timetable_workbook)
+    _save(path, TIMETABLE_SHEET, list(row), [list({**row, "room": "Β2"}.values())])
+    assert watcher.poll() == [path]
+
+    key = ("timetable", path.stat().st_mtime_ns, TIMETABLE_SHEET, "Εαρινό")
+    df = cache_store.peek(file_namespace(path), key)
+    assert isinstance(df, pd.DataFrame)
+    assert df["room"].tolist() == ["Β2"]
+    assert df["end_time"].tolist() == ["11:00"]
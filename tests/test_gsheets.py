@@ -0,0 +1,233 @@
+"""Snapshot store of ``utils.gsheets`` against a local stand-in for the Google Sheets CSV endpoint."""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils import gsheets  # noqa: E402
+from utils.cache_store import cached  # noqa: E402
+from utils.gsheets import FETCH_ATTEMPTS, SnapshotStore, gsheet_namespace  # noqa: E402
+
+CSV_V1 = "id,Κωδικός,Όνομα\n1,ΔΟΜ704,Στατική\n2,ΓΕΝ002,Γραμμική Άλγεβρα\n".encode("utf-8")
+CSV_V2 = "id,Κωδικός,Όνομα\n1,ΔΟΜ704,Στατική Ι\n".encode("utf-8")
+
+
+class StandInSheets:
+    """Serves ``/<sheet id>/<tab>.csv`` from ``tabs`` over keep-alive HTTP/1.1.
+
+    Counts the requests and the client connections; every answer takes
+    ``delay`` seconds and the first ``failures`` requests get a 503.
+    """
+
+    def __init__(self):
+        self.tabs: dict[str, bytes] = {}
+        self.hits = 0
+        self.connections: set[tuple[str, int]] = set()
+        self.delay = 0.0
+        self.failures = 0
+        self.down = False
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if server.down:
+                    # Kept-alive connections outlive ``stop``: hang up without answering.
+                    self.close_connection = True
+                    return
+                server.hits += 1
+                server.connections.add(self.client_address)
+                time.sleep(server.delay)
+                if server.failures:
+                    server.failures -= 1
+                    self.send_error(503)
+                    return
+                tab = unquote(self.path.rsplit("/", 1)[-1].removesuffix(".csv"))
+                body = server.tabs.get(tab)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/{{sheet_id}}/{{sheet_name}}.csv"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.down = True
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(gsheets, "RETRY_BACKOFF_SECONDS", 0.01)
+
+
+@pytest.fixture
+def sheets():
+    server = StandInSheets()
+    yield server
+    server.stop()
+
+
+def test_cold_load_fetches_and_persists(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    snapshot = SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+
+    assert list(snapshot.frame["Κωδικός"]) == ["ΔΟΜ704", "ΓΕΝ002"]
+    assert sheets.hits == 1
+    assert (tmp_path / "abc" / "meta.json").exists()
+    assert list((tmp_path / "abc").glob("*.parquet"))
+
+
+def test_snapshot_served_offline_after_restart(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    first = SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+    sheets.stop()
+
+    # A new process: the snapshot on disk is served without touching the network.
+    restarted = SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+    assert restarted.frame.equals(first.frame)
+    assert restarted.sha256 == first.sha256
+    assert sheets.hits == 1
+
+
+def test_unchanged_sheet_is_not_reparsed(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    store = SnapshotStore(tmp_path, url=sheets.url)
+    first = store.get("abc", "gr")
+
+    refreshed = store.refresh("abc", "gr").result()
+    assert sheets.hits == 2
+    assert refreshed.frame is first.frame
+    assert refreshed.fetched_at >= first.fetched_at
+
+
+def test_changed_sheet_replaces_snapshot(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    store = SnapshotStore(tmp_path, url=sheets.url)
+    first = store.get("abc", "gr")
+
+    sheets.tabs["gr"] = CSV_V2
+    refreshed = store.refresh("abc", "gr").result()
+    assert refreshed.sha256 != first.sha256
+    assert list(refreshed.frame["Όνομα"]) == ["Στατική Ι"]
+    assert store.get("abc", "gr") is refreshed
+    assert SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr").frame.equals(refreshed.frame)
+
+
+def test_changed_sheet_drops_derived_entries(sheets, tmp_path):
+    sheets.tabs.update({"gr": CSV_V1, "eng": CSV_V1})
+    store = SnapshotStore(tmp_path, url=sheets.url)
+    store.get_many("abc", ["gr", "eng"])
+    cached(gsheet_namespace("abc"), ("derived", "eng"), lambda: "v1")
+
+    store.refresh("abc", "gr").result()
+    assert cached(gsheet_namespace("abc"), ("derived", "eng"), lambda: "v2") == "v1"
+
+    sheets.tabs["gr"] = CSV_V2
+    store.refresh("abc", "gr").result()
+    assert cached(gsheet_namespace("abc"), ("derived", "eng"), lambda: "v2") == "v2"
+
+
+def test_stale_snapshot_is_served_while_refreshing(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    store = SnapshotStore(tmp_path, ttl=0.05, url=sheets.url)
+    first = store.get("abc", "gr")
+    sheets.tabs["gr"] = CSV_V2
+    time.sleep(0.1)
+
+    # The stale snapshot comes back at once; the refresh runs in the background.
+    assert store.get("abc", "gr") is first
+    store.refresh("abc", "gr").result()
+    assert list(store.get("abc", "gr").frame["Όνομα"]) == ["Στατική Ι"]
+
+
+def test_failed_refresh_keeps_snapshot(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    store = SnapshotStore(tmp_path, url=sheets.url)
+    first = store.get("abc", "gr")
+    sheets.stop()
+
+    with pytest.raises(Exception):
+        store.refresh("abc", "gr").result()
+    current = store.get("abc", "gr")
+    assert current.frame is first.frame
+    assert current.error
+
+
+def test_cold_load_without_network_raises(sheets, tmp_path):
+    sheets.stop()
+    with pytest.raises(Exception):
+        SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+
+
+def test_tabs_are_fetched_concurrently(sheets, tmp_path):
+    sheets.tabs.update({"gr_2025": CSV_V1, "gr": CSV_V1, "eng": CSV_V2})
+    sheets.delay = 0.5
+    store = SnapshotStore(tmp_path, url=sheets.url)
+
+    start = time.perf_counter()
+    snapshots = store.get_many("abc", ["gr_2025", "gr", "eng"])
+    elapsed = time.perf_counter() - start
+
+    assert set(snapshots) == {"gr_2025", "gr", "eng"}
+    # About one slow tab, not the sum of three.
+    assert elapsed < 2 * sheets.delay
+
+
+def test_connections_are_kept_alive(sheets, tmp_path):
+    sheets.tabs.update({"eklektores": CSV_V1, "antikeimena": CSV_V2})
+    store = SnapshotStore(tmp_path, url=sheets.url)
+    for tab in ["eklektores", "antikeimena", "eklektores"]:
+        store.refresh("abc", tab).result()
+
+    assert sheets.hits == 3
+    assert len(sheets.connections) == 1
+
+
+def test_transient_errors_are_retried(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    sheets.failures = FETCH_ATTEMPTS - 1
+
+    snapshot = SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+    assert list(snapshot.frame["Κωδικός"]) == ["ΔΟΜ704", "ΓΕΝ002"]
+    assert sheets.hits == FETCH_ATTEMPTS
+
+
+def test_retry_budget_is_per_tab(sheets, tmp_path):
+    sheets.tabs["gr"] = CSV_V1
+    sheets.failures = FETCH_ATTEMPTS
+
+    with pytest.raises(httpx.HTTPStatusError):
+        SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+    assert sheets.hits == FETCH_ATTEMPTS
+
+
+def test_slow_answer_stops_at_the_deadline(sheets, tmp_path, monkeypatch):
+    monkeypatch.setattr(gsheets, "FETCH_DEADLINE_SECONDS", 0.3)
+    sheets.tabs["gr"] = CSV_V1
+    sheets.delay = 2.0
+
+    start = time.perf_counter()
+    with pytest.raises(httpx.TimeoutException):
+        SnapshotStore(tmp_path, url=sheets.url).get("abc", "gr")
+    # One request, cut short at the deadline instead of FETCH_TIMEOUT.
+    assert time.perf_counter() - start < sheets.delay
+    assert sheets.hits == 1
@@ -0,0 +1,88 @@
+"""CSR elector lookup of ``utils.mitroa_index`` against the per-selection scan it replaces."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.mitroa_index import build_eklektores_index  # noqa: E402
+
+SORT_COLUMNS = ["Χαρακτηρισμός", "Επώνυμο", "Όνομα"]
+
+
+def _eklektores() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Επώνυμο": ["Αλεξίου", "Βλάχου", "Γεωργίου", "Δήμου", "Ευαγγέλου", "Ζαχαρίου"],
+            "Όνομα": ["Κώστας", "Μαρία", "Νίκος", "Ελένη", None, "Άννα"],
+            "Ίδρυμα": ["ΑΠΘ", "ΕΜΠ", "ΠΘ", "ΔΠΘ", "ΠΠ", "ΠΚ"],
+        },
+        index=pd.Index([3, 7, 12, 15, 21, 30], name="id"),
+    )
+
+
+def _antikeimena() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Γνωστικό αντικείμενο": ["Στατική", "Υδραυλική", "Οδοποιία", "Στατική", "Γεωτεχνική"],
+            "Εξωτερικοί Ιδίου": ["3-12-", "7-99-7", "21", "30", "15-"],
+            # 12 is listed under both kinds of Στατική; 99 is not in the registry.
+            "Εξωτερικοί Συναφούς": ["12-15-30", "3-", "99", "7", "15-3"],
+        }
+    )
+
+
+def _scan_report(df_eklektores: pd.DataFrame, df_antikeimena: pd.DataFrame, antikeimeno: str) -> pd.DataFrame:
+    """The report as the page built it before the index: mask, split and ``isin`` on every selection."""
+
+    def codes_for(column: str) -> list[int]:
+        matching = df_antikeimena[df_antikeimena["Γνωστικό αντικείμενο"] == antikeimeno][column]
+        if matching.empty:
+            return []
+        codes = matching.values[0].split("-")
+        if "" in codes:
+            codes.remove("")
+        return [int(i) for i in codes]
+
+    idiou = codes_for("Εξωτερικοί Ιδίου")
+    codes = idiou + codes_for("Εξωτερικοί Συναφούς")
+    selected = df_eklektores[df_eklektores.index.isin(codes)].copy()
+    selected["Χαρακτηρισμός"] = np.where(selected.index.isin(idiou), "Ιδίου", "Συναφούς")
+    column = selected.pop("Χαρακτηρισμός")
+    selected.insert(0, column.name, column)
+    return selected
+
+
+def _page_view(report: pd.DataFrame) -> pd.DataFrame:
+    return report.fillna("").sort_values(by=SORT_COLUMNS)
+
+
+@pytest.mark.parametrize("dtype_backend", ["numpy_nullable", "pyarrow"])
+def test_reports_match_the_scan(dtype_backend):
+    # The snapshots of ``utils.gsheets`` are pyarrow-backed.
+    df_eklektores = _eklektores().convert_dtypes(dtype_backend=dtype_backend)
+    df_antikeimena = _antikeimena().convert_dtypes(dtype_backend=dtype_backend)
+    index = build_eklektores_index(df_eklektores, df_antikeimena)
+
+    assert index.antikeimena == sorted(df_antikeimena["Γνωστικό αντικείμενο"].unique())
+    for antikeimeno in [*index.antikeimena, "Άγνωστο"]:
+        expected = _page_view(_scan_report(df_eklektores, df_antikeimena, antikeimeno))
+        pd.testing.assert_frame_equal(_page_view(index.report(df_eklektores, antikeimeno)), expected)
+
+
+def test_duplicates_count_once_and_as_idiou():
+    index = build_eklektores_index(_eklektores(), _antikeimena())
+    registry = _eklektores().index
+
+    # 12 is under both kinds: Ιδίου only. The second Στατική row is ignored.
+    assert registry[index.eklektores("Στατική", "Ιδίου")].tolist() == [3, 12]
+    assert registry[index.eklektores("Στατική", "Συναφούς")].tolist() == [15, 30]
+    # 7 twice in one list, 99 unknown.
+    assert registry[index.eklektores("Υδραυλική", "Ιδίου")].tolist() == [7]
+    assert registry[index.eklektores("Υδραυλική", "Συναφούς")].tolist() == [3]
+    assert registry[index.eklektores("Οδοποιία", "Συναφούς")].tolist() == []
+    assert registry[index.eklektores("Γεωτεχνική", "Συναφούς")].tolist() == [3]
+    assert index.eklektores("Άγνωστο", "Ιδίου").tolist() == []
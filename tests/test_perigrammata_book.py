@@ -0,0 +1,63 @@
+"""Incremental builds of ``utils.perigrammata_book`` on a small perigrammata sheet."""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.perigrammata_book import BuildManifest, build_book  # noqa: E402
+
+
+def _sheet(**titles: str) -> pd.DataFrame:
+    """One course per code, in semester order of the codes; ``titles`` maps code -> course title."""
+    return pd.DataFrame(
+        {
+            "code": list(titles),
+            "examino": [index + 1 for index in range(len(titles))],
+            "title": list(titles.values()),
+        }
+    )
+
+
+def _build(root: Path, full: bool = False, **titles: str):
+    return build_book(_sheet(**titles), "Ελληνικά", 1, BuildManifest(root), full)
+
+
+def _changes(book) -> set[tuple[str, str]]:
+    return {(change.code, change.change) for change in book.changes}
+
+
+@pytest.fixture
+def manifest_dir(tmp_path):
+    return tmp_path / "gr"
+
+
+def test_full_rebuild_reports_changes_against_the_previous_build(manifest_dir):
+    _build(manifest_dir, ΠΟΛ1="Στατική", ΠΟΛ2="Υδραυλική")
+
+    book = _build(manifest_dir, full=True, ΠΟΛ1="Στατική", ΠΟΛ3="Οδοποιία")
+    assert not any(course.cached for course in book.courses)
+    assert _changes(book) == {("ΠΟΛ3", "added"), ("ΠΟΛ2", "removed")}
+    assert set(BuildManifest(manifest_dir).courses) == {"ΠΟΛ1", "ΠΟΛ3"}
+
+
+def test_incremental_build_renders_and_reports_only_the_changes(manifest_dir):
+    first = _build(manifest_dir, ΠΟΛ1="Στατική", ΠΟΛ2="Υδραυλική", ΠΟΛ3="Οδοποιία")
+    assert _changes(first) == {("ΠΟΛ1", "added"), ("ΠΟΛ2", "added"), ("ΠΟΛ3", "added")}
+    assert not any(course.cached for course in first.courses)
+
+    again = _build(manifest_dir, ΠΟΛ1="Στατική", ΠΟΛ2="Υδραυλική", ΠΟΛ3="Οδοποιία")
+    assert again.changes == []
+    assert all(course.cached for course in again.courses)
+
+    book = _build(manifest_dir, ΠΟΛ1="Στατική", ΠΟΛ2="Υδραυλική ΙΙ", ΠΟΛ4="Γεωτεχνική")
+    assert _changes(book) == {("ΠΟΛ2", "changed"), ("ΠΟΛ4", "added"), ("ΠΟΛ3", "removed")}
+    assert {course.code: course.cached for course in book.courses} == {"ΠΟΛ1": True, "ΠΟΛ2": False, "ΠΟΛ4": False}
+
+    # Outlines of removed or outdated rows are dropped from the build cache.
+    manifest = BuildManifest(manifest_dir)
+    assert set(manifest.courses) == {"ΠΟΛ1", "ΠΟΛ2", "ΠΟΛ4"}
+    files = {entry["file"] for entry in manifest.courses.values()}
+    assert {path.name for path in manifest_dir.glob("*.docx")} == files
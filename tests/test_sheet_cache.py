@@ -0,0 +1,67 @@
+"""Arrow sidecars of ``utils.sheet_cache`` on small generated workbooks."""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils import sheet_cache  # noqa: E402
+from utils.sheet_cache import SIDECAR_DIR_NAME, read_sheet, sheet_names  # noqa: E402
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "exams-2026-06.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ΔΙΠΑΕ"
+    ws.append(["course_id", "course_name", "room"])
+    ws.append([101, "Στατική", "Α1"])
+    ws.append(["ΔΟΜ704", "Υδραυλική", "Β2"])
+    wb.create_sheet("ΤΕΙ").append(["course_id"])
+    wb.save(path)
+    yield path
+    sheet_cache.close_workbooks()
+
+
+def test_sidecar_is_written_and_reused(workbook):
+    first = read_sheet(workbook, "ΔΙΠΑΕ")
+    assert list((workbook.parent / SIDECAR_DIR_NAME / workbook.name).glob("*.arrow"))
+    assert read_sheet(workbook, "ΔΙΠΑΕ").equals(first)
+
+
+@pytest.mark.parametrize("columns", [None, ["course_id", "room"]])
+def test_unwritable_cache_directory_only_costs_speed(workbook, columns):
+    # A file where the cache directory should be: nothing can be created
+    # under it, whatever the permissions of the user running the tests.
+    (workbook.parent / SIDECAR_DIR_NAME).write_text("")
+
+    assert sheet_names(workbook) == ["ΔΙΠΑΕ", "ΤΕΙ"]
+    df = read_sheet(workbook, "ΔΙΠΑΕ", columns)
+    expected = pd.read_excel(workbook, sheet_name="ΔΙΠΑΕ", usecols=columns).astype(str)
+    assert df.astype(str).equals(expected)
+
+
+@pytest.mark.skipif(os.name != "posix" or os.geteuid() == 0, reason="root ignores directory permissions")
+def test_read_only_directory(workbook):
+    workbook.parent.chmod(0o555)
+    try:
+        assert sheet_names(workbook) == ["ΔΙΠΑΕ", "ΤΕΙ"]
+        assert len(read_sheet(workbook, "ΔΙΠΑΕ")) == 2
+    finally:
+        workbook.parent.chmod(0o755)
+
+
+def test_projections_share_the_parsed_workbook(workbook, monkeypatch):
+    parsed = []
+    original = sheet_cache.workbook_parts
+    monkeypatch.setattr(sheet_cache, "workbook_parts", lambda path: parsed.append(path) or original(path))
+
+    read_sheet(workbook, "ΔΙΠΑΕ", ["course_id"])
+    read_sheet(workbook, "ΔΙΠΑΕ", ["course_name", "room"])
+    read_sheet(workbook, "ΤΕΙ", ["course_id"])
+    assert parsed == [workbook]
@@ -0,0 +1,107 @@
+"""Table structure of ``utils.timetable_export``: every row fills the grid and merged cells line up."""
+
+import io
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+from lxml import etree
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.timetable_export import TIME_SLOTS, create_weekly_timetable_document  # noqa: E402
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _classes() -> pd.DataFrame:
+    rows = [
+        # semester, day, start, hours, class
+        (1, "Δευτέρα", "9:00", 2, "Στατική"),
+        (1, "Δευτέρα", "9:00", 3, "Μαθηματικά"),  # side by side, longer
+        (1, "Δευτέρα", "10:00", 2, "Φυσική"),  # overlaps both, needs a third lane
+        (1, "Τρίτη", "11:00", 3, "Χημεία"),  # alone: full width of the day
+        (1, "Τρίτη", "12:00", 1, "Σχέδιο"),  # narrows the full-width class beside it
+        (1, "Πέμπτη", "20:00", 4, "Βραδινό"),  # runs past the last slot
+        (3, "Τετάρτη", "9", 1, "Υδραυλική"),
+        (3, "Σάββατο", "9:00", 1, "Εκτός"),  # not a teaching day
+        (5, "Παρασκευή", "8:00", 2, "Πρωινό"),  # before the first slot: semester has an empty grid
+    ]
+    return pd.DataFrame(
+        [
+            {"semester": s, "day": d, "start_time": t, "duration": h, "full_class_name": c, "instructors": "Π.", "room": "Α1"}
+            for s, d, t, h, c in rows
+        ]
+    )
+
+
+def _tables() -> list:
+    data = create_weekly_timetable_document(_classes(), "Εαρινό")
+    with zipfile.ZipFile(io.BytesIO(data)) as package:
+        root = etree.fromstring(package.read("word/document.xml"))
+    return list(root.iter(f"{W}tbl"))
+
+
+def _layout(row) -> list[tuple[int, int, str | None, str]]:
+    """(first grid column, span, vMerge, text) of every cell of a table row."""
+    cells, column = [], 0
+    for tc in row.iterfind(f"{W}tc"):
+        span = tc.find(f"{W}tcPr/{W}gridSpan")
+        merge = tc.find(f"{W}tcPr/{W}vMerge")
+        span = int(span.get(f"{W}val")) if span is not None else 1
+        merge = None if merge is None else merge.get(f"{W}val", "continue")
+        cells.append((column, span, merge, "".join(tc.itertext())))
+        column += span
+    return cells
+
+
+def test_rows_fill_the_grid_and_merges_line_up():
+    tables = _tables()
+    assert len(tables) == 3
+
+    for table in tables:
+        columns = len(table.findall(f"{W}tblGrid/{W}gridCol"))
+        rows = [_layout(row) for row in table.iterfind(f"{W}tr")]
+        assert len(rows) == len(TIME_SLOTS) + 1
+
+        # Every row spans exactly the table grid.
+        for cells in rows:
+            column, span, _, _ = cells[-1]
+            assert column + span == columns
+
+        # A continued cell sits under a cell of the same columns that starts or continues the merge;
+        # merged cells carry their text only in the first row.
+        for above, below in zip(rows, rows[1:]):
+            starts = {(column, span): merge for column, span, merge, _ in above}
+            for column, span, merge, text in below:
+                if merge == "continue":
+                    assert starts.get((column, span)) in ("restart", "continue")
+                    assert text == ""
+
+
+def test_blocks_span_their_hours_and_lanes():
+    monday_to_friday = _tables()[0]
+    rows = [_layout(row) for row in monday_to_friday.iterfind(f"{W}tr")]
+    columns = len(monday_to_friday.findall(f"{W}tblGrid/{W}gridCol"))
+    lanes = (columns - 1) // 5
+    assert lanes == 3
+
+    def block(name: str) -> tuple[int, int, int, int]:
+        """(first row, first grid column, span, rows) of the class ``name``."""
+        found = [(r, column, span) for r, cells in enumerate(rows) for column, span, _, text in cells
+                 if text.startswith(name)]
+        assert len(found) == 1, name
+        r, column, span = found[0]
+        length = 1
+        while r + length < len(rows) and (column, span, "continue") in [cell[:3] for cell in rows[r + length]]:
+            length += 1
+        return r, column, span, length
+
+    assert block("Στατική") == (1, 1, 1, 2)
+    assert block("Μαθηματικά") == (1, 2, 1, 3)
+    assert block("Φυσική") == (2, 3, 1, 2)
+    # Tuesday starts at column 1 + lanes; Χημεία was narrowed to lane 0 by Σχέδιο.
+    assert block("Χημεία") == (3, 1 + lanes, 1, 3)
+    assert block("Σχέδιο") == (4, 2 + lanes, 1, 1)
+    # Cut at the last time slot.
+    assert block("Βραδινό") == (12, 1 + 3 * lanes, lanes, len(TIME_SLOTS) - 11)
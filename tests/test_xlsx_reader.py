@@ -0,0 +1,139 @@
+"""``utils.xlsx_reader.read_columns`` against ``pd.read_excel`` on small generated workbooks."""
+
+import re
+import sys
+import zipfile
+from datetime import datetime, time
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "streamlit"))
+from utils.xlsx_reader import read_columns  # noqa: E402
+
+COLUMNS = ["course_id", "exam_date", "start_time", "room"]
+
+
+def _save(path: Path, rows: list[list], epoch=None) -> Path:
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ΔΙΠΑΕ"
+    if epoch is not None:
+        wb.epoch = epoch
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _inline_string(path: Path, ref: str, text: str) -> None:
+    """Rewrite cell ``ref`` of the first sheet as an inline string, as other writers produce them."""
+    with zipfile.ZipFile(path) as zf:
+        members = {name: zf.read(name) for name in zf.namelist()}
+    sheet = members["xl/worksheets/sheet1.xml"].decode("utf-8")
+    sheet, count = re.subn(
+        rf'<c r="{ref}"[^>]*>.*?</c>',
+        f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>',
+        sheet,
+    )
+    assert count == 1
+    members["xl/worksheets/sheet1.xml"] = sheet.encode("utf-8")
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+
+
+def _assert_like_read_excel(path: Path, columns: list[str], header: int = 0) -> pd.DataFrame:
+    df = read_columns(path, "ΔΙΠΑΕ", columns)
+    expected = pd.read_excel(path, sheet_name="ΔΙΠΑΕ", header=header)
+    expected = expected[[c for c in columns if c in expected.columns]]
+
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == len(expected)
+    for name in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(expected[name]):
+            pd.testing.assert_series_equal(
+                pd.to_datetime(df[name]), expected[name], check_dtype=False, check_names=False
+            )
+        else:
+            assert [None if pd.isna(v) else v for v in df[name]] == [
+                None if pd.isna(v) else v for v in expected[name]
+            ]
+    return df
+
+
+def test_shared_and_inline_strings(tmp_path):
+    path = _save(
+        tmp_path / "strings.xlsx",
+        [COLUMNS, [101, datetime(2026, 6, 15), "9:00", "Α1"], ["ΔΟΜ704", datetime(2026, 6, 16), "12:00", "Β2"]],
+    )
+    _inline_string(path, "D3", "Αμφιθέατρο")
+
+    df = _assert_like_read_excel(path, COLUMNS)
+    assert df["room"].tolist() == ["Α1", "Αμφιθέατρο"]
+    assert df["course_id"].tolist() == [101, "ΔΟΜ704"]
+
+
+def test_date_and_time_styles(tmp_path):
+    path = _save(
+        tmp_path / "dates.xlsx",
+        [COLUMNS, [1, datetime(2026, 6, 15), time(9, 30), "Α1"], [2, datetime(2026, 6, 16, 12, 0), time(12), "Α2"]],
+    )
+    df = _assert_like_read_excel(path, COLUMNS)
+    assert df["exam_date"].tolist() == [datetime(2026, 6, 15), datetime(2026, 6, 16, 12, 0)]
+    assert df["start_time"].tolist() == [time(9, 30), time(12)]
+
+
+def test_1904_date_system(tmp_path):
+    path = _save(
+        tmp_path / "mac.xlsx",
+        [COLUMNS, [1, datetime(2026, 6, 15), "9:00", "Α1"], [2, datetime(1999, 12, 31), "9:00", "Α2"]],
+        epoch=CALENDAR_MAC_1904,
+    )
+    df = _assert_like_read_excel(path, COLUMNS)
+    assert df["exam_date"].tolist() == [datetime(2026, 6, 15), datetime(1999, 12, 31)]
+
+
+def test_missing_rows_are_blank_rows(tmp_path):
+    path = tmp_path / "gaps.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ΔΙΠΑΕ"
+    ws.append(COLUMNS)
+    ws.append([1, datetime(2026, 6, 15), "9:00", "Α1"])
+    # Row 3 is never written; row 4 only has a column that is not requested.
+    ws["E4"] = "σχόλιο"
+    ws.append([2, datetime(2026, 6, 16), "9:00", None])
+    # Rows below with values only in unrequested columns still count, as with pd.read_excel;
+    # the blank rows after the last value do not.
+    ws["E7"] = "τέλος"
+    ws["E9"].style = "Note"
+    wb.save(path)
+
+    df = _assert_like_read_excel(path, COLUMNS)
+    assert df["course_id"].tolist()[:1] == [1]
+    assert len(df) == 6
+
+
+def test_header_is_the_row_with_the_most_requested_names(tmp_path):
+    path = _save(
+        tmp_path / "titled.xlsx",
+        [
+            ["notes", "Πρόγραμμα εξετάσεων Ιουνίου"],
+            [],
+            ["course_id", "room", "notes", "students_total"],
+            [101, "Α1", "προφορικά", 40],
+            [102, "Α2", None, 35],
+        ],
+    )
+    columns = ["course_id", "room", "notes", "epitirites"]
+    df = _assert_like_read_excel(path, columns, header=2)
+    assert list(df.columns) == ["course_id", "room", "notes"]
+    assert df["notes"].tolist()[0] == "προφορικά"
+
+
+def test_no_header_gives_an_empty_frame(tmp_path):
+    path = _save(tmp_path / "empty.xlsx", [["a", "b"], [1, 2]])
+    assert read_columns(path, "ΔΙΠΑΕ", ["course_id"]).empty